@@ -9,19 +9,30 @@ __license__ = ""
 __history__ = """ """
 __version__ = "1.1.A19.1 ($Rev: 1 $)"
 
-import json
+import functools
+import hashlib
 import re
 import threading
 import time
-import uuid
+from datetime import timezone
 
-from flask import Flask, jsonify, render_template, json, request
+import click
+from flask import Flask, render_template, json, request, stream_with_context
 from flask_jwt_extended import JWTManager
 
 from auth_controller.api_authentication import *
 from utilities.Utility import Utility as Util
+from utilities.json_encoder import JsonEncoder
+from utilities.request_stats import CountingStream
+from utilities.response_compression import (ResponseCompressor, CompressedStream, available_encodings,
+                                            negotiate_encoding)
+from constants.constants import install_reload_signal
 from logger_controller.logger_control import *
+from logger_controller.async_logging import get_async_pipelines_stats
 from db_controller.database_backend import *
+from db_controller.catalog_import import CATALOG_FORMATS, import_product_catalog
+from db_controller.catalog_export import CATALOG_EXPORT_MIMETYPES, export_product_catalog
+from db_controller.pagination import get_page_size
 from model.StoreModel import StoreModel
 from model.ProductModel import ProductModel
 
@@ -40,11 +51,189 @@ app.config['PROPAGATE_EXCEPTIONS'] = True
 
 jwt = JWTManager(app)
 
+# kill -HUP <pid> lee de nuevo constants.yml sin reiniciar el proceso
+install_reload_signal()
+
+# orjson si esta instalado, si no el modulo json estandar (JSON_RESPONSE.ENCODER)
+json_encoder = JsonEncoder((Util.get_config_constant_file().get('JSON_RESPONSE') or {}).get('ENCODER', 'auto'))
+
+# Un registro JSON por request en su propio archivo de log (ACCESS_LOG), escrito por el hilo del log asincrono
+access_log_cfg = Util.get_config_constant_file().get('ACCESS_LOG') or {}
+
+access_logger = None
+
+if access_log_cfg.get('ENABLED', False):
+    access_logger = configure_named_logging('access', access_log_cfg.get('FILE_LOG_NAME', 'api_access_'),
+                                            Util.get_config_constant_file()['LOG_RESOURCE']['DIRECTORY_LOG_FILES'],
+                                            to_stdout=bool(access_log_cfg.get('TO_STDOUT', False)),
+                                            log_format='%(message)s')
+
+
+def json_response(data, status=200):
+    r"""
+    Build the response of an endpoint, the data of the backend is serialized only here.
+    """
+
+    return app.response_class(json_encoder.dumps(data), status=status, mimetype='application/json')
+
+
+def conditional_json_response(resource_version, resource_key, get_data):
+    r"""
+    Build the response of a read with ETag and Last-Modified, or 304 Not Modified if the client has the same
+    version (If-None-Match, or If-Modified-Since without If-None-Match). The data is read only if it changed.
+
+    :param resource_version: Dictionary with Version and LastModified (UTC) of select_*_version.
+    :param resource_key: Text with the key and the representation of the resource (code, SKU, fields...),
+                         the keys of these endpoints are sent on the body so they are not part of the URL.
+    :param get_data: Function without arguments that reads the data of the response.
+    """
+
+    etag = hashlib.md5('{}|{}'.format(resource_key, resource_version["Version"]).encode('utf-8')).hexdigest()
+
+    last_modified = resource_version["LastModified"]
+
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains_weak(etag)
+    else:
+        if_modified_since = request.if_modified_since
+
+        if if_modified_since is not None and if_modified_since.tzinfo is not None:
+            if_modified_since = if_modified_since.astimezone(timezone.utc).replace(tzinfo=None)
+
+        not_modified = last_modified is not None and if_modified_since is not None and \
+            last_modified.replace(microsecond=0) <= if_modified_since
+
+    if not_modified:
+        response = app.response_class(status=304)
+    else:
+        response = json_response(get_data())
+
+    response.set_etag(etag, weak=True)
+    response.last_modified = last_modified
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+
+    return response
+
+
+def write_access_record(request_stats, route, method, status, response_bytes):
+    r"""
+    Write the JSON access record of a request, without his payloads (they are logged only at DEBUG level).
+    """
+
+    access_logger.info(json_encoder.dumps_text(request_stats.access_record(route, method, status, response_bytes)))
+
+
+@app.before_request
+def start_access_record():
+
+    if access_logger is not None:
+        start_request_stats()
+
+
+# Registrado antes que los demas after_request para ejecutarse al final: cuenta los bytes ya comprimidos
+@app.after_request
+def log_access_record(response):
+
+    request_stats = get_request_stats()
+
+    if request_stats is None or request_stats.logged:
+        return response
+
+    request_stats.logged = True
+
+    route = request.url_rule.rule if request.url_rule is not None else request.path
+
+    if response.is_streamed:
+        # El registro se escribe al terminar de enviar el stream
+        response.response = CountingStream(response.response, functools.partial(
+            write_access_record, request_stats, route, request.method, response.status_code))
+    else:
+        write_access_record(request_stats, route, request.method, response.status_code,
+                            response.calculate_content_length())
+
+    return response
+
+
+# Unidad de trabajo por request: todas las operaciones a BD de un endpoint comparten
+# una sola conexion y se confirman con un solo commit si la respuesta es exitosa
+@app.after_request
+def commit_db_request_session(response):
+
+    if response.status_code < 400:
+        commit_request_session()
+
+    return response
+
+
+# Compresion de las respuestas negociada con Accept-Encoding (RESPONSE_COMPRESSION)
+@app.after_request
+def compress_response(response):
+
+    compression_cfg = Util.get_config_constant_file().get('RESPONSE_COMPRESSION') or {}
+
+    if not compression_cfg.get('ENABLED', False) or response.mimetype not in compression_cfg.get('MIMETYPES', ()):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    if request.method == 'HEAD' or response.status_code < 200 or response.status_code in (204, 304) or \
+            'Content-Encoding' in response.headers:
+        return response
+
+    encodings = [encoding for encoding in compression_cfg.get('ENCODINGS', ('gzip',))
+                 if encoding in available_encodings()]
+
+    encoding = negotiate_encoding(request.headers.get('Accept-Encoding'), encodings)
+
+    if encoding is None:
+        return response
+
+    compressor = ResponseCompressor(encoding, (compression_cfg.get('LEVELS') or {}).get(encoding))
+
+    if response.is_streamed:
+        response.response = CompressedStream(response.response, compressor)
+        response.headers.pop('Content-Length', None)
+    else:
+        body = response.get_data()
+
+        if len(body) < int(compression_cfg.get('MIN_SIZE', 1024)):
+            return response
+
+        response.set_data(compressor.compress(body))
+
+    response.headers['Content-Encoding'] = encoding
+
+    return response
+
+
+@app.teardown_request
+def close_db_request_session(error=None):
+
+    end_request_session(error)
+
+
+# Las excepciones no manejadas no pasan por after_request, su registro se escribe aqui
+@app.teardown_request
+def log_failed_access_record(error=None):
+
+    request_stats = get_request_stats()
+
+    if request_stats is not None and not request_stats.logged:
+        request_stats.logged = True
+
+        route = request.url_rule.rule if request.url_rule is not None else request.path
+
+        write_access_record(request_stats, route, request.method, 500, None)
+
 
 # Se inicializa la App con un hilo para evitar problemas de ejecución
 # (Falta validacion para cuando ya exista hilo corriendo)
 @app.before_first_request
 def activate_job():
+    # Un listener por worker: invalida los caches con las escrituras de los otros procesos
+    start_cache_invalidation_listener()
+
     def run_job():
         while True:
             time.sleep(2)
@@ -65,13 +254,11 @@ def get_stock_all_stores_by_product(product_sku):
 
     stock_list = []
 
-    stock_in_stores = select_all_stock_in_product(product_sku)
-
-    stock_list = json.loads(stock_in_stores)
+    stock_list = select_all_stock_in_product(product_sku)
 
     if stock_list:
 
-        logger.info('List Stock in all Stores by SKU: {}: {}: '.format(product_sku, stock_list))
+        logger.debug('List Stock in all Stores by SKU: %s: %s', product_sku, stock_list)
 
         return stock_list
 
@@ -100,12 +287,14 @@ def endpoint_list_stock_all_stores():
 
             product_sku = data['product_sku']
 
-            json_data = get_stock_all_stores_by_product(product_sku)
-
             if not product_sku:
                 return request_conflict()
 
-            return json.dumps(json_data)
+            # 304 si el cliente ya tiene la version actual, el stock solo se lee si cambio
+            product_version = select_product_version(product_sku)
+
+            return conditional_json_response(product_version, 'stock:{}'.format(product_sku),
+                                             lambda: get_stock_all_stores_by_product(product_sku))
 
         else:
             return not_found()
@@ -115,13 +304,11 @@ def get_stock_by_store_by_product(product_sku, store_code):
 
     stock_list = []
 
-    stock_in_store = select_stock_in_product(store_code, product_sku)
-
-    stock_list = json.loads(stock_in_store)
+    stock_list = select_stock_in_product(store_code, product_sku)
 
     if stock_list:
 
-        logger.info('List Stock in one Store: {} by SKU: {}: {}: '.format(store_code, product_sku, stock_list))
+        logger.debug('List Stock in one Store: %s by SKU: %s: %s', store_code, product_sku, stock_list)
 
         return stock_list
 
@@ -151,12 +338,71 @@ def endpoint_detailed_stock_by_sku():
             product_sku = data['product_sku']
             store_code = data['store_code']
 
-            json_data = get_stock_by_store_by_product(product_sku, store_code)
-
             if not product_sku:
                 return request_conflict()
 
-            return json.dumps(json_data)
+            product_version = select_product_version(product_sku, store_code)
+
+            return conditional_json_response(product_version, 'stock:{}:{}'.format(product_sku, store_code),
+                                             lambda: get_stock_by_store_by_product(product_sku, store_code))
+
+        else:
+            return not_found()
+
+
+def get_stock_by_products(product_skus, store_codes):
+
+    stock_list = select_stock_in_products(product_skus, store_codes)
+
+    logger.info('List Stock by SKUs: %s, Stores: %s, Not found: %s', len(product_skus), store_codes,
+                stock_list["NotFound"])
+
+    return stock_list
+
+
+def is_list_of_codes(values):
+
+    return isinstance(values, list) and all(isinstance(value, str) and value for value in values)
+
+
+@app.route('/api/ecommerce/stock/batch/',  methods=['GET', 'POST', 'OPTIONS'])
+@jwt_required
+def endpoint_stock_by_products():
+
+    headers = request.headers
+    auth = headers.get('Authorization')
+
+    if not auth and 'Bearer' not in auth:
+        return request_unauthorized()
+    else:
+        if request.method == 'OPTIONS':
+            headers = {
+                'Access-Control-Allow-Methods': 'POST, GET, OPTIONS',
+                'Access-Control-Max-Age': 1000,
+                'Access-Control-Allow-Headers': 'origin, x-csrftoken, content-type, accept',
+            }
+            return '', 200, headers
+
+        elif request.method in ('GET', 'POST'):
+
+            cfg = Util.get_config_constant_file()
+
+            max_skus = int((cfg.get('STOCK_BATCH') or {}).get('MAX_SKUS', 200))
+
+            data = request.get_json(force=True, silent=True) or {}
+
+            product_skus = data.get('product_skus')
+            store_codes = data.get('store_codes')
+
+            if not is_list_of_codes(product_skus) or not product_skus or len(product_skus) > max_skus:
+                return request_conflict()
+
+            if store_codes is not None and not is_list_of_codes(store_codes):
+                return request_conflict()
+
+            json_data = get_stock_by_products(product_skus, store_codes)
+
+            return json_response(json_data)
 
         else:
             return not_found()
@@ -166,16 +412,11 @@ def add_stock_by_store_by_product(stock, product_sku, store_code):
 
     stock_add = []
 
-    stock_in_product = update_product_store_stock(stock, product_sku, store_code)
-
-    stock_add = json.loads(stock_in_product)
+    stock_add = update_product_store_stock(stock, product_sku, store_code)
 
     if stock_add:
 
-        logger.info('Add Stock: {} in one Product: {} by Store: {}: {}: '.format(stock,
-                                                                                 product_sku,
-                                                                                 store_code,
-                                                                                 stock_add))
+        logger.debug('Add Stock: %s in one Product: %s by Store: %s: %s', stock, product_sku, store_code, stock_add)
 
         return stock_add
 
@@ -211,7 +452,75 @@ def endpoint_update_stock():
             if not product_sku and not store_code and not stock:
                 return request_conflict()
 
-            return json.dumps(json_data)
+            return json_response(json_data)
+
+        else:
+            return not_found()
+
+
+def read_ndjson_stream(stream):
+    r"""
+    Read the objects of a NDJSON (one JSON object by line) request body without loading it all in memory.
+    The lines that are not valid JSON are yielded as None to be reported as invalid items.
+    """
+
+    for line in stream:
+        line = line.strip()
+
+        if not line:
+            continue
+
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def add_bulk_stock_by_store_by_product(stock_items):
+
+    stock_bulk_add = update_bulk_product_store_stock(stock_items)
+
+    logger.info('Bulk Stock added: Items: %s, Updated: %s, Failed: %s', stock_bulk_add["TotalItems"],
+                stock_bulk_add["UpdatedItems"], stock_bulk_add["FailedItems"])
+
+    return stock_bulk_add
+
+
+@app.route('/api/ecommerce/stock/bulk/',  methods=['POST', 'OPTIONS'])
+@jwt_required
+def endpoint_bulk_update_stock():
+
+    headers = request.headers
+    auth = headers.get('Authorization')
+
+    if not auth and 'Bearer' not in auth:
+        return request_unauthorized()
+    else:
+        if request.method == 'OPTIONS':
+            headers = {
+                'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                'Access-Control-Max-Age': 1000,
+                'Access-Control-Allow-Headers': 'origin, x-csrftoken, content-type, accept',
+            }
+            return '', 200, headers
+
+        elif request.method == 'POST':
+
+            if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+                stock_items = read_ndjson_stream(request.stream)
+            else:
+                stock_items = request.get_json(force=True, silent=True)
+
+                if not isinstance(stock_items, list):
+                    return request_conflict()
+
+            try:
+                json_data = add_bulk_stock_by_store_by_product(stock_items)
+            except mvc_exc.IntegrityError as error:
+                logger.error('Bulk stock update rejected: %s', error)
+                return request_conflict(error)
+
+            return json_response(json_data)
 
         else:
             return not_found()
@@ -238,12 +547,10 @@ def manage_store_requested_data(store_data):
         store_obj = StoreModel(store_code, store_name, store_external_number, store_street_address, store_suburb_address,
                                store_city_address, store_country_address, store_zippostal_code, store_min_inventory)
 
-        store_data = store_model_db.manage_store_data(store_obj)
-
-        store_data_manage = json.loads(store_data)
+        store_data_manage = store_model_db.manage_store_data(store_obj)
 
         if len(store_data_manage) != 0:
-            logger.info('Response Store Data: %s', str(store_data_manage))
+            logger.debug('Response Store Data: %s', store_data_manage)
 
             return store_data_manage
 
@@ -259,13 +566,11 @@ def get_stores_by_code(store_code):
 
     store_list_data = {}
 
-    store_get_list_data = select_by_store_code(store_code)
-
-    store_list_data = json.loads(store_get_list_data)
+    store_list_data = select_by_store_code(store_code)
 
     if store_list_data:
 
-        logger.info('List Stores data by code: {}: {}: '.format(store_code, store_list_data))
+        logger.debug('List Stores data by code: %s: %s', store_code, store_list_data)
 
         return store_list_data
 
@@ -303,27 +608,24 @@ def endpoint_processing_store_data():
             if not data or str(data) is None:
                 return request_conflict()
 
-            logger.info('Data Json Store to Manage on DB: %s', str(data))
+            logger.debug('Data Json Store to Manage on DB: %s', data)
 
             json_store_response = manage_store_requested_data(data)
 
-            return json.dumps(json_store_response)
+            return json_response(json_store_response)
 
         elif request.method == 'GET':
             data = request.get_json(force=True)
 
             store_code = data['store_code']
 
-            json_data = []
-
-            json_data = get_stores_by_code(store_code)
-
-            logger.info('Stores List data by Code: %s', str(json_data))
-
             if not store_code:
                 return request_conflict()
 
-            return json.dumps(json_data)
+            store_version = select_store_version(store_code)
+
+            return conditional_json_response(store_version, 'store:{}'.format(store_code),
+                                             lambda: get_stores_by_code(store_code))
 
         elif request.method == 'PUT':
 
@@ -339,19 +641,18 @@ def endpoint_processing_store_data():
 
             json_data = update_store_data_endpoint(data_store)
 
-            logger.info('Data to update Store: %s',
-                        "Store code: {0}, Store name: {1}".format(store_code, store_name))
+            logger.info('Data to update Store: Store code: %s, Store name: %s', store_code, store_name)
 
-            logger.info('Store updated Info: %s', str(json_data))
+            logger.debug('Store updated Info: %s', json_data)
 
-            return json_data
+            return json_response(json_data)
 
         elif request.method == 'DELETE':
             data = request.get_json(force=True)
 
             store_code = data['store_code']
 
-            logger.info('Store to Delete: %s', 'Store Code: {}'.format(store_code))
+            logger.info('Store to Delete: Store Code: %s', store_code)
 
             json_data = []
 
@@ -360,9 +661,54 @@ def endpoint_processing_store_data():
 
             json_data = delete_store_data(store_code)
 
-            logger.info('Store deleted: %s', json_data)
+            logger.debug('Store deleted: %s', json_data)
+
+            return json_response(json_data)
+
+        else:
+            return not_found()
+
+
+def get_request_page_size():
+
+    pagination_cfg = Util.get_config_constant_file().get('PAGINATION') or {}
 
-            return json.dumps(json_data)
+    return get_page_size(request.args.get('page_size'),
+                         int(pagination_cfg.get('DEFAULT_PAGE_SIZE', 50)),
+                         int(pagination_cfg.get('MAX_PAGE_SIZE', 500)))
+
+
+@app.route('/api/ecommerce/manage/store/list/', methods=['GET', 'OPTIONS'])
+@jwt_required
+def endpoint_list_stores():
+
+    headers = request.headers
+    auth = headers.get('Authorization')
+
+    if not auth and 'Bearer' not in auth:
+        return request_unauthorized()
+    else:
+        if request.method == 'OPTIONS':
+            headers = {
+                'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                'Access-Control-Max-Age': 1000,
+                'Access-Control-Allow-Headers': 'origin, x-csrftoken, content-type, accept',
+            }
+            return '', 200, headers
+
+        elif request.method == 'GET':
+
+            # La pagina siguiente se pide con el cursor (NextCursor) de la respuesta anterior
+            try:
+                page_size = get_request_page_size()
+
+                json_data = select_stores_page(page_size, request.args.get('cursor'))
+
+            except ValueError as error:
+                logger.error('Invalid stores page: %s', error)
+                return request_conflict()
+
+            return json_response(json_data)
 
         else:
             return not_found()
@@ -405,12 +751,10 @@ def manage_product_requested_data(product_data):
                                    product_status, product_published, manage_stock, product_length, product_width,
                                    product_height, product_weight)
 
-        data_product = product_model_db.manage_product_data(product_obj)
-
-        product_data_manage = json.loads(data_product)
+        product_data_manage = product_model_db.manage_product_data(product_obj)
 
         if len(product_data_manage) != 0:
-            logger.info('Response Product Data: %s', str(product_data_manage))
+            logger.debug('Response Product Data: %s', product_data_manage)
 
             return product_data_manage
 
@@ -422,17 +766,15 @@ def manage_product_requested_data(product_data):
         )
 
 
-def get_products_by_sku(product_sku):
+def get_products_by_sku(product_sku, product_columns=None):
 
     product_list_data = {}
 
-    product_get_list_data = select_by_product_sku(product_sku)
-
-    product_list_data = json.loads(product_get_list_data)
+    product_list_data = select_by_product_sku(product_sku, product_columns)
 
     if product_list_data:
 
-        logger.info('List Product data by SKU: {}: {}: '.format(product_sku, product_list_data))
+        logger.debug('List Product data by SKU: %s: %s', product_sku, product_list_data)
 
         return product_list_data
 
@@ -462,27 +804,31 @@ def endpoint_processing_product_data():
             if not data or str(data) is None:
                 return request_conflict()
 
-            logger.info('Data Json Store to Manage on DB: %s', str(data))
+            logger.debug('Data Json Store to Manage on DB: %s', data)
 
             json_store_response = manage_product_requested_data(data)
 
-            return json.dumps(json_store_response)
+            return json_response(json_store_response)
 
         elif request.method == 'GET':
             data = request.get_json(force=True)
 
             product_sku = data['product_sku']
 
-            json_data = []
-
-            json_data = get_products_by_sku(product_sku)
-
-            logger.info('Product List data by SKU: %s', str(json_data))
+            # Proyeccion opcional: ?fields=PRICE,STOCK o "fields" en el body
+            try:
+                product_columns = get_product_projection(request.args.get('fields') or data.get('fields'))
+            except ValueError as error:
+                logger.error('Invalid product fields: %s', error)
+                return request_conflict()
 
             if not product_sku:
                 return request_conflict()
 
-            return json.dumps(json_data)
+            product_version = select_product_version(product_sku)
+
+            return conditional_json_response(product_version, 'product:{}:{}'.format(product_sku, product_columns),
+                                             lambda: get_products_by_sku(product_sku, product_columns))
 
         elif request.method == 'PUT':
 
@@ -500,15 +846,12 @@ def endpoint_processing_product_data():
 
             json_data = update_product_data(data_store)
 
-            logger.info('Data to update Product: %s',
-                        "Product SKU: {0}, "
-                        "Product Name: {1}, "
-                        "Product Store Code: {2}, "
-                        "Product Stock: {3}".format(product_sku, product_name, product_store_code, product_stock))
+            logger.info('Data to update Product: Product SKU: %s, Product Name: %s, Product Store Code: %s, '
+                        'Product Stock: %s', product_sku, product_name, product_store_code, product_stock)
 
-            logger.info('Product updated Info: %s', str(json_data))
+            logger.debug('Product updated Info: %s', json_data)
 
-            return json_data
+            return json_response(json_data)
 
         elif request.method == 'DELETE':
             data = request.get_json(force=True)
@@ -516,7 +859,7 @@ def endpoint_processing_product_data():
             store_code = data['store_code']
             product_sku = data['product_sku']
 
-            logger.info('Store to Delete: %s', 'Store Code: {}'.format(store_code))
+            logger.info('Store to Delete: Store Code: %s', store_code)
 
             json_data = []
 
@@ -525,9 +868,231 @@ def endpoint_processing_product_data():
 
             json_data = delete_product_data(product_sku, store_code)
 
-            logger.info('Product deleted: %s', json_data)
+            logger.debug('Product deleted: %s', json_data)
 
-            return json.dumps(json_data)
+            return json_response(json_data)
+
+        else:
+            return not_found()
+
+
+@app.route('/api/ecommerce/manage/product/list/', methods=['GET', 'OPTIONS'])
+@jwt_required
+def endpoint_list_products():
+
+    headers = request.headers
+    auth = headers.get('Authorization')
+
+    if not auth and 'Bearer' not in auth:
+        return request_unauthorized()
+    else:
+        if request.method == 'OPTIONS':
+            headers = {
+                'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                'Access-Control-Max-Age': 1000,
+                'Access-Control-Allow-Headers': 'origin, x-csrftoken, content-type, accept',
+            }
+            return '', 200, headers
+
+        elif request.method == 'GET':
+
+            try:
+                page_size = get_request_page_size()
+                product_columns = get_product_projection(request.args.get('fields'))
+
+                json_data = select_products_page(page_size,
+                                                 request.args.get('cursor'),
+                                                 request.args.get('store_code'),
+                                                 product_columns)
+
+            except ValueError as error:
+                logger.error('Invalid products page: %s', error)
+                return request_conflict()
+
+            return json_response(json_data)
+
+        else:
+            return not_found()
+
+
+def get_catalog_format(mimetype, file_name=None):
+
+    if file_name:
+        extension = file_name.rsplit('.', 1)[-1].lower()
+
+        if extension in ('jsonl', 'ndjson'):
+            return 'jsonl'
+        elif extension == 'csv':
+            return 'csv'
+
+    if mimetype in ('application/x-ndjson', 'application/jsonl'):
+        return 'jsonl'
+    elif mimetype in ('text/csv', 'application/csv'):
+        return 'csv'
+
+    return None
+
+
+def import_catalog_products(byte_stream, file_format):
+
+    catalog_imported = import_product_catalog(byte_stream, file_format)
+
+    logger.info('Catalog imported: Lines: %s, Inserted: %s, Updated: %s, Failed: %s', catalog_imported["TotalLines"],
+                catalog_imported["InsertedProducts"], catalog_imported["UpdatedProducts"],
+                catalog_imported["FailedLines"])
+
+    return catalog_imported
+
+
+@app.route('/api/ecommerce/manage/product/import/', methods=['POST', 'OPTIONS'])
+@jwt_required
+def endpoint_import_product_catalog():
+
+    headers = request.headers
+    auth = headers.get('Authorization')
+
+    if not auth and 'Bearer' not in auth:
+        return request_unauthorized()
+    else:
+        if request.method == 'OPTIONS':
+            headers = {
+                'Access-Control-Allow-Methods': 'POST, OPTIONS',
+                'Access-Control-Max-Age': 1000,
+                'Access-Control-Allow-Headers': 'origin, x-csrftoken, content-type, accept',
+            }
+            return '', 200, headers
+
+        elif request.method == 'POST':
+
+            # El body se lee por lineas desde el stream, nunca se carga completo en memoria
+            file_format = request.args.get('format') or get_catalog_format(request.mimetype)
+
+            if file_format not in CATALOG_FORMATS:
+                return request_conflict()
+
+            json_data = import_catalog_products(request.stream, file_format)
+
+            return json_response(json_data)
+
+        else:
+            return not_found()
+
+
+def get_boolean_arg(value):
+
+    if value is None:
+        return None
+    elif value.lower() in ('true', '1', 'yes'):
+        return True
+    elif value.lower() in ('false', '0', 'no'):
+        return False
+
+    raise ValueError('Invalid boolean value: {}'.format(value))
+
+
+@app.route('/api/ecommerce/manage/product/export/', methods=['GET', 'OPTIONS'])
+@jwt_required
+def endpoint_export_product_catalog():
+
+    headers = request.headers
+    auth = headers.get('Authorization')
+
+    if not auth and 'Bearer' not in auth:
+        return request_unauthorized()
+    else:
+        if request.method == 'OPTIONS':
+            headers = {
+                'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                'Access-Control-Max-Age': 1000,
+                'Access-Control-Allow-Headers': 'origin, x-csrftoken, content-type, accept',
+            }
+            return '', 200, headers
+
+        elif request.method == 'GET':
+
+            file_format = request.args.get('format', 'jsonl')
+            store_code = request.args.get('store_code')
+            product_status = request.args.get('status')
+
+            if file_format == 'ndjson':
+                file_format = 'jsonl'
+
+            if file_format not in CATALOG_FORMATS:
+                return request_conflict()
+
+            if product_status is not None and product_status not in Util.get_config_constant_file()[
+                    'PRODUCT_STATUS_CHECK_LIST']:
+                return request_conflict()
+
+            try:
+                product_published = get_boolean_arg(request.args.get('published'))
+            except ValueError:
+                return request_conflict()
+
+            logger.info('Catalog export: Format: %s, Store: %s, Status: %s, Published: %s', file_format, store_code,
+                        product_status, product_published)
+
+            # Los productos se envian por paginas del cursor del servidor, nunca se cargan todos en memoria
+            catalog_stream = export_product_catalog(file_format, store_code, product_status, product_published)
+
+            return app.response_class(stream_with_context(catalog_stream),
+                                      mimetype=CATALOG_EXPORT_MIMETYPES[file_format],
+                                      headers={
+                                          'Content-Disposition': 'attachment; filename=product_catalog.{}'.format(
+                                              file_format),
+                                      })
+
+        else:
+            return not_found()
+
+
+@app.cli.command('import-catalog')
+@click.argument('catalog_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'file_format', type=click.Choice(CATALOG_FORMATS), default=None,
+              help='Format of the catalog, by default it is taken from the file extension')
+def import_catalog_command(catalog_file, file_format):
+    r"""
+    Import a product catalog file (CSV or JSONL): flask import-catalog catalog.csv
+    """
+
+    file_format = file_format or get_catalog_format(None, catalog_file)
+
+    if file_format is None:
+        raise click.BadParameter('Can not infer the format of the file, use --format', param_hint='--format')
+
+    with open(catalog_file, 'rb') as byte_stream:
+        catalog_imported = import_catalog_products(byte_stream, file_format)
+
+    click.echo(json.dumps(catalog_imported, indent=2))
+
+
+@app.route('/api/ecommerce/metrics/', methods=['GET', 'OPTIONS'])
+@jwt_required
+def endpoint_metrics():
+
+    headers = request.headers
+    auth = headers.get('Authorization')
+
+    if not auth and 'Bearer' not in auth:
+        return request_unauthorized()
+    else:
+        if request.method == 'OPTIONS':
+            headers = {
+                'Access-Control-Allow-Methods': 'GET, OPTIONS',
+                'Access-Control-Max-Age': 1000,
+                'Access-Control-Allow-Headers': 'origin, x-csrftoken, content-type, accept',
+            }
+            return '', 200, headers
+
+        elif request.method == 'GET':
+
+            json_data = {
+                "Caches": get_lookup_cache_stats(),
+                "ConnectionPool": get_connection_pool().stats(),
+                "Logging": get_async_pipelines_stats(),
+            }
+
+            return json_response(json_data)
 
         else:
             return not_found()
@@ -571,9 +1136,7 @@ def get_authentication():
 
             json_token = user_registration(user_name, password)
 
-            json_token = json.dumps(json_token)
-
-            return json_token
+            return json_response(json_token)
 
         else:
             return request_conflict()
@@ -588,7 +1151,7 @@ def not_found(error=None):
         'error_message': 'Page Not Found: ' + request.url,
     }
 
-    resp = jsonify(message)
+    resp = json_response(message)
     resp.status_code = 404
 
     return resp
@@ -601,7 +1164,7 @@ def server_error(error=None):
         'error_message': 'Server Error: ' + request.url,
     }
 
-    resp = jsonify(message)
+    resp = json_response(message)
     resp.status_code = 500
 
     return resp
@@ -614,7 +1177,7 @@ def request_unauthorized(error=None):
         'error_message': 'Request Unauthorized: ' + request.url,
     }
 
-    resp = jsonify(message)
+    resp = json_response(message)
     resp.status_code = 401
 
     return resp
@@ -627,7 +1190,11 @@ def request_conflict(error=None):
         "error_message": 'Request data conflict or Authentication data conflict, please verify it. ' + request.url,
     }
 
-    resp = jsonify(message)
+    # Detalle de los conflictos de datos del backend (limites, validaciones)
+    if isinstance(error, mvc_exc.IntegrityError):
+        message["error_detail"] = str(error)
+
+    resp = json_response(message)
     resp.status_code = 409
 
     return resp
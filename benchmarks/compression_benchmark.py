@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Bytes on the wire and CPU cost of the response compression by encoding and level.
+
+It does not need the database, the payloads have the structure of the responses: product lists
+(select_by_product_sku), multi-store stock lists (/stock/batch/) and a NDJSON catalog export:
+    python -m benchmarks.compression_benchmark --products 200 --repeat 20
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import argparse
+import time
+
+from benchmarks.json_encoder_benchmark import build_product_list
+from utilities.json_encoder import JsonEncoder
+from utilities.response_compression import ResponseCompressor, CompressedStream, available_encodings
+
+
+def build_stock_batch(products, stores):
+
+    return {
+        "Products": [{
+            "SKU": 'A{}'.format(20000 + product),
+            "TotalStock": stores * 10,
+            "ProductStock": [{"CodeStore": 'A-{:02d}'.format(store), "NameStore": 'Tienda {}'.format(store),
+                              "Stock": 10} for store in range(stores)],
+        } for product in range(products)],
+        "NotFound": [],
+    }
+
+
+def build_payloads(products):
+
+    json_encoder = JsonEncoder()
+
+    product_list = build_product_list(products)
+
+    export_lines = [json_encoder.dumps(product["Product"]) + b'\n' for product in product_list]
+    export_chunks = [b''.join(export_lines[start:start + 50]) for start in range(0, len(export_lines), 50)]
+
+    return [
+        ('product list', [json_encoder.dumps(product_list)], False),
+        ('stock batch', [json_encoder.dumps(build_stock_batch(products, 20))], False),
+        ('NDJSON export', export_chunks, True),
+    ]
+
+
+def run_compression(encoding, level, chunks, streamed, repeat):
+
+    compressed_bytes = 0
+
+    start_cpu = time.process_time()
+
+    for _ in range(repeat):
+        compressor = ResponseCompressor(encoding, level)
+
+        if streamed:
+            compressed_bytes = sum(len(compressed) for compressed in CompressedStream(iter(chunks), compressor))
+        else:
+            compressed_bytes = len(compressor.compress(chunks[0]))
+
+    return compressed_bytes, (time.process_time() - start_cpu) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Response compression savings and CPU cost')
+    parser.add_argument('--products', type=int, default=200, help='Products of each payload')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--levels', default='br:1,4,9;zstd:1,3,9;gzip:1,6,9',
+                        help='Levels by encoding, encoding:level,level;...')
+    args = parser.parse_args()
+
+    levels = {encoding: [int(level) for level in encoding_levels.split(',')]
+              for encoding, encoding_levels in (item.split(':') for item in args.levels.split(';'))}
+
+    print('{:<14} {:<5} {:>5} {:>10} {:>10} {:>8} {:>10} {:>10}'.format(
+        'Payload', 'Enc', 'Level', 'Raw B', 'Wire B', 'Saved', 'CPU ms', 'MB/s'))
+
+    for payload_name, chunks, streamed in build_payloads(args.products):
+        raw_bytes = sum(len(chunk) for chunk in chunks)
+
+        for encoding in available_encodings():
+            for level in levels.get(encoding, [None]):
+                compressed_bytes, cpu_seconds = run_compression(encoding, level, chunks, streamed, args.repeat)
+
+                print('{:<14} {:<5} {:>5} {:>10} {:>10} {:>7.1f}% {:>10.3f} {:>10.1f}'.format(
+                    payload_name, encoding, level, raw_bytes, compressed_bytes,
+                    100.0 * (1 - compressed_bytes / raw_bytes), cpu_seconds * 1000,
+                    raw_bytes / cpu_seconds / 1024 / 1024 if cpu_seconds else float('inf')))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Serialization time of the product lists (select_by_product_sku) with orjson against the stdlib json.
+
+It does not need the database, the products are built with the same structure and column types:
+    python -m benchmarks.json_encoder_benchmark --products 50 --repeat 2000
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import argparse
+import datetime
+import decimal
+import time
+import uuid
+
+from utilities.json_encoder import JsonEncoder, orjson
+
+
+def build_product_list(products):
+
+    creation_date = datetime.datetime(2021, 3, 1, 10, 30, 15)
+
+    return [{
+        "Product": {
+            "IdProduct": uuid.uuid4(),
+            "SKUProduct": 'A{}'.format(20000 + product),
+            "UNSPC": '50201706',
+            "NameProduct": 'Cafe molido {}'.format(product),
+            "TitleProduct": 'Cafe molido tostado medio 500 g',
+            "BrandProduct": 'Cargamos',
+            "UOMProduct": 'PZA',
+            "CategoryIdProduct": 100,
+            "ParentCategoryIdProduct": 10,
+            "StockProduct": product % 500,
+            "CodeStore": 'A-{:02d}'.format(product % 20),
+            "NameStore": 'Tienda {}'.format(product % 20),
+            "LongDescriptionProduct": 'Cafe de altura molido, tostado medio, bolsa resellable. ' * 4,
+            "PhotoProduct": 'https://cdn.example.com/products/{}.jpg'.format(product),
+            "Prices": {
+                "PriceProduct": decimal.Decimal('129.90'),
+                "TaxPriceProduct": decimal.Decimal('20.78'),
+                "CurrencyPriceProduct": 'MXN',
+            },
+            "StatusProduct": 'Activo',
+            "PublishedProduct": True,
+            "ManageStockProduct": True,
+            "Volumetry": {
+                "LengthProduct": decimal.Decimal('20.00'),
+                "WidthProduct": decimal.Decimal('12.50'),
+                "HeightProduct": decimal.Decimal('6.00'),
+                "WeightProduct": decimal.Decimal('0.50'),
+            },
+            "CreationDate": creation_date,
+            "LastUpdateDate": creation_date + datetime.timedelta(days=product),
+        }
+    } for product in range(products)]
+
+
+def run_encoder(json_encoder, product_list, repeat):
+
+    start_time = time.perf_counter()
+
+    for _ in range(repeat):
+        json_encoder.dumps(product_list)
+
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='orjson vs stdlib json serialization of product lists')
+    parser.add_argument('--products', type=int, default=50, help='Products on each serialized list')
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    product_list = build_product_list(args.products)
+
+    stdlib_seconds = run_encoder(JsonEncoder('json'), product_list, args.repeat)
+
+    print('json:   {} lists in {:.3f}s -> {:.1f} lists/s'.format(args.repeat, stdlib_seconds,
+                                                                  args.repeat / stdlib_seconds))
+
+    if orjson is None:
+        print('orjson: not installed')
+        return
+
+    orjson_seconds = run_encoder(JsonEncoder('orjson'), product_list, args.repeat)
+
+    print('orjson: {} lists in {:.3f}s -> {:.1f} lists/s'.format(args.repeat, orjson_seconds,
+                                                                  args.repeat / orjson_seconds))
+    print('Speedup: {:.1f}x'.format(stdlib_seconds / orjson_seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Latency of a log call on the request threads, with the handlers called on the same thread (sync) or
+through the bounded queue of logger_controller.async_logging (async).
+
+The handlers are the ones of logger_control: a file and a stream (to os.devnull):
+    python -m benchmarks.logging_benchmark --threads 8 --records 5000
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from logger_controller.async_logging import AsyncLogPipeline
+
+
+def build_handlers(log_path, devnull):
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    file_handler = logging.FileHandler(log_path)
+    file_handler.setFormatter(formatter)
+
+    stream_handler = logging.StreamHandler(devnull)
+    stream_handler.setFormatter(formatter)
+
+    return [file_handler, stream_handler]
+
+
+def run_threads(logger, threads, records):
+    latencies = [[] for _ in range(threads)]
+
+    def log_records(thread_latencies):
+        for record in range(records):
+            start = time.perf_counter()
+            logger.info('Product: %s, Store: %s, Stock: %s', record, 'A-01', 10)
+            thread_latencies.append(time.perf_counter() - start)
+
+    workers = [threading.Thread(target=log_records, args=(latencies[thread],)) for thread in range(threads)]
+
+    start = time.perf_counter()
+
+    for worker in workers:
+        worker.start()
+
+    for worker in workers:
+        worker.join()
+
+    elapsed = time.perf_counter() - start
+
+    return sorted(latency for thread_latencies in latencies for latency in thread_latencies), elapsed
+
+
+def run_mode(mode, threads, records, queue_size, full_policy):
+    with tempfile.TemporaryDirectory() as log_dir, open(os.devnull, 'w') as devnull:
+        handlers = build_handlers(os.path.join(log_dir, 'benchmark.log'), devnull)
+
+        logger = logging.getLogger('logging_benchmark_{}'.format(mode))
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+        pipeline = None
+
+        if mode == 'async':
+            pipeline = AsyncLogPipeline(handlers, queue_size, full_policy)
+            pipeline.start()
+            logger.handlers = [pipeline.queue_handler]
+        else:
+            logger.handlers = handlers
+
+        latencies, elapsed = run_threads(logger, threads, records)
+
+        dropped = 0
+
+        if pipeline is not None:
+            dropped = pipeline.stats()["Dropped"]
+            pipeline.stop()
+
+        for handler in handlers:
+            handler.close()
+
+    return latencies, elapsed, dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Log call latency, sync handlers against the async queue')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--records', type=int, default=5000, help='Records by thread')
+    parser.add_argument('--queue-size', type=int, default=10000)
+    parser.add_argument('--full-policy', default='drop', choices=('drop', 'block'))
+    args = parser.parse_args()
+
+    print('{:<6} {:>10} {:>10} {:>10} {:>12} {:>8}'.format('Mode', 'p50 us', 'p99 us', 'max us', 'records/s', 'Dropped'))
+
+    for mode in ('sync', 'async'):
+        latencies, elapsed, dropped = run_mode(mode, args.threads, args.records, args.queue_size, args.full_policy)
+
+        percentiles = statistics.quantiles(latencies, n=100)
+
+        print('{:<6} {:>10.1f} {:>10.1f} {:>10.1f} {:>12.0f} {:>8}'.format(
+            mode, percentiles[49] * 1e6, percentiles[98] * 1e6, latencies[-1] * 1e6, len(latencies) / elapsed,
+            dropped))
+
+
+if __name__ == '__main__':
+    main()
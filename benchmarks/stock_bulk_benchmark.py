@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Throughput of the bulk stock update against the single item stock update.
+
+Runs against the database configured on constants.yml, the products must be registered on the store:
+    python -m benchmarks.stock_bulk_benchmark --store-code A-01 --sku A20981 --sku A20982 --items 5000
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import argparse
+import itertools
+import time
+
+from db_controller.database_backend import update_product_store_stock, update_bulk_product_store_stock
+
+
+def build_stock_items(store_code, product_skus, items):
+
+    sku_cycle = itertools.cycle(product_skus)
+
+    return [{"product_sku": next(sku_cycle), "store_code": store_code, "stock": item % 500}
+            for item in range(items)]
+
+
+def run_single_item(stock_items):
+
+    start_time = time.perf_counter()
+
+    for stock_item in stock_items:
+        update_product_store_stock(stock_item["stock"], stock_item["product_sku"], stock_item["store_code"])
+
+    return time.perf_counter() - start_time
+
+
+def run_bulk(stock_items):
+
+    start_time = time.perf_counter()
+
+    update_bulk_product_store_stock(stock_items)
+
+    return time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk vs single item stock update throughput')
+    parser.add_argument('--store-code', required=True)
+    parser.add_argument('--sku', action='append', required=True)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--single-items', type=int, default=200,
+                        help='Items of the single item run, it is much slower than the bulk run')
+    args = parser.parse_args()
+
+    single_items = build_stock_items(args.store_code, args.sku, args.single_items)
+    bulk_items = build_stock_items(args.store_code, args.sku, args.items)
+
+    single_seconds = run_single_item(single_items)
+    bulk_seconds = run_bulk(bulk_items)
+
+    single_throughput = len(single_items) / single_seconds
+    bulk_throughput = len(bulk_items) / bulk_seconds
+
+    print('Single item: {} items in {:.3f}s -> {:.1f} items/s'.format(len(single_items), single_seconds,
+                                                                      single_throughput))
+    print('Bulk:        {} items in {:.3f}s -> {:.1f} items/s'.format(len(bulk_items), bulk_seconds,
+                                                                      bulk_throughput))
+    print('Speedup:     {:.1f}x'.format(bulk_throughput / single_throughput))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
 """
 Requires Python 3.8 or later
+
+Documentation:
+    The constants file is parsed once by process and kept in memory as a read only Settings object,
+    it is read again only when the file changes (mtime checked at most every CONFIG_CACHE.CHECK_INTERVAL
+    seconds), on a SIGHUP signal or with an explicit call to reload_settings().
 """
 
 __author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
@@ -9,11 +14,21 @@ __license__ = ""
 __history__ = """ """
 __version__ = "1.1.A19.1 ($Rev: 1 $)"
 
+import logging
+import os
+import signal
+import threading
+import time
+from collections.abc import Mapping
+
 import yaml
-from logger_controller.logger_control import *
 
 
-logger = configure_ws_logger()
+# Logger of the WS ('api'), it is configured by logger_control, that module depends on this one to read the
+# constants file so it can not be imported here
+logger = logging.getLogger('api')
+
+DEFAULT_CHECK_INTERVAL = 2.0
 
 
 class Constants:
@@ -35,3 +50,218 @@ class Constants:
 
         return cfg
 
+
+def freeze_settings(value):
+    r"""
+    Convert the values read from the YAML file to read only values: dict to Settings and list to tuple.
+    """
+
+    if isinstance(value, dict):
+        return Settings(value)
+
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_settings(item) for item in value)
+
+    return value
+
+
+class Settings(Mapping):
+    r"""
+    Read only view of a section of the constants file.
+
+    The values are read as a dictionary (cfg['DB_OBJECTS']['STORE_TABLE']) or as attributes
+    (cfg.DB_OBJECTS.STORE_TABLE), the nested sections are Settings too and the lists are tuples.
+    """
+
+    __slots__ = ('_values',)
+
+    def __init__(self, values):
+        object.__setattr__(self, '_values', {key: freeze_settings(value) for key, value in values.items()})
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __getattr__(self, name):
+        if name == '_values':
+            raise AttributeError(name)
+
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError('Setting not found: {}'.format(name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('The settings are read only, use reload_settings() to read the constants file again')
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __repr__(self):
+        return 'Settings({!r})'.format(self._values)
+
+    def to_dict(self):
+        r"""
+        Mutable copy of the settings, for the code that needs to change or serialize them.
+        """
+
+        return {key: value.to_dict() if isinstance(value, Settings) else value
+                for key, value in self._values.items()}
+
+
+class SettingsCache:
+    r"""
+    Settings of a constants file loaded once by process.
+
+    get() is the hot path: while the check interval is not expired it only compares a timestamp and returns
+    the same Settings object, after that the mtime of the file is checked and it is read again if it changed.
+    If the new content is not valid the last valid settings are kept.
+    """
+
+    def __init__(self, constants_file):
+        self.constants_file = constants_file
+
+        self._settings = None
+        self._mtime = None
+        self._next_check = 0.0
+        self._check_interval = DEFAULT_CHECK_INTERVAL
+        self._lock = threading.Lock()
+
+    def get(self):
+        settings = self._settings
+
+        if settings is not None and time.monotonic() < self._next_check:
+            return settings
+
+        with self._lock:
+            if self._settings is None:
+                self._load()
+
+            elif time.monotonic() >= self._next_check:
+                if self._file_mtime() != self._mtime:
+                    self._reload()
+
+                self._next_check = time.monotonic() + self._check_interval
+
+            return self._settings
+
+    def reload(self):
+        r"""
+        Read the constants file again even if it did not change.
+
+        :return settings: The new settings, or the last valid ones if the file can not be read.
+        """
+
+        with self._lock:
+            if self._settings is None:
+                self._load()
+            else:
+                self._reload()
+
+            return self._settings
+
+    def invalidate(self):
+        r"""
+        Force the file to be read again on the next get(). It takes no lock, so it is safe on a signal handler.
+        """
+
+        self._mtime = None
+        self._next_check = 0.0
+
+    def _file_mtime(self):
+        try:
+            return os.stat(self.constants_file).st_mtime_ns
+        except OSError:
+            return None
+
+    def _load(self):
+        mtime = self._file_mtime()
+
+        with open(self.constants_file, 'r') as ymlfile:
+            cfg = yaml.safe_load(ymlfile)
+
+        if not isinstance(cfg, dict):
+            raise ValueError('The constants file {} does not contain a YAML mapping'.format(self.constants_file))
+
+        self._settings = Settings(cfg)
+        self._mtime = mtime
+
+        cache_cfg = cfg.get('CONFIG_CACHE') or {}
+        self._check_interval = float(cache_cfg.get('CHECK_INTERVAL', DEFAULT_CHECK_INTERVAL))
+        self._next_check = time.monotonic() + self._check_interval
+
+        logger.info('Constants file loaded: %s', self.constants_file)
+
+    def _reload(self):
+        try:
+            self._load()
+        except (OSError, ValueError, yaml.YAMLError) as error:
+            # Evita volver a intentar en cada llamada mientras el archivo siga invalido
+            self._mtime = self._file_mtime()
+            logger.error('Can not reload the constants file %s, the last valid settings are kept: %s',
+                         self.constants_file, error)
+
+
+_settings_caches = {}
+_settings_caches_lock = threading.Lock()
+
+
+def get_settings(constants_file):
+    r"""
+    Get the settings of a constants file, parsed only the first time and when the file changes.
+
+    :param constants_file: Path to the YAML constants file.
+    :return settings: Read only Settings object.
+    """
+
+    settings_cache = _settings_caches.get(constants_file)
+
+    if settings_cache is None:
+        with _settings_caches_lock:
+            settings_cache = _settings_caches.setdefault(constants_file, SettingsCache(constants_file))
+
+    return settings_cache.get()
+
+
+def reload_settings():
+    r"""
+    Read again all the constants files loaded by the process.
+    """
+
+    for settings_cache in list(_settings_caches.values()):
+        settings_cache.reload()
+
+
+def invalidate_settings():
+    r"""
+    Read again all the constants files loaded by the process on the next get_settings() call.
+    """
+
+    for settings_cache in list(_settings_caches.values()):
+        settings_cache.invalidate()
+
+
+def install_reload_signal(signal_number=getattr(signal, 'SIGHUP', None)):
+    r"""
+    Reload the settings when the process receives SIGHUP. It must be called from the main thread.
+
+    :return installed: False if the platform has no SIGHUP or it is not called from the main thread.
+    """
+
+    if signal_number is None or threading.current_thread() is not threading.main_thread():
+        return False
+
+    previous_handler = signal.getsignal(signal_number)
+
+    def handle_reload_signal(signum, frame):
+        # The handler can interrupt a thread that is loading the file, so the reload is deferred to the next read
+        invalidate_settings()
+
+        if callable(previous_handler):
+            previous_handler(signum, frame)
+
+    signal.signal(signal_number, handle_reload_signal)
+
+    return True
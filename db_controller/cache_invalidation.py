@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Invalidation of the lookup caches between processes (gunicorn workers) with PostgreSQL LISTEN/NOTIFY.
+
+Documentation:
+    - The write functions send a NOTIFY on the same transaction of the write, so it is delivered only
+      if the write is committed and after it is visible to the other connections.
+    - Each process runs a listener thread with his own connection (not borrowed from the pool), it removes
+      the keys notified from his caches.
+    - Payload: {"cache": "store"|"product", "keys": [...] or null to clear the cache, "origin": process token,
+      "sent_at": epoch seconds}. The keys are split on many notifications to keep each payload under the
+      8000 bytes limit of PostgreSQL.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import json
+import select
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+
+from logger_controller.logger_control import *
+
+
+logger = configure_db_logger()
+
+MAX_PAYLOAD_BYTES = 7500
+
+
+def build_invalidation_payloads(cache_name, keys, origin):
+    r"""
+    Build the payloads of the notifications to invalidate keys of a cache.
+
+    :param cache_name: Name of the cache ('store' or 'product').
+    :param keys: Iterable of keys to invalidate, None to clear the whole cache.
+    :param origin: Token of the process that sends the notification.
+    :return payloads: List of JSON strings, each one under MAX_PAYLOAD_BYTES.
+    """
+
+    def payload(payload_keys):
+        return json.dumps({"cache": cache_name, "keys": payload_keys, "origin": origin, "sent_at": time.time()})
+
+    if keys is None:
+        return [payload(None)]
+
+    payloads = []
+    chunk = []
+    chunk_bytes = len(payload([]))
+
+    for key in keys:
+        key_bytes = len(json.dumps(key)) + 2
+
+        if chunk and chunk_bytes + key_bytes > MAX_PAYLOAD_BYTES:
+            payloads.append(payload(chunk))
+            chunk = []
+            chunk_bytes = len(payload([]))
+
+        chunk.append(key)
+        chunk_bytes += key_bytes
+
+    if chunk:
+        payloads.append(payload(chunk))
+
+    return payloads
+
+
+class CacheInvalidationListener:
+    r"""
+    Thread that LISTEN the invalidation channel and applies the notifications of the other processes.
+    """
+
+    def __init__(self,
+                 connect_kwargs,
+                 channel,
+                 apply_invalidation,
+                 origin,
+                 poll_timeout=5.0,
+                 reconnect_interval=5.0):
+        r"""
+        :param connect_kwargs: Dictionary with the arguments of psycopg2.connect (host, port, user...).
+        :param channel: Name of the NOTIFY channel.
+        :param apply_invalidation: Function (cache_name, keys) called on each notification, keys None to clear.
+        :param origin: Token of this process, his own notifications are skipped (already applied on the write).
+        :param poll_timeout: Seconds waiting for a notification before check if the listener was stopped.
+        :param reconnect_interval: Seconds to wait before connect again after the connection is lost.
+        """
+
+        self._connect_kwargs = dict(connect_kwargs)
+        self.channel = channel
+        self.origin = origin
+        self.poll_timeout = poll_timeout
+        self.reconnect_interval = reconnect_interval
+
+        self._apply_invalidation = apply_invalidation
+        self._stop_event = threading.Event()
+        self._listening = threading.Event()
+        self._thread = None
+        self._stats_lock = threading.Lock()
+
+        self._received = 0
+        self._applied = 0
+        self._errors = 0
+        self._reconnections = 0
+        self._last_lag = None
+        self._max_lag = None
+
+    def start(self):
+        r"""
+        Start the listener thread, nothing is done if it is already running in this process.
+        """
+
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='cache-invalidation-listener', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        r"""
+        Stop the listener thread, it ends after the current poll timeout at most.
+        """
+
+        self._stop_event.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def wait_listening(self, timeout=None):
+        r"""
+        Wait until the listener is subscribed to the channel, the notifications sent before are not received.
+
+        :return listening: False if the timeout expired before.
+        """
+
+        return self._listening.wait(timeout)
+
+    def stats(self):
+        r"""
+        Get the counters of the notifications received and the lag between the NOTIFY and his application.
+
+        :return stats: Dictionary with the counters, the lag is in seconds.
+        """
+
+        with self._stats_lock:
+            return {
+                "Channel": self.channel,
+                "Running": self.is_running(),
+                "Received": self._received,
+                "Applied": self._applied,
+                "Errors": self._errors,
+                "Reconnections": self._reconnections,
+                "LastLagSeconds": self._last_lag,
+                "MaxLagSeconds": self._max_lag,
+            }
+
+    def reset_after_fork(self):
+        r"""
+        The thread of the parent does not exist on the child, it must start his own listener.
+        """
+
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._listening = threading.Event()
+        self._stats_lock = threading.Lock()
+
+    def _run(self):
+        disconnected = False
+
+        while not self._stop_event.is_set():
+            conn = None
+
+            try:
+                conn = psycopg2.connect(**self._connect_kwargs)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+
+                cursor = conn.cursor()
+                cursor.execute('LISTEN {}'.format(self.channel))
+                cursor.close()
+
+                logger.info('Listening cache invalidations on channel: %s', self.channel)
+
+                # The notifications sent while the listener was disconnected are lost
+                if disconnected:
+                    self._apply_invalidation('store', None)
+                    self._apply_invalidation('product', None)
+                    disconnected = False
+
+                self._listening.set()
+                self._listen(conn)
+
+            except (psycopg2.Error, OSError) as error:
+                disconnected = True
+
+                with self._stats_lock:
+                    self._reconnections += 1
+
+                logger.error('Cache invalidation listener disconnected, retrying in %s seconds: %s',
+                             self.reconnect_interval, error)
+
+                self._stop_event.wait(self.reconnect_interval)
+
+            finally:
+                self._listening.clear()
+
+                if conn is not None and not conn.closed:
+                    conn.close()
+
+    def _listen(self, conn):
+        while not self._stop_event.is_set():
+            if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                continue
+
+            conn.poll()
+
+            while conn.notifies:
+                notify = conn.notifies.pop(0)
+                self._handle(notify.payload)
+
+    def _handle(self, payload):
+        received_at = time.time()
+
+        try:
+            notification = json.loads(payload)
+
+            if notification.get('origin') == self.origin:
+                return
+
+            self._apply_invalidation(notification['cache'], notification.get('keys'))
+
+        except Exception as error:
+            with self._stats_lock:
+                self._received += 1
+                self._errors += 1
+
+            logger.exception('Can not apply the cache invalidation %s: %s', payload, error)
+            return
+
+        lag = max(received_at - float(notification.get('sent_at', received_at)), 0.0)
+
+        with self._stats_lock:
+            self._received += 1
+            self._applied += 1
+            self._last_lag = round(lag, 6)
+            self._max_lag = self._last_lag if self._max_lag is None else max(self._max_lag, self._last_lag)
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Streaming export of the product catalog.
+
+The products are read with a named (server-side) cursor: the database sends them by pages of
+CATALOG_EXPORT.FETCH_ROWS rows and each page is written as a chunk of the response, so only one page
+is kept in memory for any size of the product table.
+
+Documentation:
+    The fields of each line are the same of the catalog import (product_store_code is the code of the
+    store), plus creation_date and last_update_date, so an export can be imported again.
+    Formats: 'csv' with header or 'jsonl' (NDJSON, one JSON object by line).
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import csv
+import io
+import uuid
+
+import psycopg2
+
+from db_controller.database_backend import *
+from db_controller.catalog_import import CATALOG_FORMATS, CATALOG_IMPORT_FIELDS
+from utilities.json_encoder import JsonEncoder
+
+
+CATALOG_EXPORT_FIELDS = tuple(field_name for field_name, _, _ in CATALOG_IMPORT_FIELDS) + \
+    ('creation_date', 'last_update_date')
+
+CATALOG_EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+def format_csv_value(value):
+    r"""
+    Format a column value as a CSV field readable by the catalog import.
+    """
+
+    if value is None:
+        return ''
+    elif isinstance(value, bool):
+        return 'true' if value else 'false'
+    elif hasattr(value, 'isoformat'):
+        return value.isoformat()
+
+    return str(value)
+
+
+class CatalogExportStream:
+    r"""
+    Iterable of the chunks (bytes) of the export, it owns his database connection until it is exhausted or
+    closed. Flask closes it when the response ends, also if the client disconnects before.
+    """
+
+    def __init__(self, conn, cursor, file_format, fetch_rows):
+        self._conn = conn
+        self._cursor = cursor
+        self._file_format = file_format
+        self._fetch_rows = fetch_rows
+        self._header_sent = False
+        self._json_encoder = JsonEncoder((Util.get_config_constant_file().get('JSON_RESPONSE') or {})
+                                         .get('ENCODER', 'auto'))
+
+        self.exported_rows = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._conn is None:
+            raise StopIteration
+
+        try:
+            rows = self._cursor.fetchmany(self._fetch_rows)
+        except psycopg2.Error as error:
+            logger.exception('Catalog export interrupted after %s rows: %s', self.exported_rows, error)
+            self.close()
+            raise
+
+        # The CSV header is sent even if there are no products
+        if not rows and (self._header_sent or self._file_format != 'csv'):
+            logger.info('Catalog exported: Rows: %s', self.exported_rows)
+            self.close()
+            raise StopIteration
+
+        self.exported_rows += len(rows)
+
+        if self._file_format == 'csv':
+            chunk = self._csv_chunk(rows)
+        else:
+            chunk = b''.join(self._json_encoder.dumps(dict(zip(CATALOG_EXPORT_FIELDS, row))) + b'\n'
+                             for row in rows)
+
+        self._header_sent = True
+
+        return chunk
+
+    def _csv_chunk(self, rows):
+        text_buffer = io.StringIO()
+        writer = csv.writer(text_buffer, lineterminator='\n')
+
+        if not self._header_sent:
+            writer.writerow(CATALOG_EXPORT_FIELDS)
+
+        writer.writerows([format_csv_value(value) for value in row] for row in rows)
+
+        return text_buffer.getvalue().encode('utf-8')
+
+    def close(self):
+        r"""
+        Close the server-side cursor and return the connection to the pool, the transaction is rolled back.
+        """
+
+        conn, self._conn = self._conn, None
+
+        if conn is None:
+            return
+
+        try:
+            close_cursor(self._cursor)
+        except psycopg2.Error as error:
+            logger.warning('Can not close the catalog export cursor: %s', error)
+        finally:
+            get_connection_pool().put_connection(conn)
+
+
+def export_product_catalog(file_format, store_code=None, product_status=None, product_published=None):
+    r"""
+    Open a streaming export of the product catalog ordered by SKU and store.
+    The query is executed here, so the errors to connect are raised before the response starts.
+
+    :param file_format: 'csv' (with header) or 'jsonl'.
+    :param store_code: Code of the store to export only his products, None for all the stores.
+    :param product_status: Status of the products to export, None for all.
+    :param product_published: True or False to export only the products (not) published, None for all.
+    :return catalog_stream: CatalogExportStream with the chunks of the export, it must be closed.
+    """
+
+    if file_format not in CATALOG_FORMATS:
+        raise ValueError('Catalog format not supported: {}, use one of {}'.format(file_format, CATALOG_FORMATS))
+
+    cfg = Util.get_config_constant_file()
+
+    export_cfg = cfg.get('CATALOG_EXPORT') or {}
+    fetch_rows = int(export_cfg.get('FETCH_ROWS', 2000))
+
+    product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+    store_table = cfg['DB_OBJECTS']['STORE_TABLE']
+
+    export_columns = ['store.store_code' if field_name == 'product_store_code' else 'prod.{}'.format(field_name)
+                      for field_name in CATALOG_EXPORT_FIELDS]
+
+    sql_filters = []
+    sql_params = []
+
+    for column_name, value in (('store.store_code', store_code),
+                               ('prod.product_status', product_status),
+                               ('prod.product_published', product_published)):
+        if value is not None:
+            sql_filters.append('{} = %s'.format(column_name))
+            sql_params.append(value)
+
+    # The order follows the unique index (product_sku, product_store_id)
+    sql_export = 'SELECT {} ' \
+                 'FROM {} prod ' \
+                 'JOIN {} store ON store.id_store = prod.product_store_id ' \
+                 '{} ' \
+                 'ORDER BY prod.product_sku, prod.product_store_id'.format(', '.join(export_columns),
+                                                                            product_table,
+                                                                            store_table,
+                                                                            'WHERE ' + ' AND '.join(sql_filters)
+                                                                            if sql_filters else '')
+
+    # Long read with his own connection, it does not join the transaction of the request
+    conn = get_connection_pool().get_connection()
+
+    try:
+        cursor = conn.cursor(name='catalog_export_{}'.format(uuid.uuid4().hex))
+        cursor.itersize = fetch_rows
+
+        cursor.execute(sql_export, sql_params)
+
+    except psycopg2.Error as error:
+        get_connection_pool().put_connection(conn)
+        logger.exception('Can not open the catalog export: %s', error)
+        raise SQLAlchemyError(
+            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, product_table)
+        )
+
+    return CatalogExportStream(conn, cursor, file_format, fetch_rows)
@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Bulk import of the product catalog.
+
+The catalog file (CSV with header or JSONL) is read line by line, each record is validated and the valid
+ones are streamed with COPY into a staging table, then merged into the product table by batches.
+Nothing but the current batch buffer is kept in memory, so the memory stays flat for any file size.
+
+Documentation:
+    The fields of each record are the same of the endpoint /api/ecommerce/manage/product/:
+    product_sku, product_unspc, product_brand, category_id, parent_category_id, unit_of_measure,
+    product_stock, product_store_code, product_name, product_title, product_long_description,
+    product_photo, product_price, product_tax, product_currency, product_status, product_published,
+    product_manage_stock, product_length, product_width, product_height, product_weight.
+
+    The errors are reported by line number of the input file.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import csv
+import json
+from decimal import Decimal, InvalidOperation
+
+import psycopg2
+
+from db_controller.database_backend import *
+
+
+CATALOG_FORMATS = ('csv', 'jsonl')
+
+# Input field, staging column type, required
+CATALOG_IMPORT_FIELDS = (
+    ('product_sku', 'varchar', True),
+    ('product_unspc', 'varchar', False),
+    ('product_brand', 'varchar', False),
+    ('category_id', 'numeric', False),
+    ('parent_category_id', 'numeric', False),
+    ('unit_of_measure', 'varchar', False),
+    ('product_stock', 'numeric', True),
+    ('product_store_code', 'varchar', True),
+    ('product_name', 'varchar', True),
+    ('product_title', 'varchar', True),
+    ('product_long_description', 'varchar', False),
+    ('product_photo', 'varchar', False),
+    ('product_price', 'numeric', True),
+    ('product_tax', 'numeric', True),
+    ('product_currency', 'varchar', False),
+    ('product_status', 'varchar', False),
+    ('product_published', 'bool', False),
+    ('product_manage_stock', 'bool', False),
+    ('product_length', 'numeric', False),
+    ('product_width', 'numeric', False),
+    ('product_height', 'numeric', False),
+    ('product_weight', 'numeric', False),
+)
+
+_TRUE_VALUES = ('true', 't', '1', 'yes', 'y', 'si')
+_FALSE_VALUES = ('false', 'f', '0', 'no', 'n')
+
+_COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+class CatalogCopyBuffer:
+    r"""
+    File-like object read by cursor.copy_expert, it pulls the COPY lines from a generator on demand.
+    """
+
+    def __init__(self, copy_lines):
+        self._copy_lines = copy_lines
+        self._buffer = ''
+
+    def read(self, size=-1):
+        chunks = [self._buffer]
+        length = len(self._buffer)
+
+        while self._copy_lines is not None and (size < 0 or length < size):
+            try:
+                copy_line = next(self._copy_lines)
+            except StopIteration:
+                self._copy_lines = None
+                break
+
+            chunks.append(copy_line)
+            length += len(copy_line)
+
+        data = ''.join(chunks)
+
+        if size < 0:
+            self._buffer = ''
+            return data
+
+        self._buffer = data[size:]
+
+        return data[:size]
+
+    def readline(self, size=-1):
+        return self.read(size)
+
+
+def iter_catalog_records(byte_stream, file_format):
+    r"""
+    Read the records of the catalog without loading the whole input.
+
+    :param byte_stream: Iterable of byte lines (file opened in binary mode or the request stream).
+    :param file_format: 'csv' (with header) or 'jsonl'.
+    :return generator: Tuples (line_number, record, error) where record is None if the line can not be read.
+    """
+
+    text_lines = (line.decode('utf-8-sig') if isinstance(line, bytes) else line for line in byte_stream)
+
+    if file_format == 'csv':
+        reader = csv.DictReader(text_lines)
+
+        for record in reader:
+            if None in record:
+                yield reader.line_num, None, 'More columns than the header'
+            else:
+                yield reader.line_num, record, None
+
+    elif file_format == 'jsonl':
+        for line_number, line in enumerate(text_lines, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                yield line_number, None, 'Invalid JSON: {}'.format(error)
+                continue
+
+            if not isinstance(record, dict):
+                yield line_number, None, 'The line is not a JSON object'
+            else:
+                yield line_number, record, None
+
+    else:
+        raise ValueError('Catalog format not supported: {}, use one of {}'.format(file_format, CATALOG_FORMATS))
+
+
+def validate_catalog_record(record, status_allowed):
+    r"""
+    Validate and normalize a record of the catalog to the types of the product table.
+
+    :param record: Dictionary read from the input line.
+    :param status_allowed: List of the product status allowed.
+    :return values: Tuple (values, error), values is None if the record is not valid.
+    """
+
+    values = []
+
+    for field_name, field_type, required in CATALOG_IMPORT_FIELDS:
+        value = record.get(field_name)
+
+        if isinstance(value, str):
+            value = value.strip()
+
+        if value is None or value == '':
+            if required:
+                return None, 'The field {} is required'.format(field_name)
+
+            values.append(None)
+            continue
+
+        if field_type == 'numeric':
+            try:
+                value = Decimal(str(value))
+            except InvalidOperation:
+                return None, 'The field {} must be numeric: {}'.format(field_name, value)
+
+            if not value.is_finite():
+                return None, 'The field {} must be numeric: {}'.format(field_name, value)
+
+        elif field_type == 'bool':
+            if not isinstance(value, bool):
+                if str(value).lower() in _TRUE_VALUES:
+                    value = True
+                elif str(value).lower() in _FALSE_VALUES:
+                    value = False
+                else:
+                    return None, 'The field {} must be boolean: {}'.format(field_name, value)
+
+        else:
+            value = str(value)
+
+        values.append(value)
+
+    product_status = values[15]
+
+    if product_status is not None and product_status not in status_allowed:
+        return None, 'The product_status {} is not allowed: {}'.format(product_status, status_allowed)
+
+    return values, None
+
+
+def format_copy_line(line_number, product_id, values):
+    r"""
+    Format a validated record as a line of the COPY text format.
+
+    :param product_id: Id of the product if it is inserted, an existing product keeps his own id.
+    """
+
+    copy_values = [str(line_number), product_id]
+
+    for value in values:
+        if value is None:
+            copy_values.append('\\N')
+        elif isinstance(value, bool):
+            copy_values.append('t' if value else 'f')
+        else:
+            copy_values.append(str(value).translate(_COPY_ESCAPES))
+
+    return '\t'.join(copy_values) + '\n'
+
+
+def import_product_catalog(byte_stream, file_format):
+    r"""
+    Transaction to import a product catalog by batches: COPY into a staging table and merge by (SKU, store).
+    Each batch is committed on his own, so a rejected batch does not rollback the batches already imported.
+
+    :param byte_stream: Iterable of byte lines of the catalog file.
+    :param file_format: 'csv' (with header) or 'jsonl'.
+    :return catalog_imported: Dictionary with the totals and the errors by line of the input.
+    """
+
+    cfg = Util.get_config_constant_file()
+
+    import_cfg = cfg.get('CATALOG_IMPORT') or {}
+    batch_lines = int(import_cfg.get('BATCH_LINES', 50000))
+    max_errors = int(import_cfg.get('MAX_ERRORS_REPORTED', 1000))
+
+    product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+    store_table = cfg['DB_OBJECTS']['STORE_TABLE']
+    status_allowed = cfg['PRODUCT_STATUS_CHECK_LIST']
+
+    catalog_imported = {
+        "TotalLines": 0,
+        "InsertedProducts": 0,
+        "UpdatedProducts": 0,
+        "FailedLines": 0,
+        "Errors": [],
+        "ErrorsTruncated": False,
+    }
+
+    def add_error(line_number, message, failed_lines=1):
+        catalog_imported["FailedLines"] += failed_lines
+
+        if len(catalog_imported["Errors"]) < max_errors:
+            catalog_imported["Errors"].append({"Line": line_number, "Error": message})
+        else:
+            catalog_imported["ErrorsTruncated"] = True
+
+    records = iter_catalog_records(byte_stream, file_format)
+    batch_state = {"exhausted": False, "first_line": None, "last_line": None, "copied_lines": 0}
+
+    def batch_copy_lines():
+        # Consumes up to batch_lines input lines, the invalid ones are reported and never sent to the database
+        for _ in range(batch_lines):
+            try:
+                line_number, record, error = next(records)
+            except StopIteration:
+                batch_state["exhausted"] = True
+                return
+
+            catalog_imported["TotalLines"] += 1
+
+            if batch_state["first_line"] is None:
+                batch_state["first_line"] = line_number
+
+            batch_state["last_line"] = line_number
+
+            if error is None:
+                values, error = validate_catalog_record(record, status_allowed)
+
+            if error is not None:
+                add_error(line_number, error)
+                continue
+
+            batch_state["copied_lines"] += 1
+
+            yield format_copy_line(line_number, format_uuid(None), values)
+
+    staging_columns = ', '.join('{} {}'.format(field_name, field_type)
+                                for field_name, field_type, _ in CATALOG_IMPORT_FIELDS)
+
+    sql_create_stage = 'CREATE TEMP TABLE product_import_stage ' \
+                       '(line_number integer, product_id uuid, {}) ON COMMIT DROP'.format(staging_columns)
+
+    sql_copy_stage = 'COPY product_import_stage FROM STDIN'
+
+    # The last line of a SKU by store wins if it is repeated on the batch
+    sql_merge_stage = 'WITH merged AS (' \
+                      ' INSERT INTO {} ' \
+                      '    (product_id, product_sku, product_unspc, product_brand, category_id, parent_category_id, ' \
+                      '     unit_of_measure, product_stock, product_store_id, product_name, product_title, ' \
+                      '     product_long_description, product_photo, product_price, product_tax, ' \
+                      '     product_currency, product_status, product_published, product_manage_stock, ' \
+                      '     product_length, product_width, product_height, product_weight) ' \
+                      ' SELECT DISTINCT ON (stage.product_sku, store.id_store) ' \
+                      '    stage.product_id, stage.product_sku, ' \
+                      '    stage.product_unspc, stage.product_brand, stage.category_id, stage.parent_category_id, ' \
+                      '    stage.unit_of_measure, stage.product_stock, store.id_store, stage.product_name, ' \
+                      '    stage.product_title, stage.product_long_description, stage.product_photo, ' \
+                      '    stage.product_price, stage.product_tax, ' \
+                      "    COALESCE(stage.product_currency, 'MX'), COALESCE(stage.product_status, 'Activo'), " \
+                      '    COALESCE(stage.product_published, true), COALESCE(stage.product_manage_stock, true), ' \
+                      '    stage.product_length, stage.product_width, stage.product_height, stage.product_weight ' \
+                      ' FROM product_import_stage stage ' \
+                      ' JOIN {} store ON store.store_code = stage.product_store_code ' \
+                      ' ORDER BY stage.product_sku, store.id_store, stage.line_number DESC ' \
+                      ' ON CONFLICT (product_sku, product_store_id) DO UPDATE ' \
+                      ' SET product_unspc=EXCLUDED.product_unspc, ' \
+                      '     product_brand=EXCLUDED.product_brand, ' \
+                      '     category_id=EXCLUDED.category_id, ' \
+                      '     parent_category_id=EXCLUDED.parent_category_id, ' \
+                      '     unit_of_measure=EXCLUDED.unit_of_measure, ' \
+                      '     product_stock=EXCLUDED.product_stock, ' \
+                      '     product_name=EXCLUDED.product_name, ' \
+                      '     product_title=EXCLUDED.product_title, ' \
+                      '     product_long_description=EXCLUDED.product_long_description, ' \
+                      '     product_photo=EXCLUDED.product_photo, ' \
+                      '     product_price=EXCLUDED.product_price, ' \
+                      '     product_tax=EXCLUDED.product_tax, ' \
+                      '     product_currency=EXCLUDED.product_currency, ' \
+                      '     product_status=EXCLUDED.product_status, ' \
+                      '     product_published=EXCLUDED.product_published, ' \
+                      '     product_manage_stock=EXCLUDED.product_manage_stock, ' \
+                      '     product_length=EXCLUDED.product_length, ' \
+                      '     product_width=EXCLUDED.product_width, ' \
+                      '     product_height=EXCLUDED.product_height, ' \
+                      '     product_weight=EXCLUDED.product_weight, ' \
+                      '     last_update_date=now() ' \
+                      ' RETURNING (xmax = 0) AS inserted) ' \
+                      'SELECT count(*) FILTER (WHERE inserted) AS inserted_rows, ' \
+                      '       count(*) FILTER (WHERE NOT inserted) AS updated_rows ' \
+                      'FROM merged'.format(product_table, store_table)
+
+    sql_missing_store = 'SELECT stage.line_number, stage.product_store_code ' \
+                        'FROM product_import_stage stage ' \
+                        'WHERE NOT EXISTS (SELECT 1 FROM {} store ' \
+                        '                  WHERE store.store_code = stage.product_store_code) ' \
+                        'ORDER BY stage.line_number'.format(store_table)
+
+    # Long operation with his own commits by batch, it does not join the transaction of the request
+    conn = get_connection_pool().get_connection()
+
+    try:
+        cursor = create_cursor(conn)
+
+        while not batch_state["exhausted"]:
+            batch_state["first_line"] = None
+            batch_state["copied_lines"] = 0
+            failed_lines = None
+
+            try:
+                cursor.execute(sql_create_stage)
+                cursor.copy_expert(sql_copy_stage, CatalogCopyBuffer(batch_copy_lines()))
+
+                failed_lines = catalog_imported["FailedLines"]
+
+                if batch_state["copied_lines"] > 0:
+                    cursor.execute(sql_missing_store)
+
+                    for missing_row in cursor:
+                        add_error(missing_row['line_number'],
+                                  'The store {} is not registered'.format(missing_row['product_store_code']))
+
+                    cursor.execute(sql_merge_stage)
+
+                    merged_rows = cursor.fetchone()
+
+                    catalog_imported["InsertedProducts"] += merged_rows['inserted_rows']
+                    catalog_imported["UpdatedProducts"] += merged_rows['updated_rows']
+
+                # The SKU merged are not collected, the batch can be of thousands of lines
+                if batch_state["copied_lines"] > 0:
+                    notify_cache_invalidation(cursor, 'product')
+
+                conn.commit()
+
+                if batch_state["copied_lines"] > 0:
+                    invalidate_lookup_cache(get_product_cache())
+
+            except psycopg2.Error as error:
+                conn.rollback()
+
+                logger.exception('Catalog batch rejected, lines %s to %s: %s', batch_state["first_line"],
+                                 batch_state["last_line"], error)
+
+                if failed_lines is None:
+                    failed_lines = catalog_imported["FailedLines"]
+
+                # Only the lines copied on the batch are rejected, the invalid ones were already counted
+                catalog_imported["FailedLines"] = failed_lines
+                add_error(batch_state["first_line"],
+                          'Batch of lines {} to {} rejected by the database: {}'.format(batch_state["first_line"],
+                                                                                       batch_state["last_line"],
+                                                                                       str(error).strip()),
+                          failed_lines=batch_state["copied_lines"])
+
+        close_cursor(cursor)
+
+    finally:
+        get_connection_pool().put_connection(conn)
+
+    return catalog_imported
@@ -0,0 +1,283 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+PostgreSQL connection pool.
+
+Keeps a process-wide set of authenticated connections so the CRUD operations of the backend
+borrow an open connection instead of running the TCP handshake and the authentication on each call.
+
+Documentation:
+    - Minimum and maximum number of connections opened by the process.
+    - Health check of the connection on checkout (closed socket or a 'SELECT 1' after a long idle time).
+    - Idle recycling of the connections above the minimum size, the connections are opened on demand.
+    - Timeout waiting for a connection when the pool is exhausted.
+    - Fork safety: a child process (gunicorn worker) never reuses the sockets of his parent.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import collections
+import os
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.extras
+
+from db_controller import mvc_exceptions as mvc_exc
+from logger_controller.logger_control import *
+
+
+logger = configure_db_logger()
+
+
+class ConnectionPool:
+    r"""
+    Thread-safe pool of PostgreSQL connections.
+
+    The idle connections are kept in LIFO order, so the warmest connection is borrowed first and the
+    oldest ones stay at the left of the queue to be recycled when they exceed the max idle time.
+    """
+
+    def __init__(self,
+                 connect_kwargs,
+                 min_size=1,
+                 max_size=10,
+                 checkout_timeout=5.0,
+                 max_idle_time=300.0,
+                 health_check_interval=30.0,
+                 cursor_factory=psycopg2.extras.DictCursor):
+        r"""
+        :param connect_kwargs: Dictionary with the arguments of psycopg2.connect (host, port, user...).
+        :param min_size: Number of connections that the idle recycling never closes. They are opened on demand,
+                         not when the pool is created.
+        :param max_size: Max number of connections opened at the same time by the process.
+        :param checkout_timeout: Seconds to wait for a free connection before raise TimeoutError.
+        :param max_idle_time: Seconds that a connection above min_size can stay idle before being closed.
+        :param health_check_interval: Seconds idle after which a connection is pinged before being borrowed.
+        :param cursor_factory: Cursor class of the connections (DictCursor, or the one of the SQL trace).
+        """
+
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError('Invalid pool size: min_size={}, max_size={}'.format(min_size, max_size))
+
+        self._connect_kwargs = dict(connect_kwargs)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.checkout_timeout = checkout_timeout
+        self.max_idle_time = max_idle_time
+        self.health_check_interval = health_check_interval
+        self.cursor_factory = cursor_factory
+
+        self._cond = threading.Condition(threading.Lock())
+        self._idle = collections.deque()
+        self._opened = 0
+        self._pid = os.getpid()
+        self._closed = False
+
+        # Connections inherited from the parent process after a fork. They are never closed nor used
+        # on the child: closing them would terminate the session that the parent is still using.
+        self._inherited = []
+
+    def get_connection(self):
+        r"""
+        Borrow a connection from the pool, opening a new one if the pool is not at his max size.
+
+        :return connection: Healthy connection ready to transact, it must be returned with put_connection.
+        """
+
+        deadline = time.monotonic() + self.checkout_timeout
+
+        while True:
+            conn = None
+            released_at = None
+
+            with self._cond:
+                self._check_fork()
+
+                if self._closed:
+                    raise mvc_exc.ConnectionError('The connection pool is closed')
+
+                while not self._idle and self._opened >= self.max_size:
+                    remaining = deadline - time.monotonic()
+
+                    if remaining <= 0:
+                        logger.error('Connection pool exhausted: %s connections in use', self._opened)
+                        raise mvc_exc.TimeoutError(
+                            'Timeout of {} seconds waiting for a database connection, '
+                            'all the {} connections are in use'.format(self.checkout_timeout, self.max_size)
+                        )
+
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                else:
+                    self._opened += 1
+
+            if conn is None:
+                return self._open_connection()
+
+            if self._is_healthy(conn, released_at):
+                return conn
+
+            self._discard(conn)
+
+    def put_connection(self, conn):
+        r"""
+        Return a borrowed connection to the pool, rolling back any transaction left open.
+
+        :param conn: Connection borrowed with get_connection.
+        """
+
+        if conn is None:
+            return
+
+        with self._cond:
+            if self._check_fork():
+                # Connection borrowed by the parent before the fork, it belongs to him.
+                return
+
+        if not conn.closed and conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                conn.rollback()
+            except psycopg2.Error as error:
+                logger.warning('Can not rollback the connection returned to the pool: %s', error)
+                self._discard(conn)
+                return
+
+        if conn.closed:
+            self._discard(conn)
+            return
+
+        with self._cond:
+            if self._closed:
+                self._opened -= 1
+                conn.close()
+            else:
+                self._idle.append((conn, time.monotonic()))
+                self._recycle_idle()
+
+            self._cond.notify()
+
+    def close_all(self):
+        r"""
+        Close all the idle connections and refuse new checkouts.
+        The connections in use are closed when they are returned.
+        """
+
+        with self._cond:
+            self._check_fork()
+            self._closed = True
+
+            while self._idle:
+                conn, _ = self._idle.popleft()
+                self._opened -= 1
+                conn.close()
+
+            self._cond.notify_all()
+
+    def stats(self):
+        r"""
+        Get the current usage of the pool.
+
+        :return stats: Dictionary with the connections opened, idle and in use.
+        """
+
+        with self._cond:
+            return {
+                "Opened": self._opened,
+                "Idle": len(self._idle),
+                "InUse": self._opened - len(self._idle),
+                "MinSize": self.min_size,
+                "MaxSize": self.max_size,
+            }
+
+    def reset_after_fork(self):
+        r"""
+        Forget the connections inherited from the parent process. Must be called in the child after a fork,
+        the lock is replaced because it could be held by a thread of the parent that does not exist on the child.
+        """
+
+        self._cond = threading.Condition(threading.Lock())
+        self._forget_inherited()
+
+    def _open_connection(self):
+        try:
+            return psycopg2.connect(cursor_factory=self.cursor_factory, **self._connect_kwargs)
+
+        except psycopg2.Error as error:
+            with self._cond:
+                self._opened -= 1
+                self._cond.notify()
+
+            logger.exception('Can not open a new connection to the pool: %s', error)
+            raise mvc_exc.ConnectionError(
+                '"{}" Can not connect to database, verify data connection to "{}".\nOriginal Exception raised: {}'.format(
+                    self._connect_kwargs.get('host'), self._connect_kwargs.get('database'), error
+                )
+            )
+
+    def _is_healthy(self, conn, released_at):
+        if conn.closed:
+            return False
+
+        if time.monotonic() - released_at < self.health_check_interval:
+            return True
+
+        try:
+            cursor = conn.cursor()
+            cursor.execute('SELECT 1')
+            cursor.close()
+            conn.rollback()
+
+        except psycopg2.Error as error:
+            logger.warning('Discarding broken connection from the pool: %s', error)
+            return False
+
+        return True
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+        with self._cond:
+            self._opened -= 1
+            self._cond.notify()
+
+    def _recycle_idle(self):
+        # Must be called holding the lock. The oldest idle connections are at the left of the deque.
+        now = time.monotonic()
+
+        while self._idle and self._opened > self.min_size:
+            conn, released_at = self._idle[0]
+
+            if now - released_at < self.max_idle_time:
+                break
+
+            self._idle.popleft()
+            self._opened -= 1
+            conn.close()
+
+    def _check_fork(self):
+        # Must be called holding the lock. Returns True if the pool was inherited from another process.
+        if os.getpid() == self._pid:
+            return False
+
+        self._forget_inherited()
+
+        return True
+
+    def _forget_inherited(self):
+        self._inherited.extend(conn for conn, _ in self._idle)
+        self._idle.clear()
+        self._opened = 0
+        self._pid = os.getpid()
@@ -4,8 +4,8 @@ Requires Python 3.8 or later
 
 PostgreSQL DB backend.
 
-Each one of the CRUD operations should be able to open a database connection if
-there isn't already one available (check if there are any issues with this).
+Each one of the CRUD operations borrows a database connection from the process
+connection pool (see connection_pool.py) and returns it when the transaction ends.
 
 Documentation:
     About the Van data on the database to generate CRUD operations from endpoint of the API:
@@ -27,28 +27,54 @@ __license__ = ""
 __history__ = """ """
 __version__ = "1.1.A19.1 ($Rev: 1 $)"
 
-import json
-import logging
+import atexit
+import functools
+import math
+import os
+import threading
+import time
+import uuid
 from datetime import datetime
 
 import psycopg2
+import psycopg2.extras
+from flask import g, has_request_context
 from sqlalchemy import Column, String, Numeric, Boolean
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 
 from db_controller import mvc_exceptions as mvc_exc
+from db_controller.connection_pool import ConnectionPool
+from db_controller.lookup_cache import LookupCache, MISSING, deep_sizeof
+from db_controller.pagination import encode_page_cursor, decode_page_cursor
+from db_controller.field_projection import (parse_product_fields, product_select_list, build_product_data,
+                                            project_product_data)
+from db_controller.cache_invalidation import CacheInvalidationListener, build_invalidation_payloads
+from db_controller.single_flight import SingleFlight, flight_key
+from db_controller.sql_trace import SqlTracer, build_traced_cursor_factory
 from logger_controller.logger_control import *
+from logger_controller.hot_path_logging import get_hot_path_log
 from model.StoreModel import StoreModel
 from model.ProductModel import ProductModel
 from utilities.Utility import Utility as Util
-
-logging.basicConfig()
-logging.getLogger('sqlalchemy.engine').setLevel(logging.DEBUG)
+from utilities.request_stats import RequestStats
 
 Base = declarative_base()
 logger = configure_db_logger()
 
 
+def get_read_log(call_site):
+    r"""
+    Get the log of the rows of a read, sampled by call site (LOG_RESOURCE.HOT_PATH), with the summary of his query.
+
+    :param call_site: Name of the read function.
+    """
+
+    cfg = Util.get_config_constant_file()
+
+    return get_hot_path_log(logger, call_site, cfg['LOG_RESOURCE'].get('HOT_PATH'))
+
+
 # Datos de conecxion a base de datos
 def init_connect_db():
     r"""
@@ -74,493 +100,837 @@ def init_connect_db():
     return data_connection
 
 
-def session_to_db():
+def init_pool_settings():
     r"""
-    Get and manage the session connect to the database engine.
+    Contiene la configuracion del pool de conexiones a base de datos.
+    :return: dict_pool_settings
+    """
 
-    :return connection: Object to connect to the database and transact on it.
+    cfg = Util.get_config_constant_file()
+
+    pool_cfg = cfg.get('DB_POOL') or {}
+
+    pool_settings = {
+        "min_size": int(pool_cfg.get('MIN_CONNECTIONS', 1)),
+        "max_size": int(pool_cfg.get('MAX_CONNECTIONS', 10)),
+        "checkout_timeout": float(pool_cfg.get('CHECKOUT_TIMEOUT', 5)),
+        "max_idle_time": float(pool_cfg.get('MAX_IDLE_TIME', 300)),
+        "health_check_interval": float(pool_cfg.get('HEALTH_CHECK_INTERVAL', 30)),
+    }
+
+    return pool_settings
+
+
+def init_connect_kwargs():
+    r"""
+    Arguments of psycopg2.connect for the database configured on the constants file.
     """
 
     data_bd_connection = init_connect_db()
 
-    connection = None
+    if not data_bd_connection:
+        logger.error('Some data is not established to connect PostgreSQL DB. Please verify it!')
 
-    try:
+    connect_kwargs = {
+        "host": data_bd_connection[0],
+        "user": data_bd_connection[1],
+        "password": data_bd_connection[2],
+        "port": data_bd_connection[3],
+        "database": data_bd_connection[4],
+    }
 
-        if data_bd_connection:
+    return connect_kwargs
 
-            connection = psycopg2.connect(user=data_bd_connection[1],
-                                          password=data_bd_connection[2],
-                                          host=data_bd_connection[0],
-                                          port=data_bd_connection[3],
-                                          database=data_bd_connection[4])
 
-        else:
-            logger.error('Some data is not established to connect PostgreSQL DB. Please verify it!')
+class RequestStatsCursor(psycopg2.extras.DictCursor):
+    r"""
+    DictCursor that adds the time of his statements to the RequestStats of the current request.
+    """
 
-    except (Exception, psycopg2.Error) as error:
-        logger.exception('Can not connect to database, verify data connection to %s', data_bd_connection[4],
-                         error, exc_info=True)
-        raise mvc_exc.ConnectionError(
-            '"{}" Can not connect to database, verify data connection to "{}".\nOriginal Exception raised: {}'.format(
-                data_bd_connection[0], data_bd_connection[4], error
-            )
-        )
+    def execute(self, query, vars=None):
+        request_stats = get_request_stats()
 
-    return connection
+        if request_stats is None:
+            return super().execute(query, vars)
 
+        start = time.perf_counter()
 
-def scrub(input_string):
-    """Clean an input string (to prevent SQL injection).
+        try:
+            return super().execute(query, vars)
+        finally:
+            request_stats.record_query(time.perf_counter() - start)
 
-    Parameters
-    ----------
-    input_string : str
+    def executemany(self, query, vars_list):
+        request_stats = get_request_stats()
 
-    Returns
-    -------
-    str
-    """
-    return "".join(k for k in input_string if k.isalnum())
+        if request_stats is None:
+            return super().executemany(query, vars_list)
 
+        start = time.perf_counter()
 
-def create_cursor(conn):
-    r"""
-    Create an object statement to transact to the database and manage his data.
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            request_stats.record_query(time.perf_counter() - start)
 
-    :param conn: Object to connect to the database.
-    :return cursor: Object statement to transact to the database with the connection.
 
+def init_cursor_factory():
+    r"""
+    Cursor class of the connections of the pool: DictCursor, RequestStatsCursor if ACCESS_LOG.ENABLED, and his
+    traced subclass if SQL_TRACE.ENABLED.
+    The trace is written to his own logger 'sql_trace' and log file (SQL_TRACE.FILE_LOG_NAME).
     """
-    try:
-        cursor = conn.cursor()
 
-    except (Exception, psycopg2.Error) as error:
-        logger.exception('Can not create the cursor object, verify database connection', error, exc_info=True)
-        raise mvc_exc.ConnectionError(
-            'Can not connect to database, verify data connection.\nOriginal Exception raised: {}'.format(
-                error
-            )
-        )
+    cfg = Util.get_config_constant_file()
 
-    return cursor
+    cursor_class = psycopg2.extras.DictCursor
 
+    if (cfg.get('ACCESS_LOG') or {}).get('ENABLED', False):
+        cursor_class = RequestStatsCursor
 
-def disconnect_from_db(conn):
-    r"""
-    Generate close session to the database through the disconnection of the conn object.
+    trace_cfg = cfg.get('SQL_TRACE') or {}
 
-    :param conn: Object connector to close session.
-    """
+    if not trace_cfg.get('ENABLED', False):
+        return cursor_class
 
-    if conn is not None:
-        conn.close()
+    trace_logger = configure_named_logging('sql_trace', trace_cfg.get('FILE_LOG_NAME', 'api_sql_'),
+                                           cfg['LOG_RESOURCE']['DIRECTORY_LOG_FILES'], to_stdout=False)
 
+    tracer = SqlTracer(trace_logger,
+                       sample_rate=float(trace_cfg.get('SAMPLE_RATE', 0.01)),
+                       redact=bool(trace_cfg.get('REDACT_PARAMS', True)),
+                       max_statement_length=int(trace_cfg.get('MAX_STATEMENT_LENGTH', 2000)))
 
-def close_cursor(cursor):
-    r"""
-    Generate close statement to the database through the disconnection of the cursor object.
+    logger.warning('SQL trace enabled: %s of the statements', tracer.sample_rate)
 
-    :param cursor: Object cursor to close statement.
-    """
+    return build_traced_cursor_factory(tracer, cursor_class)
 
-    if cursor is not None:
-        cursor.close()
+
+_connection_pool = None
+_connection_pool_lock = threading.Lock()
 
 
-def get_datenow_from_db():
+def get_connection_pool():
     r"""
-    Get the current date and hour from the database server to set to the row registered or updated.
+    Get the process-wide connection pool, it is created on the first use of each process.
 
-    :return last_updated_date: The current day with hour to set the date value.
+    :return pool: ConnectionPool object shared by all the CRUD operations.
     """
 
-    conn = None
-    cursor = None
-    last_updated_date = None
-    sql_nowdate = ''
+    global _connection_pool
 
-    try:
+    if _connection_pool is None:
+        with _connection_pool_lock:
+            if _connection_pool is None:
+                _connection_pool = ConnectionPool(init_connect_kwargs(),
+                                                  cursor_factory=init_cursor_factory(),
+                                                  **init_pool_settings())
 
-        sql_nowdate = 'SELECT now()'
+    return _connection_pool
 
-        conn = session_to_db()
-        cursor = create_cursor(conn)
 
-        cursor.execute(sql_nowdate)
+def _reset_pool_after_fork():
+    global _connection_pool_lock
 
-        result = cursor.fetchall()
+    _connection_pool_lock = threading.Lock()
 
-        if result is not None:
-            last_updated_date = result
+    if _connection_pool is not None:
+        _connection_pool.reset_after_fork()
 
-        cursor.close()
 
-    except SQLAlchemyError as error:
-        conn.rollback()
-        logger.exception('An exception occurred while execute transaction: %s', error)
-        raise SQLAlchemyError(
-            "A SQL Exception {} occurred while transacting with the database.".format(error)
-        )
-    finally:
-        disconnect_from_db(conn)
+def close_connection_pool():
+    r"""
+    Close all the connections of the pool, used on shutdown of the process.
+    """
 
-    return last_updated_date
+    if _connection_pool is not None:
+        _connection_pool.close_all()
 
 
-def exists_row_registered(table_name, column_name, data_find):
-    r"""
-    Looking for a user by name on the database to valid authentication.
+os.register_at_fork(after_in_child=_reset_pool_after_fork)
+atexit.register(close_connection_pool)
 
-    :param table_name:
-    :param column_name: The column name to valid existence on the db.
-    :param data_find: The data to filter and looking for if a row exists registered.
-    :return result: Boolean to valid if the data exists on the table.
-    """
 
-    conn = session_to_db()
+_store_id_cache = None
+_product_cache = MISSING
+_single_flight = MISSING
+_lookup_caches_lock = threading.Lock()
 
-    cursor = create_cursor(conn)
 
-    sql_check = "SELECT EXISTS(SELECT 1 FROM {} WHERE {} = {} LIMIT 1)".format(table_name, column_name, data_find)
+def get_store_id_cache():
+    r"""
+    Get the process-wide cache of store code -> id_store, the stores change rarely so each code is
+    looking for on the database once by TTL instead of on each request.
 
-    cursor.execute(sql_check)
+    :return cache: LookupCache object shared by all the store resolvers.
+    """
 
-    result = cursor.fetchone()[0]
+    global _store_id_cache
 
-    close_cursor(cursor)
-    disconnect_from_db(conn)
+    if _store_id_cache is None:
+        with _lookup_caches_lock:
+            if _store_id_cache is None:
+                cache_cfg = Util.get_config_constant_file().get('STORE_CACHE') or {}
 
-    return result
+                _store_id_cache = LookupCache('StoreIdCache',
+                                              max_entries=int(cache_cfg.get('MAX_ENTRIES', 10000)),
+                                              ttl=float(cache_cfg.get('TTL', 300)))
 
+    return _store_id_cache
 
-def exists_data_row(table_name, column_name, column_filter1, value1, column_filter2, value2):
+
+def get_product_cache():
     r"""
-    Transaction that validates the existence and searches for a certain record in the database.
-
-    :param table_name: The table name to looking for data.
-    :param column_name: The name of the column to find existence.
-    :param column_filter1: The name of the first column filter to looking for data.
-    :param value1: The value of the first filter to looking for data.
-    :param column_filter2: The name of the next column filter to looking for data.
-    :param value2: The value of the next filter to looking for data.
-    :return row_data: The data if row exists.
+    Get the process-wide read-through cache of the products by SKU (select_by_product_sku).
+    The cached lists are shared by all the requests of the process, the callers must not modify them.
+
+    :return cache: LookupCache object, or None if it is disabled by PRODUCT_CACHE.ENABLED.
     """
 
-    conn = None
-    cursor = None
-    row_data = None
+    global _product_cache
 
-    try:
-        conn = session_to_db()
-        cursor = create_cursor(conn)
+    if _product_cache is MISSING:
+        with _lookup_caches_lock:
+            if _product_cache is MISSING:
+                cache_cfg = Util.get_config_constant_file().get('PRODUCT_CACHE') or {}
 
-        sql_exists = f"SELECT {column_name} FROM {table_name} " \
-                     f"WHERE {column_filter1} = {value1} AND {column_filter2} = '{value2}'"
+                if cache_cfg.get('ENABLED', True):
+                    _product_cache = LookupCache('ProductCache',
+                                                 max_entries=int(cache_cfg.get('MAX_ENTRIES', 10000)),
+                                                 ttl=float(cache_cfg.get('TTL', 60)),
+                                                 max_bytes=int(cache_cfg.get('MAX_BYTES', 64 * 1024 * 1024)),
+                                                 sizeof=deep_sizeof)
+                else:
+                    _product_cache = None
 
-        cursor.execute(sql_exists)
+    return _product_cache
 
-        row_exists = cursor.fetchall()
 
-        for r_e in row_exists:
+# Identifica las notificaciones de este proceso, el pid se puede repetir entre servidores
+_process_origin = uuid.uuid4().hex
+_invalidation_listener = None
 
-            logger.info('Row Info in Query: %s', str(r_e))
 
-            if r_e is None:
-                r_e = None
-            else:
-                row_data = r_e[column_name]
+def get_single_flight():
+    r"""
+    Get the process-wide single-flight of the reads, the concurrent identical reads share one query.
 
-            # row_exists.close()
+    :return single_flight: SingleFlight object, or None if it is disabled by SINGLE_FLIGHT.ENABLED.
+    """
 
-            close_cursor(cursor)
+    global _single_flight
 
-    except SQLAlchemyError as error:
-        conn.rollback()
-        logger.exception('An exception occurred while execute transaction: %s', error)
-        raise SQLAlchemyError(
-            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, table_name)
-        )
-    finally:
-        disconnect_from_db(conn)
+    if _single_flight is MISSING:
+        with _lookup_caches_lock:
+            if _single_flight is MISSING:
+                flight_cfg = Util.get_config_constant_file().get('SINGLE_FLIGHT') or {}
+
+                if flight_cfg.get('ENABLED', True):
+                    _single_flight = SingleFlight(max_tracked_keys=int(flight_cfg.get('MAX_TRACKED_KEYS', 1000)))
+                else:
+                    _single_flight = None
 
-    return row_data
+    return _single_flight
 
 
-def validate_transaction(table_name,
-                         column_name,
-                         column_filter1, value1,
-                         column_filter2, value2,
-                         column_filter3, value3):
+def coalesced_read(read_function):
     r"""
-    Transaction that validates the existence and searches for a certain record in the database.
-
-    :param table_name: The table name to looking for data.
-    :param column_name: The name of the column to find existence.
-    :param column_filter1: The name of the first column filter to looking for data.
-    :param value1: The value of the first filter to looking for data.
-    :param column_filter2: The name of the next column filter to looking for data.
-    :param value2: The value of the next filter to looking for data.
-    :param column_filter3: The name of the next column filter to looking for data.
-    :param value3: The value of the next filter to looking for data.
-    :return row_data: The data if row exists.
+    Decorator of the read functions: the concurrent calls with the same arguments run one query.
+    A call is not coalesced if his request already wrote on his transaction, it must read his own writes.
+    The reads of the request (the version of a conditional GET) do not prevent it.
+    The concurrent callers receive the same object as result, they must not modify it.
     """
 
-    conn = None
-    cursor = None
-    row_data = None
+    @functools.wraps(read_function)
+    def coalesced(*args):
+        single_flight = get_single_flight()
 
-    try:
-        conn = session_to_db()
-        cursor = create_cursor(conn)
+        if single_flight is None or _request_session_is_dirty():
+            return read_function(*args)
 
-        sql_exists = 'SELECT {} FROM {} WHERE {} = {} AND {} = {} AND {} = {}'.format(column_name, table_name,
-                                                                                      column_filter1, value1,
-                                                                                      column_filter2,
-                                                                                      "'" + value2 + "'",
-                                                                                      column_filter3,
-                                                                                      "'" + value3 + "'")
+        return single_flight.do(flight_key(read_function.__name__, args), read_function, *args)
 
-        cursor.execute(sql_exists)
+    return coalesced
 
-        row_exists = cursor.fetchall()
 
-        for r_e in row_exists:
+def _reset_caches_after_fork():
+    global _lookup_caches_lock, _process_origin
 
-            logger.info('Row Info in Query: %s', str(r_e))
+    _lookup_caches_lock = threading.Lock()
+    _process_origin = uuid.uuid4().hex
 
-            if r_e is None:
-                r_e = None
-            else:
-                row_data = r_e[column_name]
+    for lookup_cache in (_store_id_cache, _product_cache):
+        if isinstance(lookup_cache, LookupCache):
+            lookup_cache.reset_after_fork()
 
-            close_cursor(cursor)
+    if isinstance(_single_flight, SingleFlight):
+        _single_flight.reset_after_fork()
 
-    except SQLAlchemyError as error:
-        conn.rollback()
-        logger.exception('An exception occurred while execute transaction: %s', error)
-        raise SQLAlchemyError(
-            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, table_name)
-        )
-    finally:
-        disconnect_from_db(conn)
+    if _invalidation_listener is not None:
+        _invalidation_listener.reset_after_fork()
+        _invalidation_listener.origin = _process_origin
 
-    return row_data
 
+os.register_at_fork(after_in_child=_reset_caches_after_fork)
 
-class StoreModelDb(Base):
+
+def init_cache_invalidation_settings():
     r"""
-    Class to instance the data of a Store on the database.
-    Transactions:
-     - Insert: Add Van data to the database if not exists.
-     - Update: Update Van data on the database if exists.
+    Contiene la configuracion de la invalidacion de caches entre procesos (LISTEN/NOTIFY).
+    :return: dict_invalidation_settings
     """
 
     cfg = Util.get_config_constant_file()
 
-    __tablename__ = cfg['DB_OBJECTS']['STORE_TABLE']
+    invalidation_cfg = cfg.get('CACHE_INVALIDATION') or {}
 
-    id_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['ID_STORE'], Numeric, primary_key=True)
-    name_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_NAME'], String)
-    code_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_CODE'], String)
-    street_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_STREET_ADDRESS'], String)
-    external_number_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_NUMBER_EXT_ADDRESS'], String)
-    suburb_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_SUBURB_ADDRESS'], String)
-    city_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_CITY_ADDRESS'], String)
-    country_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_COUNTRY_ADDRESS'], String)
-    postal_code_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_POSTAL_CODE'], String)
-    minimum_stock = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_MIN_STOCK'], Numeric)
-    creation_date = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['CREATION_DATE'], String)
-    last_update_date = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['LAST_UPDATE_DATE'], String)
+    invalidation_settings = {
+        "enabled": bool(invalidation_cfg.get('ENABLED', True)),
+        "channel": invalidation_cfg.get('CHANNEL', 'cargamos_cache_invalidation'),
+        "poll_timeout": float(invalidation_cfg.get('POLL_TIMEOUT', 5)),
+        "reconnect_interval": float(invalidation_cfg.get('RECONNECT_INTERVAL', 5)),
+    }
 
-    def manage_store_data(self, store_obj):
+    return invalidation_settings
 
-        store_data = {}
 
-        store_dict = Util.set_data_input_store_dict(store_obj)
+def notify_cache_invalidation(cursor, cache_name, keys=None):
+    r"""
+    Send the invalidation of cache keys to the other processes, on the transaction of the write.
+    It must be executed before the commit: the NOTIFY is delivered only when the transaction commits.
 
-        if exists_data_row(self.__tablename__,
-                           self.id_store,
-                           self.id_store,
-                           store_dict.get("store_id"),
-                           self.code_store,
-                           store_dict.get("store_code")):
+    :param cursor: Cursor of the transaction that writes the data cached.
+    :param cache_name: 'store' (store codes) or 'product' (SKU).
+    :param keys: Iterable of keys written, None to clear the whole cache.
+    """
 
-            store_data = update_store_data(store_dict)
-        else:
-            store_data = insert_new_store(store_dict)
+    invalidation_settings = init_cache_invalidation_settings()
 
-        return store_data
+    if not invalidation_settings['enabled']:
+        return
+
+    for payload in build_invalidation_payloads(cache_name, keys, _process_origin):
+        cursor.execute("SELECT pg_notify(%s, %s)", (invalidation_settings['channel'], payload,))
 
 
-# Add Store data to insert the row on the database
-def insert_new_store(data_store):
+def apply_cache_invalidation(cache_name, keys):
     r"""
-    Transaction to add data of a store and inserted on database.
-    The data that you can insert are:
+    Apply on this process the invalidation notified by another process.
 
-    :param data_store: Store object model to add new store data.
-    :return store_data_inserted: Dictionary that contains Store data inserted on db.
+    :param cache_name: 'store' (store codes) or 'product' (SKU).
+    :param keys: List of keys written, None to clear the whole cache.
     """
 
-    conn = None
-    cursor = None
-    store_data_inserted = dict()
+    product_cache = get_product_cache()
 
-    cfg = Util.get_config_constant_file()
+    if cache_name == 'store':
+        store_id_cache = get_store_id_cache()
 
-    try:
-        conn = session_to_db()
+        if keys is None:
+            store_id_cache.clear()
+        else:
+            for store_code in keys:
+                store_id_cache.invalidate(store_code)
 
-        cursor = create_cursor(conn)
+        # Los productos en cache contienen el nombre de su tienda
+        if product_cache is not None:
+            product_cache.clear()
 
-        table_name = cfg['DB_OBJECTS']['STORE_TABLE']
+    elif cache_name == 'product':
+        if product_cache is None:
+            return
 
-        created_at = get_datenow_from_db()
-        last_update_date = get_datenow_from_db()
+        if keys is None:
+            product_cache.clear()
+        else:
+            for product_sku in keys:
+                product_cache.invalidate(product_sku)
 
-        store_id = data_store.get("store_id")
-        store_code = data_store.get("store_code")
-        store_name = data_store.get("store_name")
-        store_street_address = data_store("street_address")
-        store_external_number = data_store("external_number_address")
-        store_suburb_address = data_store.get("suburb_address")
-        store_city_address = data_store.get("city_address")
-        store_country_address = data_store.get("country_address")
-        store_zippostal_code = data_store.get("zip_postal_code_address")
-        store_min_inventory = data_store.get("minimum_inventory")
+    else:
+        logger.error('Cache invalidation of an unknown cache: %s', cache_name)
 
-        if not Util.validate_store_code_syntax(store_code):
-            logger.error('Can not read the recordset: {}, because the store code is not valid: {}'.format(store_code,
-                                                                                                          table_name))
-            raise mvc_exc.ItemNotStored(
-                'Can\'t read "{}" because it\'s not stored in table "{}. SQL Exception"'.format(
-                    store_id, table_name
-                )
-            )
 
-        data_insert = (store_id, store_code, store_name, store_external_number, store_street_address,
-                       store_suburb_address, store_city_address, store_country_address, store_zippostal_code,
-                       store_min_inventory,)
+def start_cache_invalidation_listener():
+    r"""
+    Start the listener of the invalidations of the other processes, once by process (gunicorn worker).
 
-        sql_store_insert = 'INSERT INTO {} ' \
-                           '(id_store, ' \
-                           'store_name, ' \
-                           'store_code, ' \
-                           'store_street_address, ' \
-                           'store_external_number, ' \
-                           'store_suburb_address, ' \
-                           'store_city_address, ' \
-                           'store_country_address, ' \
-                           'store_zippostal_code, ' \
-                           'store_min_inventory, ' \
-                           'creation_date, ' \
-                           'last_update_date) VALUES(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'.format(table_name)
+    :return listener: CacheInvalidationListener running, None if it is disabled on the constants file.
+    """
 
-        cursor.execute(sql_store_insert, data_insert)
+    global _invalidation_listener
 
-        conn.commit()
+    invalidation_settings = init_cache_invalidation_settings()
 
-        logger.info('Store inserted %s', "{0}, Code: {1}, Name: {2}".format(store_id, store_code, store_name))
+    if not invalidation_settings['enabled']:
+        return None
 
-        close_cursor(cursor)
+    with _lookup_caches_lock:
+        if _invalidation_listener is None:
+            _invalidation_listener = CacheInvalidationListener(init_connect_kwargs(),
+                                                               invalidation_settings['channel'],
+                                                               apply_cache_invalidation,
+                                                               _process_origin,
+                                                               poll_timeout=invalidation_settings['poll_timeout'],
+                                                               reconnect_interval=invalidation_settings[
+                                                                   'reconnect_interval'])
 
-        row_exists = validate_transaction(table_name,
-                                          'id_store',
-                                          'id_store', store_id,
-                                          'store_code', store_code,
-                                          'store_name', store_name)
+        _invalidation_listener.start()
 
-        address_store = Util.format_store_address(store_street_address,
-                                                  store_external_number,
-                                                  store_suburb_address,
-                                                  store_zippostal_code,
-                                                  store_city_address,
-                                                  store_country_address)
+    return _invalidation_listener
 
-        store_data_inserted = {
-            "IdStore": store_id,
-            "CodeStore": store_code,
-            "NameStore": store_name,
-            "AddressStore": address_store,
-            "MinimumStock": store_min_inventory,
-            "CreationDate": created_at,
-            "Message": "Store Inserted Successful",
-        }
 
-        if not str(store_id) not in str(row_exists):
-            store_data_inserted = {
-                "IdStore": store_id,
-                "CodeStore": store_code,
-                "NameStore": store_name,
-                "AddressStore": address_store,
-                "MinimumStock": store_min_inventory,
-                "CreationDate": created_at,
-                "Message": "Store already Inserted",
-            }
+def get_lookup_cache_stats():
+    r"""
+    Get the counters of the lookup caches of the process.
 
-    except SQLAlchemyError as error:
-        conn.rollback()
-        logger.exception('An exception was occurred while execute transaction: %s', error)
-        raise SQLAlchemyError(
-            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, table_name)
-        )
-    finally:
-        disconnect_from_db(conn)
+    :return stats: Dictionary with the stats of each cache by his name.
+    """
 
-    return json.dumps(store_data_inserted)
+    product_cache = get_product_cache()
+    single_flight = get_single_flight()
 
+    return {
+        "StoreIdCache": get_store_id_cache().stats(),
+        "ProductCache": product_cache.stats() if product_cache is not None else {"Enabled": False},
+        "InvalidationListener": _invalidation_listener.stats() if _invalidation_listener is not None else None,
+        "SingleFlight": single_flight.stats() if single_flight is not None else {"Enabled": False},
+    }
 
-# Update Store data registered
-def update_store_data(data_store):
-    r"""
-    Transaction to update data of a store registered on database.
-    The data that you can update are:
 
-    :param data_store: Dictionary of all data store to update.
-    :return store_data_updated: Dictionary that contains Store data updated on db.
+def _get_request_session():
+    # Unit of work of the current API call, None outside of a Flask request (scripts, tests, CLI).
+    if has_request_context():
+        return g.get('_db_request_session')
+
+    return None
+
+
+def _request_session_is_dirty():
+    # The request already wrote on his transaction: his reads can see rows that are not committed yet
+    request_session = _get_request_session()
+
+    return request_session is not None and request_session['dirty']
+
+
+def start_request_stats():
+    r"""
+    Start the counters of the current request, they are read by get_request_stats.
     """
 
-    conn = None
-    cursor = None
-    store_data_updated = dict()
+    g.request_stats = RequestStats()
 
-    cfg = Util.get_config_constant_file()
+    return g.request_stats
 
-    try:
-        conn = session_to_db()
 
-        cursor = create_cursor(conn)
+def get_request_stats():
+    r"""
+    Get the RequestStats of the current request, None outside of a Flask request or without ACCESS_LOG.
+    """
 
-        last_update_date = get_datenow_from_db()
+    if has_request_context():
+        return g.get('request_stats')
 
-        table_name = cfg['DB_OBJECTS']['STORE_TABLE']
+    return None
 
-        # store_id = data_store.get("store_id")
-        store_code = data_store.get("store_code")
-        store_name = data_store.get("store_name")
-        street_address = data_store("street_address")
-        external_number_address = data_store("external_number_address")
-        suburb_address = data_store.get("suburb_address")
-        city_address = data_store.get("city_address")
-        country_address = data_store.get("country_address")
-        zip_postal_code_address = data_store.get("zip_postal_code_address")
-        minimum_stock = data_store.get("minimum_inventory")
 
-        store_id = select_store_id(store_code)
+def record_cache_lookup(value):
+    request_stats = get_request_stats()
 
-        # update row to database
-        sql_update_store = 'UPDATE {} ' \
-                           'SET store_name=%s, ' \
-                           'store_street_address=%s, ' \
-                           'store_external_number=%s, ' \
-                           'store_suburb_address=%s, ' \
-                           'store_city_address=%s, ' \
-                           'store_country_address=%s, ' \
-                           'store_zippostal_code=%s, ' \
-                           'store_min_inventory=%s, ' \
-                           'last_update_date=%s ' \
-                           'WHERE id_store=%s AND store_code=%s'.format(table_name)
+    if request_stats is not None:
+        request_stats.record_cache_lookup(value is not MISSING)
+
+
+def session_to_db():
+    r"""
+    Get and manage the session connect to the database engine.
+
+    Inside of an API request all the CRUD operations join the same connection and transaction,
+    it is borrowed from the pool on the first use and committed/returned when the request ends.
+    Outside of a request the connection is borrowed from the process pool and must be returned
+    with disconnect_from_db.
+
+    :return connection: Object to connect to the database and transact on it.
+    """
+
+    request_session = _get_request_session()
+
+    if request_session is not None:
+        return request_session['connection']
+
+    # The pool raises mvc_exc.ConnectionError or mvc_exc.TimeoutError (pool exhausted), already logged
+    connection = get_connection_pool().get_connection()
+
+    if has_request_context():
+        g._db_request_session = {
+            "connection": connection,
+            "rollback_only": False,
+            "dirty": False,
+            "on_end": [],
+        }
+
+    return connection
+
+
+def commit_session(conn):
+    r"""
+    Commit the transaction of the connection.
+    The connection of a request is committed once, when the request ends, by commit_request_session.
+
+    :param conn: Object connector to commit.
+    """
+
+    request_session = _get_request_session()
+
+    if request_session is not None and request_session['connection'] is conn:
+        # The next reads of the request are not coalesced, they must see these writes
+        request_session['dirty'] = True
+        return
+
+    conn.commit()
+
+
+def rollback_session(conn):
+    r"""
+    Rollback the transaction of the connection.
+    If the connection belongs to a request, the whole request is marked to be rolled back at the end.
+
+    :param conn: Object connector to rollback.
+    """
+
+    if conn is None:
+        return
+
+    request_session = _get_request_session()
+
+    if request_session is not None and request_session['connection'] is conn:
+        request_session['rollback_only'] = True
+
+    conn.rollback()
+
+
+def commit_request_session():
+    r"""
+    Commit the unit of work of the current request, called once the endpoint built his response.
+    Nothing is done if the request did not use the database.
+    """
+
+    request_session = _get_request_session()
+
+    if request_session is None or request_session['rollback_only']:
+        return
+
+    request_session['connection'].commit()
+
+
+def end_request_session(error=None):
+    r"""
+    Return the connection of the current request to the pool.
+    Anything not committed by commit_request_session (errors, rollback_only) is rolled back by the pool.
+
+    :param error: Exception that ended the request, if any.
+    """
+
+    request_session = g.pop('_db_request_session', None)
+
+    if request_session is None:
+        return
+
+    if error is not None:
+        logger.error('Rolling back the request transaction because of: %s', error)
+
+    get_connection_pool().put_connection(request_session['connection'])
+
+    for callback in request_session['on_end']:
+        try:
+            callback()
+        except Exception as callback_error:
+            logger.exception('An exception occurred while execute an end of request callback: %s', callback_error)
+
+
+def on_request_end(callback):
+    r"""
+    Run a callback when the current request ends, committed or rolled back, or right away outside of a request.
+
+    :param callback: Function without arguments.
+    """
+
+    request_session = _get_request_session()
+
+    if request_session is not None:
+        request_session['on_end'].append(callback)
+    else:
+        callback()
+
+
+def invalidate_lookup_cache(lookup_cache, keys=None):
+    r"""
+    Remove keys of a lookup cache after a write.
+    They are removed now and again when the request ends: a read between the write and the commit
+    (or the rollback) could cache a value that is not the committed one.
+
+    :param lookup_cache: LookupCache to invalidate, nothing is done if it is None (cache disabled).
+    :param keys: Iterable of keys to remove, None to remove all the keys.
+    """
+
+    if lookup_cache is None:
+        return
+
+    if keys is None:
+        invalidate = lookup_cache.clear
+    else:
+        keys = list(keys)
+
+        def invalidate():
+            for key in keys:
+                lookup_cache.invalidate(key)
+
+    invalidate()
+
+    on_request_end(invalidate)
+
+
+def invalidate_store_id(store_code):
+    r"""
+    Remove a store code of the store id cache after a write on the store.
+    The cached products are removed too, they contain the name of his store.
+
+    :param store_code: Code of the store inserted, updated or deleted.
+    """
+
+    invalidate_lookup_cache(get_store_id_cache(), [store_code])
+    invalidate_lookup_cache(get_product_cache())
+
+
+def invalidate_product_sku(product_skus):
+    r"""
+    Remove products of the product cache after a write on them.
+
+    :param product_skus: Iterable of SKU of the products inserted, updated or deleted.
+    """
+
+    invalidate_lookup_cache(get_product_cache(), product_skus)
+
+
+def resolve_store_ids(cursor, store_codes):
+    r"""
+    Get the id of many stores by his code, the codes not cached are looking for with a single query.
+
+    :param cursor: Cursor of the current transaction.
+    :param store_codes: Iterable of store codes.
+    :return store_ids: Dictionary store code -> id_store (None if the store is not registered).
+    """
+
+    cfg = Util.get_config_constant_file()
+
+    store_id_cache = get_store_id_cache()
+
+    store_ids = dict()
+    missing_codes = []
+    store_generations = dict()
+
+    for store_code in set(store_codes):
+        store_id = store_id_cache.get(store_code)
+
+        record_cache_lookup(store_id)
+
+        if store_id is MISSING:
+            missing_codes.append(store_code)
+            store_generations[store_code] = store_id_cache.generation(store_code)
+        else:
+            store_ids[store_code] = store_id
+
+    if missing_codes:
+        sql_store_ids = "SELECT store_code, id_store FROM {} WHERE store_code = ANY(%s)".format(
+            cfg['DB_OBJECTS']['STORE_TABLE']
+        )
+
+        cursor.execute(sql_store_ids, (missing_codes,))
+
+        store_ids.update({store_code: None for store_code in missing_codes})
+
+        # A transaction that already wrote can be rolled back, his reads are not cached
+        cache_reads = not _request_session_is_dirty()
+
+        # Only the registered stores are cached, a new store is found as soon as it is inserted
+        for store_row in cursor.fetchall():
+            store_id = str(store_row['id_store'])
+
+            store_ids[store_row['store_code']] = store_id
+
+            if cache_reads:
+                store_id_cache.put(store_row['store_code'], store_id, store_generations[store_row['store_code']])
+
+    return store_ids
+
+
+def scrub(input_string):
+    """Clean an input string (to prevent SQL injection).
+
+    Parameters
+    ----------
+    input_string : str
+
+    Returns
+    -------
+    str
+    """
+    return "".join(k for k in input_string if k.isalnum())
+
+
+def create_cursor(conn):
+    r"""
+    Create an object statement to transact to the database and manage his data.
+
+    :param conn: Object to connect to the database.
+    :return cursor: Object statement to transact to the database with the connection.
+
+    """
+    try:
+        cursor = conn.cursor()
+
+    except (Exception, psycopg2.Error) as error:
+        logger.exception('Can not create the cursor object, verify database connection', error, exc_info=True)
+        raise mvc_exc.ConnectionError(
+            'Can not connect to database, verify data connection.\nOriginal Exception raised: {}'.format(
+                error
+            )
+        )
+
+    return cursor
+
+
+def disconnect_from_db(conn):
+    r"""
+    Generate close session to the database returning the conn object to the connection pool.
+    The connection of a request is kept until the request ends (see end_request_session).
+
+    :param conn: Object connector to close session.
+    """
+
+    if conn is None:
+        return
+
+    request_session = _get_request_session()
+
+    if request_session is not None and request_session['connection'] is conn:
+        return
+
+    get_connection_pool().put_connection(conn)
+
+
+def close_cursor(cursor):
+    r"""
+    Generate close statement to the database through the disconnection of the cursor object.
+
+    :param cursor: Object cursor to close statement.
+    """
+
+    if cursor is not None:
+        cursor.close()
+
+
+def format_uuid(value):
+    r"""
+    Get the text of a UUID to set on the uuid columns, a new one is generated if the value is empty.
+
+    :param value: UUID as object, text or integer (as generated on the models).
+    :return uuid_text: The UUID as text.
+    """
+
+    if not value:
+        return str(uuid.uuid4())
+
+    if isinstance(value, int):
+        return str(uuid.UUID(int=value))
+
+    return str(value)
+
+
+class StoreModelDb(Base):
+    r"""
+    Class to instance the data of a Store on the database.
+    Transactions:
+     - Insert: Add Van data to the database if not exists.
+     - Update: Update Van data on the database if exists.
+    """
+
+    cfg = Util.get_config_constant_file()
+
+    __tablename__ = cfg['DB_OBJECTS']['STORE_TABLE']
+
+    id_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['ID_STORE'], Numeric, primary_key=True)
+    name_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_NAME'], String)
+    code_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_CODE'], String)
+    street_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_STREET_ADDRESS'], String)
+    external_number_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_NUMBER_EXT_ADDRESS'], String)
+    suburb_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_SUBURB_ADDRESS'], String)
+    city_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_CITY_ADDRESS'], String)
+    country_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_COUNTRY_ADDRESS'], String)
+    postal_code_store = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_POSTAL_CODE'], String)
+    minimum_stock = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['STORE_MIN_STOCK'], Numeric)
+    creation_date = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['CREATION_DATE'], String)
+    last_update_date = Column(cfg['DB_COLUMNS_DATA']['STORE_API']['LAST_UPDATE_DATE'], String)
+
+    def manage_store_data(self, store_obj):
+
+        store_data = {}
+
+        store_dict = Util.set_data_input_store_dict(store_obj)
+
+        store_data = upsert_store_data(store_dict)
+
+        return store_data
+
+
+# Update Store data registered
+def update_store_data(data_store):
+    r"""
+    Transaction to update data of a store registered on database.
+    The data that you can update are:
+
+    :param data_store: Dictionary of all data store to update.
+    :return store_data_updated: Dictionary that contains Store data updated on db.
+    """
+
+    conn = None
+    cursor = None
+    store_data_updated = dict()
+
+    cfg = Util.get_config_constant_file()
+
+    try:
+        conn = session_to_db()
+
+        cursor = create_cursor(conn)
+
+        table_name = cfg['DB_OBJECTS']['STORE_TABLE']
+
+        # store_id = data_store.get("store_id")
+        store_code = data_store.get("store_code")
+        store_name = data_store.get("store_name")
+        street_address = data_store.get("street_address")
+        external_number_address = data_store.get("external_number_address")
+        suburb_address = data_store.get("suburb_address")
+        city_address = data_store.get("city_address")
+        country_address = data_store.get("country_address")
+        zip_postal_code_address = data_store.get("zip_postal_code_address")
+        minimum_stock = data_store.get("minimum_inventory")
+
+        store_id = select_store_id(store_code)
+
+        # update row to database
+        sql_update_store = 'UPDATE {} ' \
+                           'SET store_name=%s, ' \
+                           'store_street_address=%s, ' \
+                           'store_external_number=%s, ' \
+                           'store_suburb_address=%s, ' \
+                           'store_city_address=%s, ' \
+                           'store_country_address=%s, ' \
+                           'store_zippostal_code=%s, ' \
+                           'store_min_inventory=%s, ' \
+                           'last_update_date=now() ' \
+                           'WHERE id_store=%s AND store_code=%s ' \
+                           'RETURNING id_store, last_update_date'.format(table_name)
 
         cursor.execute(sql_update_store, (store_name,
                                           street_address,
@@ -569,7 +939,13 @@ def update_store_data(data_store):
                                           city_address,
                                           country_address,
                                           zip_postal_code_address,
-                                          minimum_stock,))
+                                          minimum_stock,
+                                          store_id,
+                                          store_code,))
+
+        store_dates = cursor.fetchone()
+
+        last_update_date = str(store_dates['last_update_date']) if store_dates else None
 
         address_store = Util.format_store_address(street_address,
                                                   external_number_address,
@@ -578,15 +954,13 @@ def update_store_data(data_store):
                                                   city_address,
                                                   country_address)
 
-        conn.commit()
+        notify_cache_invalidation(cursor, 'store', [store_code])
 
-        close_cursor(cursor)
+        commit_session(conn)
 
-        row_exists = validate_transaction(table_name,
-                                          'id_store',
-                                          'id_store', store_id,
-                                          'store_code', store_code,
-                                          'store_name', store_name)
+        invalidate_store_id(store_code)
+
+        close_cursor(cursor)
 
         store_data_updated = {
             "IdStore": store_id,
@@ -598,7 +972,7 @@ def update_store_data(data_store):
             "Message": "Store Updated Successful",
         }
 
-        if not str(store_id) in str(row_exists):
+        if store_dates is None:
             store_data_updated = {
                 "IdStore": store_id,
                 "CodeStore": store_code,
@@ -616,7 +990,7 @@ def update_store_data(data_store):
             )
 
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
         logger.exception('An exception occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
             "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, table_name)
@@ -624,7 +998,7 @@ def update_store_data(data_store):
     finally:
         disconnect_from_db(conn)
 
-    return json.dumps(store_data_updated)
+    return store_data_updated
 
 
 # Delete store registered by id
@@ -656,7 +1030,13 @@ def delete_store_data(store_code):
 
         cursor.execute(sql_delete_van, (store_id, store_code,))
 
-        conn.commit()
+        rows_deleted = cursor.rowcount
+
+        notify_cache_invalidation(cursor, 'store', [store_code])
+
+        commit_session(conn)
+
+        invalidate_store_id(store_code)
 
         close_cursor(cursor)
 
@@ -666,12 +1046,7 @@ def delete_store_data(store_code):
             "Message": "Store Deleted Successful",
         }
 
-        row_exists = exists_data_row(table_name,
-                                     'id_store',
-                                     'id_store', store_id,
-                                     'store_code', store_code)
-
-        if str(store_id) in str(row_exists):
+        if rows_deleted == 0:
             store_data_deleted = {
                 "IdStore": store_id,
                 "CodeStore": store_code,
@@ -679,7 +1054,7 @@ def delete_store_data(store_code):
             }
 
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
         logger.exception('An exception occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
             "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, table_name)
@@ -687,10 +1062,133 @@ def delete_store_data(store_code):
     finally:
         disconnect_from_db(conn)
 
-    return json.dumps(store_data_deleted)
+    return store_data_deleted
+
+
+# Insert or update Store data in a single statement
+def upsert_store_data(data_store):
+    r"""
+    Transaction to add a store or update his data if the store code is already registered.
+    The conflict on the store code is resolved by the database, so there is no previous existence check.
+
+    :param data_store: Dictionary of all data store to insert or update.
+    :return store_data_upserted: Dictionary that contains Store data inserted or updated on db.
+    """
+
+    conn = None
+    cursor = None
+    store_data_upserted = dict()
+
+    cfg = Util.get_config_constant_file()
+
+    table_name = cfg['DB_OBJECTS']['STORE_TABLE']
+
+    try:
+        conn = session_to_db()
+
+        cursor = create_cursor(conn)
+
+        store_id = format_uuid(data_store.get("store_id"))
+        store_code = data_store.get("store_code")
+        store_name = data_store.get("store_name")
+        store_street_address = data_store.get("street_address")
+        store_external_number = data_store.get("external_number_address")
+        store_suburb_address = data_store.get("suburb_address")
+        store_city_address = data_store.get("city_address")
+        store_country_address = data_store.get("country_address")
+        store_zippostal_code = data_store.get("zip_postal_code_address")
+        store_min_inventory = data_store.get("minimum_inventory")
+
+        if not Util.validate_store_code_syntax(store_code):
+            logger.error('Can not read the recordset: {}, because the store code is not valid: {}'.format(store_code,
+                                                                                                          table_name))
+            raise mvc_exc.ItemNotStored(
+                'Can\'t read "{}" because it\'s not stored in table "{}. SQL Exception"'.format(
+                    store_code, table_name
+                )
+            )
+
+        data_upsert = (store_id, store_name, store_code, store_street_address, store_external_number,
+                       store_suburb_address, store_city_address, store_country_address, store_zippostal_code,
+                       store_min_inventory,)
+
+        # xmax = 0 only on the row version created by the INSERT, an updated row has the xmax of the UPDATE
+        sql_store_upsert = 'INSERT INTO {} ' \
+                           '(id_store, ' \
+                           'store_name, ' \
+                           'store_code, ' \
+                           'store_street_address, ' \
+                           'store_external_number, ' \
+                           'store_suburb_address, ' \
+                           'store_city_address, ' \
+                           'store_country_address, ' \
+                           'store_zippostal_code, ' \
+                           'store_min_inventory) ' \
+                           'VALUES(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s) ' \
+                           'ON CONFLICT (store_code) DO UPDATE ' \
+                           'SET store_name=EXCLUDED.store_name, ' \
+                           'store_street_address=EXCLUDED.store_street_address, ' \
+                           'store_external_number=EXCLUDED.store_external_number, ' \
+                           'store_suburb_address=EXCLUDED.store_suburb_address, ' \
+                           'store_city_address=EXCLUDED.store_city_address, ' \
+                           'store_country_address=EXCLUDED.store_country_address, ' \
+                           'store_zippostal_code=EXCLUDED.store_zippostal_code, ' \
+                           'store_min_inventory=EXCLUDED.store_min_inventory, ' \
+                           'last_update_date=now() ' \
+                           'RETURNING id_store, creation_date, last_update_date, ' \
+                           '          (xmax = 0) AS inserted'.format(table_name)
+
+        cursor.execute(sql_store_upsert, data_upsert)
+
+        store_row = cursor.fetchone()
+
+        notify_cache_invalidation(cursor, 'store', [store_code])
+
+        commit_session(conn)
+
+        invalidate_store_id(store_code)
+
+        close_cursor(cursor)
+
+        address_store = Util.format_store_address(store_street_address,
+                                                  store_external_number,
+                                                  store_suburb_address,
+                                                  store_zippostal_code,
+                                                  store_city_address,
+                                                  store_country_address)
+
+        message_upsert = "Store Inserted Successful" if store_row['inserted'] else "Store Updated Successful"
+
+        logger.info('Store upserted %s', "{0}, Code: {1}, Name: {2}, {3}".format(store_row['id_store'],
+                                                                                 store_code,
+                                                                                 store_name,
+                                                                                 message_upsert))
+
+        store_data_upserted = {
+            "IdStore": str(store_row['id_store']),
+            "CodeStore": store_code,
+            "NameStore": store_name,
+            "AddressStore": address_store,
+            "MinimumStock": store_min_inventory,
+            "CreationDate": str(store_row['creation_date']),
+            "LastUpdateDate": str(store_row['last_update_date']),
+            "Message": message_upsert,
+        }
+
+    except SQLAlchemyError as error:
+        rollback_session(conn)
+        logger.exception('An exception was occurred while execute transaction: %s', error)
+        raise SQLAlchemyError(
+            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, table_name)
+        )
+    finally:
+        disconnect_from_db(conn)
+
+    return store_data_upserted
 
 
 # Select all data store by store code from db
+@coalesced_read
 def select_by_store_code(store_code):
     r"""
     Get all the Store's data looking for specific store code on database.
@@ -803,12 +1301,159 @@ def select_by_store_code(store_code):
                 }
             }]
 
-        close_cursor(cursor)
+        close_cursor(cursor)
+
+        data_store_all = store_data_by_code
+
+    except SQLAlchemyError as error:
+        rollback_session(conn)
+        logger.exception('An exception occurred while execute transaction: %s', error)
+        raise SQLAlchemyError(
+            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, table_name)
+        )
+    finally:
+        disconnect_from_db(conn)
+
+    return data_store_all
+
+
+# Select a page of the stores ordered by store code
+@coalesced_read
+def select_stores_page(page_size, page_cursor=None):
+    r"""
+    Get a page of the Stores registered on database with keyset pagination on the store code (unique index).
+
+    :param page_size: Max number of stores of the page.
+    :param page_cursor: Cursor returned as NextCursor by the previous page, None for the first page.
+    :return data_store_page: Dictionary with the Stores of the page and the cursor of the next one (None at the end).
+    """
+
+    conn = None
+    cursor = None
+
+    store_data_page = []
+
+    cfg = Util.get_config_constant_file()
+
+    table_name = cfg['DB_OBJECTS']['STORE_TABLE']
+
+    sql_filter = ''
+    sql_params = []
+
+    if page_cursor is not None:
+        sql_filter = ' WHERE store_code > %s'
+        sql_params += decode_page_cursor('store', page_cursor, 1)
+
+    try:
+
+        conn = session_to_db()
+
+        cursor = create_cursor(conn)
+
+        # Se lee un registro de mas para saber si existe una pagina siguiente
+        sql_stores_page = " SELECT id_store, " \
+                          "        store_name, " \
+                          "        store_code, " \
+                          "        store_street_address, " \
+                          "        store_external_number, " \
+                          "        store_suburb_address, " \
+                          "        store_city_address, " \
+                          "        store_country_address, " \
+                          "        store_zippostal_code, " \
+                          "        store_min_inventory, " \
+                          "        creation_date, " \
+                          "        last_update_date" \
+                          " FROM {}{}" \
+                          " ORDER BY store_code" \
+                          " LIMIT %s".format(table_name, sql_filter)
+
+        cursor.execute(sql_stores_page, sql_params + [page_size + 1])
+
+        result = cursor.fetchall()
+
+        for store_data in result[:page_size]:
+            address_store = Util.format_store_address(store_data['store_street_address'],
+                                                      store_data['store_external_number'],
+                                                      store_data['store_suburb_address'],
+                                                      store_data['store_zippostal_code'],
+                                                      store_data['store_city_address'],
+                                                      store_data['store_country_address'])
+
+            store_data_page += [{
+                "Store": {
+                    "IdStore": store_data['id_store'],
+                    "CodeStore": store_data['store_code'],
+                    "NameStore": store_data['store_name'],
+                    "AddressStore": address_store,
+                    "MinimumStock": store_data['store_min_inventory'],
+                    "CreationDate": store_data['creation_date'],
+                    "LastUpdateDate": store_data['last_update_date'],
+                }
+            }]
+
+        close_cursor(cursor)
+
+        next_cursor = None
+
+        if len(result) > page_size:
+            next_cursor = encode_page_cursor('store', [result[page_size - 1]['store_code']])
+
+        logger.info('Stores Page: %s', 'Stores: {}, Next page: {}'.format(len(store_data_page),
+                                                                         next_cursor is not None))
+
+    except SQLAlchemyError as error:
+        rollback_session(conn)
+        logger.exception('An exception occurred while execute transaction: %s', error)
+        raise SQLAlchemyError(
+            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, table_name)
+        )
+    finally:
+        disconnect_from_db(conn)
+
+    return {
+        "Stores": store_data_page,
+        "NextCursor": next_cursor,
+    }
+
+
+# Version of a store for the conditional GET (ETag / Last-Modified)
+@coalesced_read
+def select_store_version(store_code):
+    r"""
+    Get the version of the data of a Store without reading it: the row version (xmin changes on each write)
+    and his last update date. It is read with the unique index of the store code.
+
+    :param store_code: The code of the store.
+    :return store_version: Dictionary with Version (text) and LastModified (UTC datetime or None).
+    """
+
+    conn = None
+    cursor = None
+
+    cfg = Util.get_config_constant_file()
+
+    table_name = cfg['DB_OBJECTS']['STORE_TABLE']
+
+    try:
+
+        conn = session_to_db()
+
+        cursor = create_cursor(conn)
+
+        sql_store_version = " SELECT md5(string_agg(xmin::text, ',')) AS row_version, " \
+                            "        (max(last_update_date) AT TIME ZONE current_setting('TimeZone')) " \
+                            "          AT TIME ZONE 'UTC' AS last_modified " \
+                            " FROM {} " \
+                            " WHERE store_code = %s".format(table_name)
 
-        data_store_all = json.dumps(store_data_by_code)
+        cursor.execute(sql_store_version, (store_code,))
+
+        store_version = cursor.fetchone()
+
+        close_cursor(cursor)
 
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
         logger.exception('An exception occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
             "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, table_name)
@@ -816,10 +1461,14 @@ def select_by_store_code(store_code):
     finally:
         disconnect_from_db(conn)
 
-    return data_store_all
+    return {
+        "Version": store_version['row_version'] or 'not-stored',
+        "LastModified": store_version['last_modified'],
+    }
 
 
 # Select stock in specific product by store code
+@coalesced_read
 def select_stock_in_product(store_code, product_sku):
     r"""
     Get the store stock in a single product looking for by product sku.
@@ -840,6 +1489,8 @@ def select_stock_in_product(store_code, product_sku):
     store_table = cfg['DB_OBJECTS']['STORE_TABLE']
     product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
 
+    read_log = get_read_log('select_stock_in_product')
+
     try:
 
         conn = session_to_db()
@@ -876,13 +1527,8 @@ def select_stock_in_product(store_code, product_sku):
             sku_product = stock_data['product_sku']
             stock_product = stock_data['product_stock']
 
-            logger.info('Product Stock: %s', 'CodeStore: {}, '
-                                             'NameStore: {}, '
-                                             'SKU: {}, '
-                                             'Stock: {} '.format(code_store,
-                                                                 name_store,
-                                                                 sku_product,
-                                                                 stock_product))
+            read_log.row('Product Stock: CodeStore: %s, NameStore: %s, SKU: %s, Stock: %s',
+                         code_store, name_store, sku_product, stock_product)
 
             stock_data_by_sku += [{
                 "ProductStock": {
@@ -895,10 +1541,12 @@ def select_stock_in_product(store_code, product_sku):
 
         close_cursor(cursor)
 
-        data_stock_all = json.dumps(stock_data_by_sku)
+        read_log.summary(len(result), '{}, {}'.format(store_code, product_sku))
+
+        data_stock_all = stock_data_by_sku
 
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
         logger.exception('An exception occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
             "A SQL Exception {} occurred while transacting with the database on table {} - {}.".format(error,
@@ -912,6 +1560,7 @@ def select_stock_in_product(store_code, product_sku):
 
 
 # Select all stock in specific product code
+@coalesced_read
 def select_all_stock_in_product(product_sku):
     r"""
     Get the store stock in a single product looking for by product sku.
@@ -931,6 +1580,8 @@ def select_all_stock_in_product(product_sku):
     store_table = cfg['DB_OBJECTS']['STORE_TABLE']
     product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
 
+    read_log = get_read_log('select_all_stock_in_product')
+
     try:
 
         conn = session_to_db()
@@ -963,13 +1614,8 @@ def select_all_stock_in_product(product_sku):
             sku_product = stock_data['product_sku']
             stock_product = stock_data['product_stock']
 
-            logger.info('Product Stock: %s', 'CodeStore: {}, '
-                                             'NameStore: {}, '
-                                             'SKU: {}, '
-                                             'Stock: {} '.format(code_store,
-                                                                 name_store,
-                                                                 sku_product,
-                                                                 stock_product))
+            read_log.row('Product Stock: CodeStore: %s, NameStore: %s, SKU: %s, Stock: %s',
+                         code_store, name_store, sku_product, stock_product)
 
             stock_data_by_sku += [{
                 "SKU": sku_product,
@@ -978,117 +1624,417 @@ def select_all_stock_in_product(product_sku):
                     "NameStore": name_store,
                     "Stock": stock_product,
                 }
-            }]
-
-        close_cursor(cursor)
+            }]
+
+        close_cursor(cursor)
+
+        read_log.summary(len(result), product_sku)
+
+        data_stock_all = stock_data_by_sku
+
+    except SQLAlchemyError as error:
+        rollback_session(conn)
+        logger.exception('An exception occurred while execute transaction: %s', error)
+        raise SQLAlchemyError(
+            "A SQL Exception {} occurred while transacting with the database on table {} - {}.".format(error,
+                                                                                                       store_table,
+                                                                                                       product_table)
+        )
+    finally:
+        disconnect_from_db(conn)
+
+    return data_stock_all
+
+
+# Select the stock of many products in one query, optionally only in some stores
+@coalesced_read
+def select_stock_in_products(product_skus, store_codes=None):
+    r"""
+    Get the stock in the stores of a list of products (for example the items of a cart) in a single query.
+
+    :param product_skus: List of SKU of the products to find stock.
+    :param store_codes: Optional list of store codes to limit the stores where the stock is looking for.
+    :return data_stock_all: Dictionary with the stock by store grouped by SKU and the SKU not found.
+    """
+
+    cfg = Util.get_config_constant_file()
+
+    conn = None
+    cursor = None
+
+    store_table = cfg['DB_OBJECTS']['STORE_TABLE']
+    product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+
+    # Sin duplicados y en el orden de la peticion
+    product_skus = list(dict.fromkeys(product_skus))
+
+    stock_by_sku = {product_sku: [] for product_sku in product_skus}
+
+    try:
+
+        conn = session_to_db()
+
+        cursor = create_cursor(conn)
+
+        sql_stock_by_skus = " SELECT " \
+                            "   prod.product_sku, " \
+                            "   store.store_code, " \
+                            "   store.store_name, " \
+                            "   prod.product_stock " \
+                            " FROM {} store " \
+                            " JOIN {} prod ON prod.product_store_id = store.id_store " \
+                            " WHERE prod.product_sku = ANY(%s) ".format(store_table, product_table)
+
+        params = [product_skus]
+
+        if store_codes:
+            sql_stock_by_skus += " AND store.store_code = ANY(%s) "
+            params.append(list(dict.fromkeys(store_codes)))
+
+        sql_stock_by_skus += " ORDER BY prod.product_sku, store.store_code"
+
+        cursor.execute(sql_stock_by_skus, params)
+
+        for stock_data in cursor.fetchall():
+            stock_by_sku[stock_data['product_sku']].append({
+                "CodeStore": stock_data['store_code'],
+                "NameStore": stock_data['store_name'],
+                "Stock": stock_data['product_stock'],
+            })
+
+        close_cursor(cursor)
+
+        stock_data_by_sku = [{
+            "SKU": product_sku,
+            "TotalStock": sum(stock_store["Stock"] for stock_store in stock_stores),
+            "ProductStock": stock_stores,
+        } for product_sku, stock_stores in stock_by_sku.items() if stock_stores]
+
+        data_stock_all = {
+            "Products": stock_data_by_sku,
+            "NotFound": [product_sku for product_sku, stock_stores in stock_by_sku.items() if not stock_stores],
+        }
+
+        logger.info('Products Stock: %s', 'SKUs: {}, Found: {}'.format(len(product_skus), len(stock_data_by_sku)))
+
+    except SQLAlchemyError as error:
+        rollback_session(conn)
+        logger.exception('An exception occurred while execute transaction: %s', error)
+        raise SQLAlchemyError(
+            "A SQL Exception {} occurred while transacting with the database on table {} - {}.".format(error,
+                                                                                                       store_table,
+                                                                                                       product_table)
+        )
+    finally:
+        disconnect_from_db(conn)
+
+    return data_stock_all
+
+
+class ProductModelDb(Base):
+    r"""
+    Class to instance the data of a Van on the database.
+    Transactions:
+     - Insert: Add Product data to the database if not exists.
+     - Update: Update Product data on the database if exists.
+    """
+
+    cfg = Util.get_config_constant_file()
+
+    __tablename__ = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+
+    id_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['ID'], Numeric, primary_key=True)
+    sku_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['SKU'], String)
+    unspc_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['UNSPC'], String)
+    brand_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['BRAND'], String)
+    category_id = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['CATEGORY_ID'], Numeric)
+    parent_category_id = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['PARENT_CAT_ID'], Numeric)
+    uom_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['UOM'], String)
+    stock_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['STOCK'], Numeric)
+    store_id_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['STORE_ID'], Numeric)
+    name_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['NAME'], String)
+    title_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['TITLE'], String)
+    long_description_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['LONG_DESCRIPTION'], String)
+    photo_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['PHOTO'], String)
+    price_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['PRICE'], Numeric)
+    tax_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['TAX_PRICE'], Numeric)
+    currency_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['CURRENCY'], String)
+    status_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['STATUS'], String)
+    published_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['PUBLISHED'], Boolean)
+    manage_stock_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['MANAGE_STOCK'], Boolean)
+    length_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['LENGTH'], Numeric)
+    width_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['WIDTH'], Numeric)
+    height_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['HEIGHT'], Numeric)
+    weight_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['WEIGHT'], Numeric)
+    creation_date = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['CREATION_DATE'], String)
+    last_update_date = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['LAST_UPDATE_DATE'], String)
+
+    def manage_product_data(self, product_obj):
+
+        product_data = {}
+        product_input_dic = {}
+
+        product_input_dic = Util.set_data_input_product_dict(product_obj)
+
+        product_data = upsert_product_data(product_input_dic)
+
+        return product_data
+
+
+# Update Product data registered
+def update_product_data(data_product):
+    r"""
+    Transaction to update data of a Van registered on database.
+    The data that you can update are:
+
+    :param data_product: Dictionary of all data product to update.
+    :return product_data_updated: Dictionary that contains Product data updated on db.
+    """
+
+    conn = None
+    cursor = None
+    product_data_updated = dict()
+
+    cfg = Util.get_config_constant_file()
+
+    try:
+        conn = session_to_db()
+
+        cursor = create_cursor(conn)
+
+        product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+
+        product_sku = data_product.get('product_sku')
+        category_id = data_product.get('category_id')
+        parent_category_id = data_product.get('parent_category_id')
+        product_stock = data_product.get('product_stock')
+        product_store_code = data_product.get('product_store_code')
+        product_name = data_product.get('product_name')
+        product_title = data_product.get('product_title')
+        product_long_description = data_product.get('product_long_description')
+        product_photo = data_product.get('product_photo')
+        product_price = data_product.get('product_price')
+        product_tax = data_product.get('product_tax')
+        product_currency = data_product.get('product_currency')
+        product_status = data_product.get('product_status')
+        product_published = data_product.get('product_published')
+        manage_stock = data_product.get('product_manage_stock')
+
+        product_store_id = select_store_id(product_store_code)
+        product_id = select_product_id(product_sku, product_store_id)
+
+        # update row to database
+        sql_update_product = ' UPDATE {} ' \
+                             ' SET product_sku=%s, ' \
+                             '     category_id=%s, ' \
+                             '     parent_category_id=%s, ' \
+                             '     product_stock=%s, ' \
+                             '     product_name=%s, ' \
+                             '     product_title=%s, ' \
+                             '     product_long_description=%s, ' \
+                             '     product_photo=%s, ' \
+                             '     product_price=%s, ' \
+                             '     product_tax=%s, ' \
+                             '     product_currency=%s, ' \
+                             '     product_status=%s, ' \
+                             '     product_published=%s, ' \
+                             '     product_manage_stock=%s, ' \
+                             '     last_update_date=now()' \
+                             ' WHERE product_id=%s AND product_store_id=%s' \
+                             ' RETURNING product_id, last_update_date'.format(product_table)
+
+        cursor.execute(sql_update_product, (product_sku,
+                                            category_id,
+                                            parent_category_id,
+                                            product_stock,
+                                            product_name,
+                                            product_title,
+                                            product_long_description,
+                                            product_photo,
+                                            product_price,
+                                            product_tax,
+                                            product_currency,
+                                            product_status,
+                                            product_published,
+                                            manage_stock,
+                                            product_id,
+                                            product_store_id,))
+
+        product_dates = cursor.fetchone()
+
+        last_update_date = str(product_dates['last_update_date']) if product_dates else None
+
+        notify_cache_invalidation(cursor, 'product', [product_sku])
+
+        commit_session(conn)
+
+        invalidate_product_sku([product_sku])
+
+        close_cursor(cursor)
+
+        product_data_updated = {
+            "Product": {
+                "IdProduct": product_id,
+                "SKUProduct": product_sku,
+                "NameProduct": product_name,
+                "TitleProduct": product_title,
+                "CategoryIdProduct": category_id,
+                "ParentCategoryIdProduct": parent_category_id,
+                "StockProduct": product_stock,
+                "CodeStore": product_store_code,
+                "LongDescriptionProduct": product_long_description,
+                "PhotoProduct": product_photo,
+                "Prices": {
+                    "PriceProduct": product_price,
+                    "TaxPriceProduct": product_tax,
+                    "CurrencyPriceProduct": product_currency,
+                },
+                "StatusProduct": product_status,
+                "PublishedProduct": product_published,
+                "ManageStockProduct": manage_stock,
+                "LastUpdateDate": last_update_date,
+                "Message": "Product data Updated Successful"
+            }
+        }
+
+        if product_dates is None:
+            product_data_updated = {
+                "Product": {
+                    "IdProduct": product_id,
+                    "SKUProduct": product_sku,
+                    "NameProduct": product_name,
+                    "TitleProduct": product_title,
+                    "CategoryIdProduct": category_id,
+                    "ParentCategoryIdProduct": parent_category_id,
+                    "StockProduct": product_stock,
+                    "CodeStore": product_store_code,
+                    "LongDescriptionProduct": product_long_description,
+                    "PhotoProduct": product_photo,
+                    "Prices": {
+                        "PriceProduct": product_price,
+                        "TaxPriceProduct": product_tax,
+                        "CurrencyPriceProduct": product_currency,
+                    },
+                    "StatusProduct": product_status,
+                    "PublishedProduct": product_published,
+                    "ManageStockProduct": manage_stock,
+                    "LastUpdateDate": last_update_date,
+                    "Message": "Product not Updated"
+                }
+            }
 
-        data_stock_all = json.dumps(stock_data_by_sku)
+            logger.error('Can not read the recordset: {}, beacause is not stored on table: {}'.format(product_id,
+                                                                                                      product_table))
+            raise SQLAlchemyError(
+                "Can\'t read data because it\'s not stored in table {}. SQL Exception".format(product_table)
+            )
 
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
         logger.exception('An exception occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
-            "A SQL Exception {} occurred while transacting with the database on table {} - {}.".format(error,
-                                                                                                       store_table,
-                                                                                                       product_table)
+            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, product_table)
         )
     finally:
         disconnect_from_db(conn)
 
-    return data_stock_all
+    return product_data_updated
 
 
-class ProductModelDb(Base):
+# Delete Product registered by id and code
+def delete_product_data(product_sku, product_store_code):
     r"""
-    Class to instance the data of a Van on the database.
-    Transactions:
-     - Insert: Add Product data to the database if not exists.
-     - Update: Update Product data on the database if exists.
+    Transaction to delete a Product data registered on database.
+
+    :param product_sku: Id to looking for a Store data to delete.
+    :param product_store_code: Code to looking for a Store data to delete.
+    :return product_data_delete: Dictionary contains product data deleted.
     """
 
+    conn = None
+    cursor = None
+    product_data_deleted = dict()
+
     cfg = Util.get_config_constant_file()
 
-    __tablename__ = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+    try:
+        conn = session_to_db()
 
-    id_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['ID'], Numeric, primary_key=True)
-    sku_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['SKU'], String)
-    unspc_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['UNSPC'], String)
-    brand_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['BRAND'], String)
-    category_id = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['CATEGORY_ID'], Numeric)
-    parent_category_id = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['PARENT_CAT_ID'], Numeric)
-    uom_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['UOM'], String)
-    stock_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['STOCK'], Numeric)
-    store_id_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['STORE_ID'], Numeric)
-    name_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['NAME'], String)
-    title_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['TITLE'], String)
-    long_description_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['LONG_DESCRIPTION'], String)
-    photo_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['PHOTO'], String)
-    price_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['PRICE'], Numeric)
-    tax_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['TAX_PRICE'], Numeric)
-    currency_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['CURRENCY'], String)
-    status_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['STATUS'], String)
-    published_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['PUBLISHED'], Boolean)
-    manage_stock_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['MANAGE_STOCK'], Boolean)
-    length_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['LENGTH'], Numeric)
-    width_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['WIDTH'], Numeric)
-    height_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['HEIGHT'], Numeric)
-    weight_product = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['WEIGHT'], Numeric)
-    creation_date = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['CREATION_DATE'], String)
-    last_update_date = Column(cfg['DB_COLUMNS_DATA']['PRODUCT_API']['LAST_UPDATE_DATE'], String)
+        cursor = create_cursor(conn)
 
-    def manage_product_data(self, product_obj):
+        product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
 
-        product_data = {}
-        product_input_dic = {}
+        product_store_id = select_store_id(product_store_code)
+        product_id = select_product_id(product_sku, product_store_id)
 
-        product_input_dic = Util.set_data_input_product_dict(product_obj)
+        # delete row to database
+        sql_delete_van = "DELETE FROM {} WHERE product_id=%s AND product_store_id=%s".format(product_table)
 
-        product_sku = product_input_dic.get("product_sku")
-        product_store_code = product_input_dic.get("product_store_code")
+        cursor.execute(sql_delete_van, (product_id, product_store_id,))
 
-        product_store_id = select_store_id(product_store_code)
-        product_id = select_product_id(product_sku, product_store_code)
+        rows_deleted = cursor.rowcount
 
-        if exists_data_row(self.__tablename__,
-                           self.id_product,
-                           self.id_product,
-                           product_id,
-                           self.store_id_product,
-                           product_store_id):
+        notify_cache_invalidation(cursor, 'product', [product_sku])
 
-            product_data = update_product_data(product_input_dic)
-        else:
-            product_data = insert_new_product(product_input_dic)
+        commit_session(conn)
 
-        return product_data
+        invalidate_product_sku([product_sku])
+
+        close_cursor(cursor)
+
+        product_data_deleted = {
+            "IdProduct": product_id,
+            "SKUProduct": product_sku,
+            "StoreCode": product_store_code,
+            "Message": "Product Deleted Successful",
+        }
+
+        if rows_deleted == 0:
+            product_data_deleted = {
+                "IdProduct": product_id,
+                "SKUProduct": product_sku,
+                "StoreCode": product_store_code,
+                "Message": "Product not Deleted",
+            }
+
+    except SQLAlchemyError as error:
+        rollback_session(conn)
+        logger.exception('An exception occurred while execute transaction: %s', error)
+        raise SQLAlchemyError(
+            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, product_table)
+        )
+    finally:
+        disconnect_from_db(conn)
 
+    return product_data_deleted
 
-# Add Product data to insert the row on the database
-def insert_new_product(data_product):
+
+# Insert or update Product data by store in a single statement
+def upsert_product_data(data_product):
     r"""
-    Transaction to add data of a product and inserted on database.
-    The data that you can insert are:
+    Transaction to add a product to a store or update his data if the SKU is already registered on the store.
+    The store is resolved by his code with the store id cache and the conflict on (SKU, store) is resolved
+    by the database, so there is no previous existence check.
 
-    :param data_product: Dictionary of all data product to insert.
-    :return product_data_inserted: Dictionary that contains product data inserted on db.
+    :param data_product: Dictionary of all data product to insert or update.
+    :return product_data_upserted: Dictionary that contains Product data inserted or updated on db.
     """
 
     conn = None
     cursor = None
-    product_data_inserted = dict()
+    product_data_upserted = dict()
 
     cfg = Util.get_config_constant_file()
 
+    product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+    store_table = cfg['DB_OBJECTS']['STORE_TABLE']
+
     try:
         conn = session_to_db()
 
         cursor = create_cursor(conn)
 
-        table_name = cfg['DB_OBJECTS']['PRODUCT_TABLE']
-
-        creation_date = get_datenow_from_db()
-        last_update_date = get_datenow_from_db()
-
+        product_id = format_uuid(data_product.get('product_id'))
         product_sku = data_product.get('product_sku')
         product_unspc = data_product.get('product_unspc')
         product_brand = data_product.get('product_brand')
@@ -1112,10 +2058,19 @@ def insert_new_product(data_product):
         product_height = data_product.get('product_height')
         product_weight = data_product.get('product_weight')
 
-        product_store_id = select_store_id(product_store_code)
-        product_id = select_product_id(product_sku, product_store_id)
+        product_store_id = resolve_store_ids(cursor, [product_store_code])[product_store_code]
 
-        sql_product_insert = 'INSERT INTO {} ' \
+        if product_store_id is None:
+            logger.error('Can not read the recordset: {}, because is not stored on table: {}'.format(product_store_code,
+                                                                                                     store_table))
+            raise mvc_exc.ItemNotStored(
+                'Can\'t insert product "{}" because the store "{}" is not stored in table "{}"'.format(
+                    product_sku, product_store_code, store_table
+                )
+            )
+
+        # xmax = 0 only on the row version created by the INSERT, an updated row has the xmax of the UPDATE
+        sql_product_upsert = 'INSERT INTO {} ' \
                              '    (product_id, ' \
                              '     product_sku, ' \
                              '     product_unspc, ' \
@@ -1138,53 +2093,80 @@ def insert_new_product(data_product):
                              '     product_length, ' \
                              '     product_width, ' \
                              '     product_height, ' \
-                             '     product_weight, ' \
-                             '     creation_date, ' \
-                             '     last_update_date) ' \
-                             'VALUES(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, ' \
-                             '%s, %s, %s, %s, %d)'.format(table_name)
-
-        data_add_product = (product_id,
-                            product_sku,
-                            product_unspc,
-                            product_brand,
-                            product_category_id,
-                            product_parent_category_id,
-                            product_uom,
-                            product_stock,
-                            product_store_id,
-                            product_name,
-                            product_title,
-                            product_long_description,
-                            product_photo,
-                            product_price,
-                            product_tax,
-                            product_currency,
-                            product_status,
-                            product_published,
-                            product_manage_stock,
-                            product_length,
-                            product_width,
-                            product_height,
-                            product_weight,
-                            creation_date,
-                            last_update_date)
-
-        cursor.execute(sql_product_insert, data_add_product)
-
-        conn.commit()
-
-        logger.info('Product inserted %s', "{0}, Code: {1}, Name: {2}".format(table_name, product_sku, product_name))
+                             '     product_weight) ' \
+                             'VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, ' \
+                             '        %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) ' \
+                             'ON CONFLICT (product_sku, product_store_id) DO UPDATE ' \
+                             'SET product_unspc=EXCLUDED.product_unspc, ' \
+                             '    product_brand=EXCLUDED.product_brand, ' \
+                             '    category_id=EXCLUDED.category_id, ' \
+                             '    parent_category_id=EXCLUDED.parent_category_id, ' \
+                             '    unit_of_measure=EXCLUDED.unit_of_measure, ' \
+                             '    product_stock=EXCLUDED.product_stock, ' \
+                             '    product_name=EXCLUDED.product_name, ' \
+                             '    product_title=EXCLUDED.product_title, ' \
+                             '    product_long_description=EXCLUDED.product_long_description, ' \
+                             '    product_photo=EXCLUDED.product_photo, ' \
+                             '    product_price=EXCLUDED.product_price, ' \
+                             '    product_tax=EXCLUDED.product_tax, ' \
+                             '    product_currency=EXCLUDED.product_currency, ' \
+                             '    product_status=EXCLUDED.product_status, ' \
+                             '    product_published=EXCLUDED.product_published, ' \
+                             '    product_manage_stock=EXCLUDED.product_manage_stock, ' \
+                             '    product_length=EXCLUDED.product_length, ' \
+                             '    product_width=EXCLUDED.product_width, ' \
+                             '    product_height=EXCLUDED.product_height, ' \
+                             '    product_weight=EXCLUDED.product_weight, ' \
+                             '    last_update_date=now() ' \
+                             'RETURNING product_id, creation_date, last_update_date, ' \
+                             '          (xmax = 0) AS inserted'.format(product_table)
+
+        data_upsert_product = (product_id,
+                               product_sku,
+                               product_unspc,
+                               product_brand,
+                               product_category_id,
+                               product_parent_category_id,
+                               product_uom,
+                               product_stock,
+                               product_store_id,
+                               product_name,
+                               product_title,
+                               product_long_description,
+                               product_photo,
+                               product_price,
+                               product_tax,
+                               product_currency,
+                               product_status,
+                               product_published,
+                               product_manage_stock,
+                               product_length,
+                               product_width,
+                               product_height,
+                               product_weight,)
+
+        cursor.execute(sql_product_upsert, data_upsert_product)
+
+        product_row = cursor.fetchone()
+
+        notify_cache_invalidation(cursor, 'product', [product_sku])
+
+        commit_session(conn)
+
+        invalidate_product_sku([product_sku])
 
         close_cursor(cursor)
 
-        row_exists = exists_data_row(table_name, 'product_id',
-                                     'product_id', product_id,
-                                     'product_store_id', product_store_id)
+        message_upsert = "Product Inserted Successful" if product_row['inserted'] else "Product Updated Successful"
+
+        logger.info('Product upserted %s', "{0}, SKU: {1}, Store: {2}, {3}".format(product_row['product_id'],
+                                                                                   product_sku,
+                                                                                   product_store_code,
+                                                                                   message_upsert))
 
-        product_data_inserted += [{
+        product_data_upserted = {
             "Product": {
-                "IdProduct": product_id,
+                "IdProduct": str(product_row['product_id']),
                 "SKUProduct": product_sku,
                 "UNSPC": product_unspc,
                 "NameProduct": product_name,
@@ -1211,208 +2193,116 @@ def insert_new_product(data_product):
                     "HeightProduct": product_height,
                     "WeightProduct": product_weight,
                 },
-                "CreationDate": creation_date,
-                "LastUpdateDate": last_update_date,
+                "CreationDate": str(product_row['creation_date']),
+                "LastUpdateDate": str(product_row['last_update_date']),
+                "Message": message_upsert,
             }
-        }]
-
-        if not str(product_id) not in str(row_exists):
-            product_data_inserted += [{
-                "Product": {
-                    "IdProduct": product_id,
-                    "SKUProduct": product_sku,
-                    "UNSPC": product_unspc,
-                    "NameProduct": product_name,
-                    "TitleProduct": product_title,
-                    "BrandProduct": product_brand,
-                    "UOMProduct": product_uom,
-                    "CategoryIdProduct": product_category_id,
-                    "ParentCategoryIdProduct": product_parent_category_id,
-                    "StockProduct": product_stock,
-                    "CodeStore": product_store_code,
-                    "LongDescriptionProduct": product_long_description,
-                    "PhotoProduct": product_photo,
-                    "Prices": {
-                        "PriceProduct": product_price,
-                        "TaxPriceProduct": product_tax,
-                        "CurrencyPriceProduct": product_currency,
-                    },
-                    "StatusProduct": product_status,
-                    "PublishedProduct": product_published,
-                    "ManageStockProduct": product_manage_stock,
-                    "Volumetry": {
-                        "LengthProduct": product_length,
-                        "WidthProduct": product_width,
-                        "HeightProduct": product_height,
-                        "WeightProduct": product_weight,
-                    },
-                    "CreationDate": creation_date,
-                    "LastUpdateDate": last_update_date,
-                }
-            }]
+        }
 
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
         logger.exception('An exception was occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
-            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, table_name)
+            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, product_table)
         )
     finally:
         disconnect_from_db(conn)
 
-    return json.dumps(product_data_inserted)
+    return product_data_upserted
 
 
-# Update Product data registered
-def update_product_data(data_product):
+# Select all products by sku from db
+@coalesced_read
+def select_by_product_sku(product_sku, product_columns=None):
     r"""
-    Transaction to update data of a Van registered on database.
-    The data that you can update are:
+    Get all the product data looking for specific sku on database.
+    Read-through the product cache: the database is read only on a miss, the writes on the product invalidate it.
+    With a projection only his columns are read, a cached product is narrowed without reading the database.
 
-    :param data_product: Dictionary of all data product to update.
-    :return product_data_updated: Dictionary that contains Product data updated on db.
+    :param product_sku:
+    :param product_columns: Tuple of columns returned by get_product_projection, None for all the columns.
+    :return data_product_by_sku: Dictionary that contains all the Product's data by specific SKU.
     """
 
     conn = None
     cursor = None
-    product_data_updated = dict()
-
-    cfg = Util.get_config_constant_file()
 
-    try:
-        conn = session_to_db()
+    product_data_by_sku = []
+    data_product_all = dict()
 
-        cursor = create_cursor(conn)
+    cfg = Util.get_config_constant_file()
 
-        last_update_date = get_datenow_from_db()
+    product_cache = get_product_cache()
 
-        product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+    if product_cache is not None:
+        data_product_all = product_cache.get(product_sku)
 
-        product_sku = data_product.get('product_sku')
-        category_id = data_product.get('category_id')
-        parent_category_id = data_product.get('parent_category_id')
-        product_stock = data_product.get('product_stock')
-        product_store_code = data_product.get('product_store_code')
-        product_name = data_product.get('product_name')
-        product_title = data_product.get('product_title')
-        product_long_description = data_product.get('product_long_description')
-        product_photo = data_product.get('product_photo')
-        product_price = data_product.get('product_price')
-        product_tax = data_product.get('product_tax')
-        product_currency = data_product.get('product_currency')
-        product_status = data_product.get('product_status')
-        product_published = data_product.get('product_published')
-        manage_stock = data_product.get('product_manage_stock')
+        record_cache_lookup(data_product_all)
 
-        product_store_id = select_store_id(product_store_code)
-        product_id = select_product_id(product_sku, product_store_id)
+        if data_product_all is not MISSING:
+            if product_columns is None:
+                return data_product_all
 
-        # update row to database
-        sql_update_product = ' UPDATE {} ' \
-                             ' SET product_sku=%s, ' \
-                             '     category_id=%s, ' \
-                             '     parent_category_id=%s, ' \
-                             '     product_stock=%s, ' \
-                             '     product_name=%s, ' \
-                             '     product_title=%s, ' \
-                             '     product_long_description=%s, ' \
-                             '     product_photo=%s, ' \
-                             '     product_price=%s, ' \
-                             '     product_tax=%s, ' \
-                             '     product_currency=%s, ' \
-                             '     product_status=%s, ' \
-                             '     product_published=%s, ' \
-                             '     product_manage_stock=%s ' \
-                             '     last_update_date=%s' \
-                             ' WHERE product_id={} AND product_store_id={}'.format(product_table,
-                                                                                   product_id,
-                                                                                   product_store_id)
+            return [project_product_data(product_data, product_columns) for product_data in data_product_all]
 
-        cursor.execute(sql_update_product, (product_sku,
-                                            category_id,
-                                            parent_category_id,
-                                            product_stock,
-                                            product_name,
-                                            product_title,
-                                            product_long_description,
-                                            product_photo,
-                                            product_price,
-                                            product_tax,
-                                            product_currency,
-                                            product_status,
-                                            product_published,
-                                            manage_stock,
-                                            last_update_date,))
+        # Antes del SELECT: si un escritor invalida el SKU mientras se lee, la lectura no se guarda en cache
+        product_generation = product_cache.generation(product_sku)
 
-        conn.commit()
+    read_log = get_read_log('select_by_product_sku')
 
-        close_cursor(cursor)
+    try:
 
-        row_exists = validate_transaction(product_table,
-                                          'product_id',
-                                          'product_id', product_id,
-                                          'product_store_id', product_store_id,
-                                          'product_sku', product_sku)
+        conn = session_to_db()
 
-        product_data_updated = {
-            "Product": {
-                "IdProduct": product_id,
-                "SKUProduct": product_sku,
-                "NameProduct": product_name,
-                "TitleProduct": product_title,
-                "CategoryIdProduct": category_id,
-                "ParentCategoryIdProduct": parent_category_id,
-                "StockProduct": product_stock,
-                "CodeStore": product_store_code,
-                "LongDescriptionProduct": product_long_description,
-                "PhotoProduct": product_photo,
-                "Prices": {
-                    "PriceProduct": product_price,
-                    "TaxPriceProduct": product_tax,
-                    "CurrencyPriceProduct": product_currency,
-                },
-                "StatusProduct": product_status,
-                "PublishedProduct": product_published,
-                "ManageStockProduct": manage_stock,
-                "LastUpdateDate": last_update_date,
-                "Message": "Product data Updated Successful"
-            }
-        }
+        cursor = create_cursor(conn)
 
-        if str(product_id) not in str(row_exists):
-            product_data_updated = {
-                "Product": {
-                    "IdProduct": product_id,
-                    "SKUProduct": product_sku,
-                    "NameProduct": product_name,
-                    "TitleProduct": product_title,
-                    "CategoryIdProduct": category_id,
-                    "ParentCategoryIdProduct": parent_category_id,
-                    "StockProduct": product_stock,
-                    "CodeStore": product_store_code,
-                    "LongDescriptionProduct": product_long_description,
-                    "PhotoProduct": product_photo,
-                    "Prices": {
-                        "PriceProduct": product_price,
-                        "TaxPriceProduct": product_tax,
-                        "CurrencyPriceProduct": product_currency,
-                    },
-                    "StatusProduct": product_status,
-                    "PublishedProduct": product_published,
-                    "ManageStockProduct": manage_stock,
-                    "LastUpdateDate": last_update_date,
-                    "Message": "Product not Updated"
-                }
-            }
+        product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+        store_table = cfg['DB_OBJECTS']['STORE_TABLE']
 
-            logger.error('Can not read the recordset: {}, beacause is not stored on table: {}'.format(product_id,
-                                                                                                      product_table))
-            raise SQLAlchemyError(
-                "Can\'t read data because it\'s not stored in table {}. SQL Exception".format(product_table)
+        sql_product_by_sku = " SELECT {}" \
+                             " FROM {} prod, {} store " \
+                             " WHERE store.id_store = prod.product_store_id " \
+                             " AND prod.product_sku = %s;".format(product_select_list(product_columns),
+                                                                  product_table,
+                                                                  store_table)
+
+        cursor.execute(sql_product_by_sku, (product_sku,))
+
+        result = cursor.fetchall()
+
+        if result is None:
+            logger.error('Can not read the recordset, because is not stored: %s', product_sku)
+            raise mvc_exc.ItemNotStored(
+                'Can\'t read "{}" because it\'s not stored in table "{}. SQL Exception"'.format(
+                    product_sku, product_table
+                )
             )
 
+        for product_data in result:
+            if product_data is None:
+                logger.error('Can not read the recordset: {}, '
+                             'because is not stored on table: {}'.format(product_sku, product_table))
+                raise SQLAlchemyError(
+                    "Can\'t read data because it\'s not stored in table {}. SQL Exception".format(product_sku)
+                )
+
+            read_log.row('Product Registered: SKUProduct: %s, CodeStore: %s',
+                         product_data['product_sku'], product_data['store_code'])
+
+            product_data_by_sku += [build_product_data(product_data, product_columns)]
+
+        close_cursor(cursor)
+
+        read_log.summary(len(result), product_sku)
+
+        data_product_all = product_data_by_sku
+
+        # Solo se guarda en cache el producto completo, las proyecciones se obtienen de el
+        if product_cache is not None and product_columns is None and not _request_session_is_dirty():
+            product_cache.put(product_sku, data_product_all, product_generation)
+
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
         logger.exception('An exception occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
             "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, product_table)
@@ -1420,66 +2310,73 @@ def update_product_data(data_product):
     finally:
         disconnect_from_db(conn)
 
-    return json.dumps(product_data_updated)
+    return data_product_all
 
 
-# Delete Product registered by id and code
-def delete_product_data(product_sku, product_store_code):
+def get_product_projection(fields):
     r"""
-    Transaction to delete a Product data registered on database.
+    Get the columns of a projection of the product reads, whitelisted by DB_COLUMNS_DATA.PRODUCT_API.
 
-    :param product_sku: Id to looking for a Store data to delete.
-    :param product_store_code: Code to looking for a Store data to delete.
-    :return product_data_delete: Dictionary contains product data deleted.
+    :param fields: Fields requested, text separated by comma or list, None for all.
+    :return product_columns: Tuple of columns (hashable, it is part of the key of the coalesced reads) or None.
+    """
+
+    cfg = Util.get_config_constant_file()
+
+    return parse_product_fields(fields, cfg['DB_COLUMNS_DATA']['PRODUCT_API'])
+
+
+# Version of a product for the conditional GET (ETag / Last-Modified)
+@coalesced_read
+def select_product_version(product_sku, store_code=None):
+    r"""
+    Get the version of the data of a product in all his stores (or in one store) without reading it: the row
+    versions of the products and of their stores (xmin changes on each write, also on deletes and inserts the
+    set of rows changes) and the last update date. It is read with the unique index (SKU, store).
+
+    :param product_sku: The SKU of the product.
+    :param store_code: Code of a store to get only the version of the product on it, None for all the stores.
+    :return product_version: Dictionary with Version (text) and LastModified (UTC datetime or None).
     """
 
     conn = None
     cursor = None
-    product_data_deleted = dict()
 
     cfg = Util.get_config_constant_file()
 
-    try:
-        conn = session_to_db()
-
-        cursor = create_cursor(conn)
+    product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+    store_table = cfg['DB_OBJECTS']['STORE_TABLE']
 
-        product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+    sql_filter = ''
+    sql_params = [product_sku]
 
-        product_store_id = select_store_id(product_store_code)
-        product_id = select_product_id(product_sku, product_store_id)
+    if store_code is not None:
+        sql_filter = ' AND store.store_code = %s'
+        sql_params.append(store_code)
 
-        # delete row to database
-        sql_delete_van = "DELETE FROM {} WHERE product_id=%s AND product_store_id=%s".format(product_table)
+    try:
 
-        cursor.execute(sql_delete_van, (product_id, product_store_id,))
+        conn = session_to_db()
 
-        conn.commit()
+        cursor = create_cursor(conn)
 
-        close_cursor(cursor)
+        sql_product_version = " SELECT md5(string_agg(prod.xmin::text || ':' || store.xmin::text, ',' " \
+                              "                       ORDER BY prod.product_store_id)) AS row_version, " \
+                              "        (max(greatest(prod.last_update_date, store.last_update_date)) " \
+                              "          AT TIME ZONE current_setting('TimeZone')) " \
+                              "          AT TIME ZONE 'UTC' AS last_modified " \
+                              " FROM {} prod " \
+                              " JOIN {} store ON store.id_store = prod.product_store_id " \
+                              " WHERE prod.product_sku = %s{}".format(product_table, store_table, sql_filter)
 
-        product_data_deleted = {
-            "IdProduct": product_id,
-            "SKUProduct": product_sku,
-            "StoreCode": product_store_code,
-            "Message": "Product Deleted Successful",
-        }
+        cursor.execute(sql_product_version, sql_params)
 
-        row_exists = exists_data_row(product_table,
-                                     'product_id',
-                                     'product_id', product_id,
-                                     'product_store_id', product_store_id)
+        product_version = cursor.fetchone()
 
-        if str(product_id) in str(row_exists):
-            product_data_deleted = {
-                "IdProduct": product_id,
-                "SKUProduct": product_sku,
-                "StoreCode": product_store_code,
-                "Message": "Product not Deleted",
-            }
+        close_cursor(cursor)
 
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
         logger.exception('An exception occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
             "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, product_table)
@@ -1487,166 +2384,86 @@ def delete_product_data(product_sku, product_store_code):
     finally:
         disconnect_from_db(conn)
 
-    return json.dumps(product_data_deleted)
+    return {
+        "Version": product_version['row_version'] or 'not-stored',
+        "LastModified": product_version['last_modified'],
+    }
 
 
-# Select all products by sku from db
-def select_by_product_sku(product_sku):
+# Select a page of the products ordered by SKU and store
+@coalesced_read
+def select_products_page(page_size, page_cursor=None, store_code=None, product_columns=None):
     r"""
-    Get all the product data looking for specific sku on database.
-
-    :param product_sku:
-    :return data_product_by_sku: Dictionary that contains all the Product's data by specific SKU.
+    Get a page of the products registered on database with keyset pagination on (SKU, store id), the unique
+    index of the products by store.
+
+    :param page_size: Max number of products of the page.
+    :param page_cursor: Cursor returned as NextCursor by the previous page, None for the first page.
+    :param store_code: Code of the store to list only his products, None for all the stores.
+    :param product_columns: Tuple of columns returned by get_product_projection, None for all the columns.
+    :return data_product_page: Dictionary with the products of the page and the cursor of the next one.
     """
 
     conn = None
     cursor = None
 
-    product_data_by_sku = []
-    data_product_all = dict()
+    product_data_page = []
 
     cfg = Util.get_config_constant_file()
 
+    product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+    store_table = cfg['DB_OBJECTS']['STORE_TABLE']
+
+    sql_filters = []
+    sql_params = []
+
+    if page_cursor is not None:
+        sql_filters.append('(prod.product_sku, prod.product_store_id) > (%s, %s::uuid)')
+        sql_params += decode_page_cursor('product', page_cursor, 2)
+
+    if store_code is not None:
+        sql_filters.append('store.store_code = %s')
+        sql_params.append(store_code)
+
     try:
 
         conn = session_to_db()
 
         cursor = create_cursor(conn)
 
-        product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
-        store_table = cfg['DB_OBJECTS']['STORE_TABLE']
-
-        sql_product_by_sku = " SELECT " \
-                             "   prod.product_id, " \
-                             "   prod.product_sku," \
-                             "   prod.product_unspc," \
-                             "   prod.product_brand," \
-                             "   prod.category_id," \
-                             "   prod.parent_category_id," \
-                             "   prod.unit_of_measure," \
-                             "   prod.product_stock," \
-                             "   store.store_code," \
-                             "   store.store_name" \
-                             "   prod.product_name," \
-                             "   prod.product_title," \
-                             "   prod.product_long_description," \
-                             "   prod.product_photo," \
-                             "   prod.product_price," \
-                             "   prod.product_tax," \
-                             "   prod.product_currency," \
-                             "   prod.product_status," \
-                             "   prod.product_published," \
-                             "   prod.product_manage_stock," \
-                             "   prod.product_length," \
-                             "   prod.product_width," \
-                             "   prod.product_height," \
-                             "   prod.product_weight," \
-                             "   prod.creation_date," \
-                             "   prod.last_update_date" \
-                             " FROM {} prod, {} store " \
-                             " WHERE store.id_store = prod.product_store_id " \
-                             " AND prod.product_sku = %s;".format(product_table, store_table)
+        # Se lee un registro de mas para saber si existe una pagina siguiente
+        sql_products_page = " SELECT prod.product_store_id, {}" \
+                            " FROM {} prod " \
+                            " JOIN {} store ON store.id_store = prod.product_store_id " \
+                            " {} " \
+                            " ORDER BY prod.product_sku, prod.product_store_id " \
+                            " LIMIT %s".format(product_select_list(product_columns),
+                                               product_table,
+                                               store_table,
+                                               'WHERE ' + ' AND '.join(sql_filters) if sql_filters else '')
 
-        cursor.execute(sql_product_by_sku, (product_sku,))
+        cursor.execute(sql_products_page, sql_params + [page_size + 1])
 
         result = cursor.fetchall()
 
-        if result is None:
-            logger.error('Can not read the recordset, because is not stored: %s', product_sku)
-            raise mvc_exc.ItemNotStored(
-                'Can\'t read "{}" because it\'s not stored in table "{}. SQL Exception"'.format(
-                    product_sku, product_table
-                )
-            )
+        for product_data in result[:page_size]:
+            product_data_page += [build_product_data(product_data, product_columns)]
 
-        for product_data in result:
-            if product_data is None:
-                logger.error('Can not read the recordset: {}, '
-                             'because is not stored on table: {}'.format(product_sku, product_table))
-                raise SQLAlchemyError(
-                    "Can\'t read data because it\'s not stored in table {}. SQL Exception".format(product_sku)
-                )
+        close_cursor(cursor)
 
-            product_id = product_data['product_id']
-            sku_product = product_data['product_sku']
-            product_unspc = product_data['product_unspc']
-            product_brand = product_data['product_brand']
-            category_id = product_data['category_id']
-            parent_category_id = product_data['parent_category_id']
-            unit_of_measure = product_data['unit_of_measure']
-            product_stock = product_data['product_stock']
-            product_store_code = product_data['store_code']
-            product_store_name = product_data['store_name']
-            product_name = product_data['product_name']
-            product_title = product_data['product_title']
-            product_long_description = product_data['product_long_description']
-            product_photo = product_data['product_photo']
-            product_price = product_data['product_price']
-            product_tax = product_data['product_tax']
-            product_currency = product_data['product_currency']
-            product_status = product_data['product_status']
-            product_published = product_data['product_published']
-            product_manage_stock = product_data['product_manage_stock']
-            product_length = product_data['product_length']
-            product_width = product_data['product_width']
-            product_height = product_data['product_height']
-            product_weight = product_data['product_weight']
-            fecha_creacion = datetime.strptime(str(product_data['creation_date']), "%Y-%m-%d %H:%M:%S")
-            fecha_actualizacion = datetime.strptime(str(product_data['last_update_date']), "%Y-%m-%d %H:%M:%S")
-
-            logger.info('Van Registered: %s', 'IdProduct: {}, '
-                                              'SKUProduct: {}, '
-                                              'UNSPC: {}, '
-                                              'NameProduct: {}, '
-                                              'TitleProduct: {}, '
-                                              'BrandProduct: {} '.format(product_id,
-                                                                         product_sku,
-                                                                         product_unspc,
-                                                                         product_name,
-                                                                         product_title,
-                                                                         product_brand))
-
-            product_data_by_sku += [{
-                "Product": {
-                    "IdProduct": product_id,
-                    "SKUProduct": sku_product,
-                    "UNSPC": product_unspc,
-                    "NameProduct": product_name,
-                    "TitleProduct": product_title,
-                    "BrandProduct": product_brand,
-                    "UOMProduct": unit_of_measure,
-                    "CategoryIdProduct": category_id,
-                    "ParentCategoryIdProduct": parent_category_id,
-                    "StockProduct": product_stock,
-                    "CodeStore": product_store_code,
-                    "NameStore": product_store_name,
-                    "LongDescriptionProduct": product_long_description,
-                    "PhotoProduct": product_photo,
-                    "Prices": {
-                        "PriceProduct": product_price,
-                        "TaxPriceProduct": product_tax,
-                        "CurrencyPriceProduct": product_currency,
-                    },
-                    "StatusProduct": product_status,
-                    "PublishedProduct": product_published,
-                    "ManageStockProduct": product_manage_stock,
-                    "Volumetry": {
-                        "LengthProduct": product_length,
-                        "WidthProduct": product_width,
-                        "HeightProduct": product_height,
-                        "WeightProduct": product_weight,
-                    },
-                    "CreationDate": fecha_creacion,
-                    "LastUpdateDate": fecha_actualizacion,
-                }
-            }]
+        next_cursor = None
 
-        close_cursor(cursor)
+        if len(result) > page_size:
+            last_product = result[page_size - 1]
+            next_cursor = encode_page_cursor('product', [last_product['product_sku'],
+                                                         str(last_product['product_store_id'])])
 
-        data_product_all = json.dumps(product_data_by_sku)
+        logger.info('Products Page: %s', 'Store: {}, Products: {}, Next page: {}'.format(store_code,
+                                                                                        len(product_data_page),
+                                                                                        next_cursor is not None))
 
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
         logger.exception('An exception occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
             "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, product_table)
@@ -1654,7 +2471,10 @@ def select_by_product_sku(product_sku):
     finally:
         disconnect_from_db(conn)
 
-    return data_product_all
+    return {
+        "Products": product_data_page,
+        "NextCursor": next_cursor,
+    }
 
 
 # Update stock by product sku and store_code
@@ -1680,8 +2500,6 @@ def update_product_store_stock(stock, product_sku, store_code):
 
         cursor = create_cursor(conn)
 
-        last_update_date = get_datenow_from_db()
-
         store_table = cfg['DB_OBJECTS']['STORE_TABLE']
         product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
 
@@ -1694,22 +2512,31 @@ def update_product_store_stock(stock, product_sku, store_code):
                 )
             )
 
-        sql_update_stock = " UPDATE {}" \
-                           " SET	product_stock = %s, " \
-                           "        last_update_date = %s " \
-                           " WHERE product_store_id = (" \
-                           "        SELECT store.id_store " \
-                           "        FROM {} store" \
-                           "        WHERE store.store_code = %s)" \
-                           " AND product_sku = %s".format(product_table, store_table)
+        product_store_id = resolve_store_ids(cursor, [store_code])[store_code]
 
-        cursor.execute(sql_update_stock, (stock, last_update_date, "'" + store_code + "'", "'" + product_sku + "'",))
+        product_dates = None
 
-        conn.commit()
+        if product_store_id is not None:
+            sql_update_stock = " UPDATE {}" \
+                               " SET	product_stock = %s, " \
+                               "        last_update_date = now() " \
+                               " WHERE product_store_id = %s" \
+                               " AND product_sku = %s" \
+                               " RETURNING last_update_date".format(product_table)
 
-        close_cursor(cursor)
+            cursor.execute(sql_update_stock, (stock, product_store_id, product_sku,))
+
+            product_dates = cursor.fetchone()
+
+        last_update_date = str(product_dates['last_update_date']) if product_dates else None
+
+        notify_cache_invalidation(cursor, 'product', [product_sku])
 
-        row_exists = exists_row_registered(store_table, 'store_code', "'" + store_code + "'")
+        commit_session(conn)
+
+        invalidate_product_sku([product_sku])
+
+        close_cursor(cursor)
 
         product_stock_updated = {
             "StoreCode": store_code,
@@ -1719,13 +2546,14 @@ def update_product_store_stock(stock, product_sku, store_code):
             "Message": "Product Stock Updated Successful",
         }
 
-        if not row_exists:
+        # No row returned: the store does not exist or the product is not registered on it
+        if product_dates is None:
             product_stock_updated = {
                 "StoreCode": store_code,
                 "ProductSku": product_sku,
                 "ProductStock": str(stock),
                 "LastUpdateDate": last_update_date,
-                "Message": "Store not exists",
+                "Message": "Store or Product not exists",
             }
 
             logger.error('Can not read the recordset: {}, because is not stored on table: {}'.format(store_code,
@@ -1735,7 +2563,193 @@ def update_product_store_stock(stock, product_sku, store_code):
             )
 
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
+        logger.exception('An exception occurred while execute transaction: %s', error)
+        raise SQLAlchemyError(
+            "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, product_table)
+        )
+    finally:
+        disconnect_from_db(conn)
+
+    return product_stock_updated
+
+
+# Update the stock of many products by store in a single transaction
+def valid_stock_item(product_sku, store_code, stock):
+    r"""
+    Validate an item of the bulk stock update: product_sku and store_code as text, stock as a finite number.
+    """
+
+    if not isinstance(product_sku, str) or not product_sku or not isinstance(store_code, str) or not store_code:
+        return False
+
+    if not isinstance(stock, (int, float)) or isinstance(stock, bool):
+        return False
+
+    return math.isfinite(stock)
+
+
+def update_bulk_product_store_stock(stock_items):
+    r"""
+    Transaction to update the stock/inventory of many products by store registered on database.
+    The store codes are resolved once for the whole batch and the updates are sent by pages
+    with a single UPDATE ... FROM (VALUES ...) statement per page.
+
+    :param stock_items: Iterable of dictionaries with the product_sku, store_code and stock to update.
+    :return product_stock_bulk_updated: The dictionary with the result of each item and the totals.
+    :raise mvc_exc.IntegrityError: If the request has more than STOCK_BULK.MAX_ITEMS items.
+    """
+
+    cfg = Util.get_config_constant_file()
+
+    conn = None
+    cursor = None
+
+    bulk_cfg = cfg.get('STOCK_BULK') or {}
+    page_size = int(bulk_cfg.get('PAGE_SIZE', 1000))
+    max_items = int(bulk_cfg.get('MAX_ITEMS', 100000))
+
+    store_table = cfg['DB_OBJECTS']['STORE_TABLE']
+    product_table = cfg['DB_OBJECTS']['PRODUCT_TABLE']
+
+    stock_results = []
+    store_ids = dict()
+
+    sql_bulk_stock = " UPDATE {} prod" \
+                     " SET product_stock = item.product_stock, " \
+                     "     last_update_date = now() " \
+                     " FROM (VALUES %s) AS item (item_index, product_sku, product_store_id, product_stock)" \
+                     " WHERE prod.product_store_id = item.product_store_id::uuid " \
+                     " AND prod.product_sku = item.product_sku" \
+                     " RETURNING item.item_index, prod.last_update_date".format(product_table)
+
+    # A list is rejected before reading the database, a stream (NDJSON) when the limit is passed
+    if isinstance(stock_items, (list, tuple)) and len(stock_items) > max_items:
+        raise mvc_exc.IntegrityError(
+            'The bulk stock update is limited to {} items per request'.format(max_items)
+        )
+
+    def update_page(page_items):
+        # Store codes not resolved yet on this batch are looking for on the store id cache
+        new_store_codes = {item['store_code'] for item in page_items} - store_ids.keys()
+
+        if new_store_codes:
+            store_ids.update(resolve_store_ids(cursor, new_store_codes))
+
+        # The last item of a product by store on the page is the one applied
+        page_values = dict()
+
+        for item in page_items:
+            result = stock_results[item['index']]
+            store_id = store_ids.get(item['store_code'])
+
+            if store_id is None:
+                result["Message"] = "Store not exists"
+                continue
+
+            previous_index = page_values.get((item['product_sku'], store_id), (None,))[0]
+
+            if previous_index is not None:
+                stock_results[previous_index]["Message"] = "Duplicated item, the last one was applied"
+
+            page_values[(item['product_sku'], store_id)] = (item['index'], item['product_sku'], store_id,
+                                                            item['stock'])
+
+        if not page_values:
+            return
+
+        updated_rows = psycopg2.extras.execute_values(cursor,
+                                                      sql_bulk_stock,
+                                                      list(page_values.values()),
+                                                      template='(%s, %s, %s, %s::numeric)',
+                                                      page_size=page_size,
+                                                      fetch=True)
+
+        for updated_row in updated_rows:
+            result = stock_results[updated_row['item_index']]
+            result["LastUpdateDate"] = str(updated_row['last_update_date'])
+            result["Message"] = "Product Stock Updated Successful"
+
+        for item_index, _, _, _ in page_values.values():
+            if stock_results[item_index]["Message"] is None:
+                stock_results[item_index]["Message"] = "Product not exists in Store"
+
+    try:
+        conn = session_to_db()
+
+        cursor = create_cursor(conn)
+
+        page_items = []
+
+        for item_index, stock_item in enumerate(stock_items):
+
+            if item_index >= max_items:
+                raise mvc_exc.IntegrityError(
+                    'The bulk stock update is limited to {} items per request'.format(max_items)
+                )
+
+            if not isinstance(stock_item, dict):
+                stock_item = dict()
+
+            product_sku = stock_item.get('product_sku')
+            store_code = stock_item.get('store_code')
+            stock = stock_item.get('stock')
+
+            result = {
+                "StoreCode": store_code,
+                "ProductSku": product_sku,
+                "ProductStock": str(stock),
+                "LastUpdateDate": None,
+                "Message": None,
+            }
+
+            stock_results.append(result)
+
+            # Los codigos son llaves de la pagina (hashable), NaN e Infinity los acepta el JSON pero no el stock
+            if not valid_stock_item(product_sku, store_code, stock):
+                result["Message"] = "Invalid item, product_sku, store_code and numeric stock are required"
+                continue
+
+            page_items.append({
+                "index": item_index,
+                "product_sku": product_sku,
+                "store_code": store_code,
+                "stock": stock,
+            })
+
+            if len(page_items) >= page_size:
+                update_page(page_items)
+                page_items = []
+
+        if page_items:
+            update_page(page_items)
+
+        updated_skus = {result["ProductSku"] for result in stock_results if result["LastUpdateDate"] is not None}
+
+        notify_cache_invalidation(cursor, 'product', updated_skus)
+
+        commit_session(conn)
+
+        invalidate_product_sku(updated_skus)
+
+        close_cursor(cursor)
+
+        items_updated = sum(1 for result in stock_results if result["LastUpdateDate"] is not None)
+
+        logger.info('Bulk Stock Updated: %s', 'Items: {}, Updated: {}'.format(len(stock_results), items_updated))
+
+        product_stock_bulk_updated = {
+            "Items": stock_results,
+            "TotalItems": len(stock_results),
+            "UpdatedItems": items_updated,
+            "FailedItems": len(stock_results) - items_updated,
+        }
+
+    except mvc_exc.IntegrityError:
+        rollback_session(conn)
+        raise
+    except (SQLAlchemyError, psycopg2.Error) as error:
+        rollback_session(conn)
         logger.exception('An exception occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
             "A SQL Exception {} occurred while transacting with the database on table {}.".format(error, product_table)
@@ -1743,12 +2757,12 @@ def update_product_store_stock(stock, product_sku, store_code):
     finally:
         disconnect_from_db(conn)
 
-    return json.dumps(product_stock_updated)
+    return product_stock_bulk_updated
 
 
 def select_store_id(store_code):
     r"""
-    Get the store identifier of a Store registered.
+    Get the store identifier of a Store registered, through the store id cache.
 
     :param store_code: Code store to find the Id.
     :return store_id_by_code: Id of the store by his code.
@@ -1763,25 +2777,38 @@ def select_store_id(store_code):
 
     store_table = cfg['DB_OBJECTS']['STORE_TABLE']
 
+    if not Util.validate_store_code_syntax(store_code):
+        logger.error('Can not read the recordset: {}, because the store code is not valid: {}'.format(store_code,
+                                                                                                      store_table))
+        raise mvc_exc.ItemNotStored(
+            'Can\'t read "{}" because it\'s not stored in table "{}. SQL Exception"'.format(
+                store_code, store_table
+            )
+        )
+
+    store_id_cache = get_store_id_cache()
+
+    # Sin conexion a BD si el codigo ya esta en cache
+    store_id_by_code = store_id_cache.get(store_code)
+
+    if store_id_by_code is not MISSING:
+        return store_id_by_code
+
+    # Antes del SELECT: si un escritor invalida el codigo mientras se lee, la lectura no se guarda en cache
+    store_generation = store_id_cache.generation(store_code)
+
     try:
         conn = session_to_db()
 
         cursor = create_cursor(conn)
 
-        if not Util.validate_store_code_syntax(store_code):
-            logger.error('Can not read the recordset: {}, because the store code is not valid: {}'.format(store_code,
-                                                                                                          store_table))
-            raise mvc_exc.ItemNotStored(
-                'Can\'t read "{}" because it\'s not stored in table "{}. SQL Exception"'.format(
-                    store_code, store_table
-                )
-            )
-
         sql_store_id = "SELECT id_store FROM {} WHERE store_code  = %s".format(store_table)
 
         cursor.execute(sql_store_id, (store_code,))
 
-        store_id_by_code = cursor.fetchone()[0]
+        store_row = cursor.fetchone()
+
+        store_id_by_code = str(store_row['id_store']) if store_row else None
 
         if store_id_by_code is None:
             logger.error('Can not read the recordset: {}, '
@@ -1790,10 +2817,14 @@ def select_store_id(store_code):
                 "Can\'t read data because it\'s not stored in table {}. SQL Exception".format(store_table)
             )
 
+        # A transaction that already wrote can be rolled back, his reads are not cached
+        if not _request_session_is_dirty():
+            store_id_cache.put(store_code, store_id_by_code, store_generation)
+
         close_cursor(cursor)
 
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
         logger.exception('An exception occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
             "A SQL Exception {} occurred while transacting with the database on table {}.".format(error,
@@ -1844,7 +2875,7 @@ def select_product_id(product_sku, product_store_id):
         close_cursor(cursor)
 
     except SQLAlchemyError as error:
-        conn.rollback()
+        rollback_session(conn)
         logger.exception('An exception occurred while execute transaction: %s', error)
         raise SQLAlchemyError(
             "A SQL Exception {} occurred while transacting with the database on table {}.".format(error,
@@ -1914,18 +2945,20 @@ def validate_user_exists(user_name):
 
     conn = session_to_db()
 
-    cursor = create_cursor(conn)
+    try:
+        cursor = create_cursor(conn)
 
-    table_name = cfg['DB_AUTH_OBJECT']['USERS_AUTH']
+        table_name = cfg['DB_AUTH_OBJECT']['USERS_AUTH']
 
-    sql_check = "SELECT EXISTS(SELECT 1 FROM {} WHERE username = {} LIMIT 1)".format(table_name, "'" + user_name + "'")
+        sql_check = "SELECT EXISTS(SELECT 1 FROM {} WHERE username = %s LIMIT 1)".format(table_name)
 
-    cursor.execute(sql_check)
+        cursor.execute(sql_check, (user_name,))
 
-    result = cursor.fetchone()
+        result = cursor.fetchone()
 
-    close_cursor(cursor)
-    disconnect_from_db(conn)
+        close_cursor(cursor)
+    finally:
+        disconnect_from_db(conn)
 
     return result
 
@@ -1943,23 +2976,23 @@ def update_user_password_hashed(user_name, password_hash):
 
     conn = session_to_db()
 
-    cursor = create_cursor(conn)
-
-    last_update_date = get_datenow_from_db()
+    try:
+        cursor = create_cursor(conn)
 
-    table_name = cfg['DB_AUTH_OBJECT']['USERS_AUTH']
+        table_name = cfg['DB_AUTH_OBJECT']['USERS_AUTH']
 
-    # update row to database
-    sql_update_user = "UPDATE {} SET password_hash = %s, last_update_date = %s WHERE username = %s".format(
-        table_name
-    )
+        # update row to database
+        sql_update_user = "UPDATE {} SET password_hash = %s, last_update_date = now() WHERE username = %s".format(
+            table_name
+        )
 
-    cursor.execute(sql_update_user, (password_hash, last_update_date, user_name,))
+        cursor.execute(sql_update_user, (password_hash, user_name,))
 
-    conn.commit()
+        commit_session(conn)
 
-    close_cursor(cursor)
-    disconnect_from_db(conn)
+        close_cursor(cursor)
+    finally:
+        disconnect_from_db(conn)
 
 
 def insert_user_authenticated(user_id, user_name, user_password, password_hash):
@@ -1976,25 +3009,26 @@ def insert_user_authenticated(user_id, user_name, user_password, password_hash):
 
     conn = session_to_db()
 
-    cursor = create_cursor(conn)
-
-    last_update_date = get_datenow_from_db()
+    try:
+        cursor = create_cursor(conn)
 
-    table_name = cfg['DB_AUTH_OBJECT']['USERS_AUTH']
+        table_name = cfg['DB_AUTH_OBJECT']['USERS_AUTH']
 
-    data = (user_id, user_name, user_password, password_hash,)
+        data = (user_id, user_name, user_password, password_hash,)
 
-    sql_user_insert = 'INSERT INTO {} (user_id, username, password, password_hash) ' \
-                      'VALUES (%s, %s, %s, %s)'.format(table_name)
+        sql_user_insert = 'INSERT INTO {} ' \
+                          '(user_id, username, password, password_hash, creation_date, last_update_date) ' \
+                          'VALUES (%s, %s, %s, %s, now(), now())'.format(table_name)
 
-    cursor.execute(sql_user_insert, data)
+        cursor.execute(sql_user_insert, data)
 
-    conn.commit()
+        commit_session(conn)
 
-    logger.info('Usuario insertado %s', "{0}, User_Name: {1}".format(user_id, user_name))
+        logger.info('Usuario insertado %s', "{0}, User_Name: {1}".format(user_id, user_name))
 
-    close_cursor(cursor)
-    disconnect_from_db(conn)
+        close_cursor(cursor)
+    finally:
+        disconnect_from_db(conn)
 
 
 # Function not used.
@@ -2032,7 +3066,7 @@ def get_data_user_authentication(session, table_name, user_name):
                     "Can\'t read data because it\'s not stored in table {}. SQL Exception".format(table_name)
                 )
 
-        user_auth_data = json.dumps(user_auth)
+        user_auth_data = user_auth
 
         user_auth_db.close()
 
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Field projection (sparse fieldsets) of the product reads.
+
+Documentation:
+    The request asks for the fields by the names of constants.yml DB_COLUMNS_DATA.PRODUCT_API, by key
+    (PRICE, STOCK) or by column (product_price, product_stock). Only those columns are selected on the
+    query and returned on the response, with the same structure of the full product.
+    The SKU and the store are always returned to identify each product by store.
+    STORE_ID (product_store_id) returns the code and the name of the store.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+
+# Column, group of the response (None on the first level), key of the response. In order of the response.
+PRODUCT_FIELDS = (
+    ('product_id', None, 'IdProduct'),
+    ('product_sku', None, 'SKUProduct'),
+    ('product_unspc', None, 'UNSPC'),
+    ('product_name', None, 'NameProduct'),
+    ('product_title', None, 'TitleProduct'),
+    ('product_brand', None, 'BrandProduct'),
+    ('unit_of_measure', None, 'UOMProduct'),
+    ('category_id', None, 'CategoryIdProduct'),
+    ('parent_category_id', None, 'ParentCategoryIdProduct'),
+    ('product_stock', None, 'StockProduct'),
+    ('store_code', None, 'CodeStore'),
+    ('store_name', None, 'NameStore'),
+    ('product_long_description', None, 'LongDescriptionProduct'),
+    ('product_photo', None, 'PhotoProduct'),
+    ('product_price', 'Prices', 'PriceProduct'),
+    ('product_tax', 'Prices', 'TaxPriceProduct'),
+    ('product_currency', 'Prices', 'CurrencyPriceProduct'),
+    ('product_status', None, 'StatusProduct'),
+    ('product_published', None, 'PublishedProduct'),
+    ('product_manage_stock', None, 'ManageStockProduct'),
+    ('product_length', 'Volumetry', 'LengthProduct'),
+    ('product_width', 'Volumetry', 'WidthProduct'),
+    ('product_height', 'Volumetry', 'HeightProduct'),
+    ('product_weight', 'Volumetry', 'WeightProduct'),
+    ('creation_date', None, 'CreationDate'),
+    ('last_update_date', None, 'LastUpdateDate'),
+)
+
+PRODUCT_COLUMNS = tuple(column_name for column_name, _, _ in PRODUCT_FIELDS)
+
+# Identity of a product by store, returned with any projection
+PRODUCT_KEY_COLUMNS = ('product_sku', 'store_code')
+
+# The store of the product is read from the store table
+_STORE_COLUMNS = {
+    'product_store_id': ('store_code', 'store_name'),
+}
+
+
+def parse_product_fields(fields, product_columns_cfg):
+    r"""
+    Validate the fields requested against the columns of constants.yml.
+
+    :param fields: Names of the fields, as text separated by comma or as list. None or empty for all.
+    :param product_columns_cfg: Mapping DB_COLUMNS_DATA.PRODUCT_API of constants.yml (KEY: column).
+    :return columns: Tuple with the columns in order of the response, None for all the columns.
+    """
+
+    if fields is None:
+        return None
+
+    if isinstance(fields, str):
+        fields = fields.split(',')
+
+    if not isinstance(fields, (list, tuple)) or not all(isinstance(field, str) for field in fields):
+        raise ValueError('The fields must be a list of names: {}'.format(fields))
+
+    fields = [field.strip() for field in fields if field.strip()]
+
+    if not fields:
+        return None
+
+    allowed_fields = dict()
+
+    for field_key, column_name in product_columns_cfg.items():
+        columns = _STORE_COLUMNS.get(column_name, (column_name,))
+
+        if all(column in PRODUCT_COLUMNS for column in columns):
+            allowed_fields[field_key.lower()] = columns
+            allowed_fields[column_name.lower()] = columns
+
+    selected_columns = set(PRODUCT_KEY_COLUMNS)
+
+    for field in fields:
+        columns = allowed_fields.get(field.lower())
+
+        if columns is None:
+            raise ValueError('The field {} is not allowed, use one of: {}'.format(
+                field, ', '.join(sorted(product_columns_cfg.keys()))))
+
+        selected_columns.update(columns)
+
+    return tuple(column_name for column_name in PRODUCT_COLUMNS if column_name in selected_columns)
+
+
+def product_select_list(columns):
+    r"""
+    Build the SELECT list of the columns, the product table has the alias prod and the store table store.
+
+    :param columns: Columns of the projection, None for all.
+    """
+
+    return ', '.join('store.{}'.format(column_name) if column_name in ('store_code', 'store_name')
+                     else 'prod.{}'.format(column_name) for column_name in columns or PRODUCT_COLUMNS)
+
+
+def build_product_data(product_values, columns=None):
+    r"""
+    Build the response of a product with the columns of the projection.
+
+    :param product_values: Mapping column: value, a row of the query or the values of a product cached.
+    :param columns: Columns of the projection, None for all.
+    :return product_data: Dictionary {"Product": {...}}, the groups Prices and Volumetry only if they have fields.
+    """
+
+    columns = set(columns or PRODUCT_COLUMNS)
+
+    product = dict()
+
+    for column_name, group, response_key in PRODUCT_FIELDS:
+        if column_name not in columns:
+            continue
+
+        if group is None:
+            product[response_key] = product_values[column_name]
+        else:
+            product.setdefault(group, dict())[response_key] = product_values[column_name]
+
+    return {"Product": product}
+
+
+def project_product_data(product_data, columns):
+    r"""
+    Narrow a full product response (as cached) to the columns of the projection.
+    """
+
+    product = product_data["Product"]
+
+    product_values = {column_name: product[group][response_key] if group else product[response_key]
+                      for column_name, group, response_key in PRODUCT_FIELDS if column_name in columns}
+
+    return build_product_data(product_values, columns)
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+In-memory cache by process for the lookups of the backend.
+
+Documentation:
+    - Bounded: the least recently used entries are evicted when the cache is full, by number of entries
+      and optionally by the memory used by the cached values.
+    - TTL: the entries expire after a number of seconds, even if they are not invalidated.
+    - Explicit invalidation by key or of the whole cache after the writes.
+    - Generation by key: a reader takes generation(key) before his query and passes it to put(), the value
+      is dropped if the key was invalidated meanwhile, so a read older than a write is never cached.
+    - Hit, miss, eviction and invalidation counters.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import collections
+import sys
+import threading
+import time
+
+
+# Returned by get() when the key is not cached, None can be a cached value
+MISSING = object()
+
+
+def deep_sizeof(value):
+    r"""
+    Estimate the memory used by a value with his nested dictionaries, lists and tuples.
+    sys.getsizeof only counts the container, not the values that it contains.
+
+    :param value: Value to measure.
+    :return size: Size in bytes.
+    """
+
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(deep_sizeof(key) + deep_sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(deep_sizeof(item) for item in value)
+
+    return size
+
+
+class LookupCache:
+    r"""
+    Thread-safe LRU cache with time to live.
+    """
+
+    def __init__(self, name, max_entries=10000, ttl=300.0, max_bytes=None, sizeof=sys.getsizeof):
+        r"""
+        :param name: Name of the cache on the stats.
+        :param max_entries: Max number of keys kept, the least recently used are evicted.
+        :param ttl: Seconds that an entry is valid after it is stored.
+        :param max_bytes: Max size of the cached values, None to bound the cache only by max_entries.
+        :param sizeof: Function to get the size in bytes of a value, called once when it is stored.
+        """
+
+        if max_entries < 1 or (max_bytes is not None and max_bytes < 1):
+            raise ValueError('Invalid cache size: max_entries={}, max_bytes={}'.format(max_entries, max_bytes))
+
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+
+        self._sizeof = sizeof
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+
+        # Generation of the last invalidation by key, and of the last clear for all the keys
+        self._generation = 0
+        self._cleared_generation = 0
+        self._key_generations = dict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._stale_puts = 0
+
+    def get(self, key):
+        r"""
+        Get the cached value of a key.
+
+        :param key: Key to looking for.
+        :return value: The cached value or MISSING if it is not cached or it is expired.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._misses += 1
+                return MISSING
+
+            value, expires_at, size = entry
+
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self._misses += 1
+                return MISSING
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+
+            return value
+
+    def generation(self, key):
+        r"""
+        Get the generation of a key, taken by a reader before his query and passed to put().
+        """
+
+        with self._lock:
+            return self._get_generation(key)
+
+    def _get_generation(self, key):
+        return max(self._cleared_generation, self._key_generations.get(key, 0))
+
+    def put(self, key, value, generation=None):
+        r"""
+        Store the value of a key, evicting the least recently used keys if the cache is full.
+
+        :param generation: Generation of the key before the value was read, the value is not stored if the
+                           key was invalidated after it. None to store it always.
+        """
+
+        size = self._sizeof(value) if self.max_bytes is not None else 0
+
+        # A value bigger than the whole cache would evict everything and then itself
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.invalidate(key)
+            return
+
+        with self._lock:
+            if generation is not None and generation != self._get_generation(key):
+                self._stale_puts += 1
+                return
+
+            previous_entry = self._entries.pop(key, None)
+
+            if previous_entry is not None:
+                self._bytes -= previous_entry[2]
+
+            self._entries[key] = (value, time.monotonic() + self.ttl, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or \
+                    (self.max_bytes is not None and self._bytes > self.max_bytes):
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def invalidate(self, key):
+        r"""
+        Remove a key of the cache, the next get() reads it again from the database.
+        """
+
+        with self._lock:
+            entry = self._entries.pop(key, None)
+
+            if entry is not None:
+                self._bytes -= entry[2]
+                self._invalidations += 1
+
+            self._generation += 1
+            self._key_generations[key] = self._generation
+
+            # Bounded: forgetting the keys is the same of a clear for the readers in flight
+            if len(self._key_generations) > self.max_entries:
+                self._cleared_generation = self._generation
+                self._key_generations.clear()
+
+    def clear(self):
+        r"""
+        Remove all the keys of the cache.
+        """
+
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+
+            self._generation += 1
+            self._cleared_generation = self._generation
+            self._key_generations.clear()
+
+    def stats(self):
+        r"""
+        Get the usage counters of the cache since the process started.
+
+        :return stats: Dictionary with the size, hits, misses, evictions, invalidations and stale puts dropped.
+        """
+
+        with self._lock:
+            lookups = self._hits + self._misses
+
+            return {
+                "Name": self.name,
+                "Entries": len(self._entries),
+                "MaxEntries": self.max_entries,
+                "Bytes": self._bytes if self.max_bytes is not None else None,
+                "MaxBytes": self.max_bytes,
+                "TTL": self.ttl,
+                "Hits": self._hits,
+                "Misses": self._misses,
+                "HitRatio": round(self._hits / lookups, 4) if lookups else None,
+                "Evictions": self._evictions,
+                "Invalidations": self._invalidations,
+                "StalePuts": self._stale_puts,
+            }
+
+    def reset_after_fork(self):
+        r"""
+        Replace the lock in the child after a fork, it could be held by a thread of the parent.
+        """
+
+        self._lock = threading.Lock()
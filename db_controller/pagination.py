@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Keyset (seek) pagination of the listings.
+
+Documentation:
+    The pages are ordered by a unique key on an index, the next page is read with WHERE key > last key
+    of the previous page, so a deep page costs the same of the first one (OFFSET reads and discards
+    all the previous rows).
+    The last key is returned to the client as an opaque cursor: URL-safe base64 of a JSON document with
+    the listing name, so a cursor of a listing is rejected by the others.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import base64
+import binascii
+import json
+
+
+def encode_page_cursor(listing, key_values):
+    r"""
+    Build the opaque cursor of the next page.
+
+    :param listing: Name of the listing ('store' or 'product').
+    :param key_values: List with the values of the key of the last row of the page.
+    :return cursor: Text of the cursor.
+    """
+
+    cursor_data = json.dumps({"l": listing, "k": list(key_values)}, separators=(',', ':'))
+
+    return base64.urlsafe_b64encode(cursor_data.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_page_cursor(listing, page_cursor, key_length):
+    r"""
+    Read the key of the last row of the previous page from his cursor.
+
+    :param listing: Name of the listing that receives the cursor.
+    :param page_cursor: Text of the cursor returned by the previous page.
+    :param key_length: Number of columns of the key.
+    :return key_values: List with the values of the key.
+    """
+
+    try:
+        cursor_data = base64.urlsafe_b64decode(page_cursor + '=' * (-len(page_cursor) % 4))
+        cursor_data = json.loads(cursor_data.decode('utf-8'))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError('Invalid page cursor: {}'.format(page_cursor))
+
+    if not isinstance(cursor_data, dict) or cursor_data.get('l') != listing:
+        raise ValueError('The page cursor does not belong to the {} listing'.format(listing))
+
+    key_values = cursor_data.get('k')
+
+    if not isinstance(key_values, list) or len(key_values) != key_length or \
+            not all(isinstance(value, str) for value in key_values):
+        raise ValueError('Invalid page cursor: {}'.format(page_cursor))
+
+    return key_values
+
+
+def get_page_size(page_size, default_page_size, max_page_size):
+    r"""
+    Validate the page size requested.
+
+    :param page_size: Page size of the request as text, None to use the default.
+    :return page_size: Number of rows of the page, between 1 and max_page_size.
+    """
+
+    if page_size is None or page_size == '':
+        return default_page_size
+
+    try:
+        page_size = int(page_size)
+    except ValueError:
+        raise ValueError('Invalid page size: {}'.format(page_size))
+
+    if page_size < 1 or page_size > max_page_size:
+        raise ValueError('The page size must be between 1 and {}: {}'.format(max_page_size, page_size))
+
+    return page_size
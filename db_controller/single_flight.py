@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Single-flight of the reads of the backend by process.
+
+Documentation:
+    The concurrent calls with the same key share one execution: the first call (leader) runs the query,
+    the others wait for it and receive the same result or the same exception. The calls after the leader
+    ends run a new query, nothing is cached here.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import collections
+import threading
+
+
+class _Flight:
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def flight_key(name, args):
+    r"""
+    Build a hashable key of a call, the lists of the arguments (SKU, store codes) are converted to tuples.
+    """
+
+    return (name,) + tuple(tuple(arg) if isinstance(arg, (list, set)) else arg for arg in args)
+
+
+class SingleFlight:
+    r"""
+    Thread-safe coalescing of the concurrent identical calls.
+    """
+
+    def __init__(self, max_tracked_keys=1000):
+        r"""
+        :param max_tracked_keys: Max number of keys with counters, the least recently called are dropped.
+        """
+
+        self.max_tracked_keys = max_tracked_keys
+
+        self._lock = threading.Lock()
+        self._flights = dict()
+        self._counters = collections.OrderedDict()
+
+        self._calls = 0
+        self._executions = 0
+        self._collapsed = 0
+
+    def do(self, key, function, *args):
+        r"""
+        Run function(*args), or wait for the execution in flight with the same key.
+
+        :param key: Hashable key of the call, see flight_key.
+        :param function: Function to run if there is no execution in flight.
+        :return result: Result of the execution shared by all the concurrent calls.
+        """
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+
+            if leader:
+                flight = _Flight()
+                self._flights[key] = flight
+
+            self._count(key, leader)
+
+        if not leader:
+            flight.done.wait()
+
+            if flight.error is not None:
+                raise flight.error
+
+            return flight.result
+
+        try:
+            flight.result = function(*args)
+            return flight.result
+
+        except BaseException as error:
+            flight.error = error
+            raise
+
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+            flight.done.set()
+
+    def stats(self, top=20):
+        r"""
+        Get the counters of the calls, in total and of the keys with more calls collapsed.
+
+        :param top: Number of keys returned.
+        :return stats: Dictionary with the totals and the counters by key.
+        """
+
+        with self._lock:
+            keys_collapsed = sorted(self._counters.items(), key=lambda item: item[1][2], reverse=True)[:top]
+
+            return {
+                "Calls": self._calls,
+                "Executions": self._executions,
+                "Collapsed": self._collapsed,
+                "InFlight": len(self._flights),
+                "Keys": [{
+                    "Key": ':'.join(str(part) for part in key),
+                    "Calls": calls,
+                    "Executions": executions,
+                    "Collapsed": collapsed,
+                } for key, (calls, executions, collapsed) in keys_collapsed],
+            }
+
+    def reset_after_fork(self):
+        r"""
+        Forget the executions in flight of the parent, his threads do not exist on the child.
+        """
+
+        self._lock = threading.Lock()
+        self._flights = dict()
+
+    def _count(self, key, leader):
+        # Must be called holding the lock
+        self._calls += 1
+
+        if leader:
+            self._executions += 1
+        else:
+            self._collapsed += 1
+
+        calls, executions, collapsed = self._counters.pop(key, (0, 0, 0))
+
+        self._counters[key] = (calls + 1, executions + int(leader), collapsed + int(not leader))
+
+        while len(self._counters) > self.max_tracked_keys:
+            self._counters.popitem(last=False)
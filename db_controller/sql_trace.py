@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Trace of the SQL statements executed by the backend.
+
+Documentation:
+    - It is enabled on constants.yml (SQL_TRACE.ENABLED), the connections of the pool are opened with a
+      cursor factory that traces a sample (SAMPLE_RATE) of the statements: statement, parameters, duration
+      and rowcount, written to his own logger and log file.
+    - Disabled, the connections use the DictCursor of psycopg2 without any wrapper, so it costs nothing.
+    - The parameters are redacted by default, only the type (and length of the text) of each one is
+      written, the literal strings and numbers of the statement are replaced too.
+    - The cursor factory is chosen when the connection pool is created: a change of SQL_TRACE needs a
+      restart of the process.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import random
+import re
+import time
+from collections.abc import Mapping
+
+import psycopg2.extras
+
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$.])\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r'\s+')
+
+
+def redact_value(value):
+    r"""
+    Replace a parameter by his type, the text and bytes keep only their length.
+    """
+
+    if value is None:
+        return None
+
+    if isinstance(value, (str, bytes)):
+        return '<{}:{}>'.format(type(value).__name__, len(value))
+
+    return '<{}>'.format(type(value).__name__)
+
+
+def redact_params(params):
+    r"""
+    Redact the parameters of a statement, as sequence or as mapping (named placeholders).
+    """
+
+    if params is None:
+        return None
+
+    if isinstance(params, Mapping):
+        return {name: redact_value(value) for name, value in params.items()}
+
+    if isinstance(params, (list, tuple)):
+        return [redact_params(value) if isinstance(value, (list, tuple)) else redact_value(value)
+                for value in params]
+
+    return redact_value(params)
+
+
+def redact_statement(statement):
+    r"""
+    Replace the literal strings and numbers written on the statement (the ones that are not parameters).
+    """
+
+    statement = _STRING_LITERAL.sub("'?'", statement)
+
+    return _NUMBER_LITERAL.sub('?', statement)
+
+
+class SqlTracer:
+    r"""
+    Settings of the trace and the writer of his records.
+    """
+
+    def __init__(self, logger, sample_rate=1.0, redact=True, max_statement_length=2000):
+        r"""
+        :param logger: Logger of the trace, his own sink.
+        :param sample_rate: Fraction of the statements traced, between 0 and 1.
+        :param redact: Redact the parameters and the literals of the statement.
+        :param max_statement_length: Max characters of the statement on the record.
+        """
+
+        self.logger = logger
+        self.sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+        self.redact = redact
+        self.max_statement_length = max_statement_length
+
+    def sampled(self):
+        return self.sample_rate >= 1.0 or random.random() < self.sample_rate
+
+    def trace(self, statement, params, duration, rowcount, error=None):
+        r"""
+        Write the record of a statement.
+
+        :param statement: SQL, as text or bytes (composed statements, mogrify).
+        :param duration: Seconds of the execution.
+        :param error: Exception raised by the statement, None if it ended ok.
+        """
+
+        if isinstance(statement, bytes):
+            statement = statement.decode('utf-8', 'replace')
+        elif not isinstance(statement, str):
+            # psycopg2.sql.Composed, it needs the connection to be rendered
+            statement = repr(statement)
+
+        statement = _WHITESPACE.sub(' ', statement).strip()
+
+        if self.redact:
+            statement = redact_statement(statement)
+            params = redact_params(params)
+
+        if len(statement) > self.max_statement_length:
+            statement = statement[:self.max_statement_length] + '...'
+
+        self.logger.info('SQL: %s | Params: %s | Duration: %.3f ms | Rows: %s | Error: %s', statement, params,
+                         duration * 1000, rowcount, type(error).__name__ if error is not None else None)
+
+
+def build_traced_cursor_factory(tracer, cursor_class=psycopg2.extras.DictCursor):
+    r"""
+    Build a cursor class that traces his sampled statements.
+
+    :param tracer: SqlTracer of the records.
+    :param cursor_class: Cursor class of the connections without trace.
+    :return cursor_factory: Subclass of cursor_class for psycopg2.connect(cursor_factory=...).
+    """
+
+    class TracedCursor(cursor_class):
+
+        def execute(self, query, vars=None):
+            if not tracer.sampled():
+                return super().execute(query, vars)
+
+            start = time.perf_counter()
+
+            try:
+                result = super().execute(query, vars)
+            except Exception as error:
+                tracer.trace(query, vars, time.perf_counter() - start, None, error)
+                raise
+
+            tracer.trace(query, vars, time.perf_counter() - start, self.rowcount)
+
+            return result
+
+        def executemany(self, query, vars_list):
+            if not tracer.sampled():
+                return super().executemany(query, vars_list)
+
+            vars_list = list(vars_list)
+            start = time.perf_counter()
+
+            try:
+                result = super().executemany(query, vars_list)
+            except Exception as error:
+                tracer.trace(query, vars_list, time.perf_counter() - start, None, error)
+                raise
+
+            tracer.trace(query, vars_list, time.perf_counter() - start, self.rowcount)
+
+            return result
+
+    TracedCursor.__name__ = 'Traced{}'.format(cursor_class.__name__)
+    TracedCursor.__qualname__ = TracedCursor.__name__
+
+    return TracedCursor
@@ -63,9 +63,9 @@ CREATE TABLE cargamos.store_api (
 	creation_date timestamp(0) NULL DEFAULT now(), -- Fecha de creacion de la tienda
 	last_update_date timestamp(0) NULL DEFAULT now(),
 	CONSTRAINT store_api_pk PRIMARY KEY (id_store),
-	CONSTRAINT store_api_un UNIQUE (id_store, store_code)
+	CONSTRAINT store_api_un UNIQUE (id_store, store_code),
+	CONSTRAINT store_api_code_un UNIQUE (store_code)
 );
-CREATE INDEX store_api_store_code_idx ON cargamos.store_api USING btree (store_code);
 COMMENT ON TABLE cargamos.store_api IS 'Contiene informacion de una tienda';
 
 -- Column comments
@@ -85,6 +85,7 @@ COMMENT ON COLUMN cargamos.store_api.creation_date IS 'Fecha de creacion de la t
 -- Constraint comments
 
 COMMENT ON CONSTRAINT store_api_pk ON cargamos.store_api IS 'Llave primaria de la tienda';
+COMMENT ON CONSTRAINT store_api_code_un ON cargamos.store_api IS 'Codigo de tienda unico, llave del UPSERT de tiendas';
 
 -- Permissions
 
@@ -157,6 +158,7 @@ CREATE TABLE cargamos.product_api (
 	CONSTRAINT product_api_check CHECK (((product_status)::text = ANY (ARRAY[('Activo'::character varying)::text, ('Inactivo'::character varying)::text]))),
 	CONSTRAINT product_api_pk PRIMARY KEY (product_id),
 	CONSTRAINT product_api_un UNIQUE (product_id, product_sku, product_unspc),
+	CONSTRAINT product_api_sku_store_un UNIQUE (product_sku, product_store_id),
 	CONSTRAINT product_api_fk FOREIGN KEY (product_store_id) REFERENCES cargamos.store_api(id_store) ON UPDATE CASCADE ON DELETE CASCADE
 );
 COMMENT ON TABLE cargamos.product_api IS 'Contiene informacion por producto por tienda';
@@ -189,6 +191,10 @@ COMMENT ON COLUMN cargamos.product_api.product_weight IS 'Peso del producto en G
 COMMENT ON COLUMN cargamos.product_api.creation_date IS 'Fecha de creacion del producto';
 COMMENT ON COLUMN cargamos.product_api.last_update_date IS 'Fecha de actualizacion del producto';
 
+-- Constraint comments
+
+COMMENT ON CONSTRAINT product_api_sku_store_un ON cargamos.product_api IS 'SKU unico por tienda, llave del UPSERT de productos';
+
 -- Permissions
 
 ALTER TABLE cargamos.product_api OWNER TO postgres;
@@ -200,3 +206,10 @@ GRANT ALL ON TABLE cargamos.product_api TO postgres;
 -- Permissions
 
 GRANT ALL ON SCHEMA cargamos TO postgres;
+
+
+-- Migration for databases created before the UPSERT of stores and products
+
+-- ALTER TABLE cargamos.store_api ADD CONSTRAINT store_api_code_un UNIQUE (store_code);
+-- DROP INDEX cargamos.store_api_store_code_idx;
+-- ALTER TABLE cargamos.product_api ADD CONSTRAINT product_api_sku_store_un UNIQUE (product_sku, product_store_id);
@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Asynchronous logging: the loggers put the records on a bounded queue and a writer thread sends them to the
+file and stream handlers, so a request does not wait for the disk or stdout.
+
+Documentation:
+    Policy when the queue is full (LOG_RESOURCE.ASYNC.FULL_POLICY):
+        - 'drop': the records under WARNING are dropped and counted, the WARNING and above wait for
+          space up to BLOCK_TIMEOUT seconds (and then are dropped too).
+        - 'block': all the records wait for space up to BLOCK_TIMEOUT seconds.
+    The number of dropped records is logged as a warning when the queue has space again.
+    The queue is flushed to the handlers at the exit of the process.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+
+FULL_POLICIES = ('drop', 'block')
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    r"""
+    QueueHandler with a bounded queue and a policy for the records that do not fit.
+    """
+
+    def __init__(self, log_queue, full_policy='drop', block_timeout=1.0):
+        r"""
+        :param log_queue: queue.Queue with maxsize.
+        :param full_policy: 'drop' or 'block', see the documentation of the module.
+        :param block_timeout: Max seconds that a record waits for space on the queue.
+        """
+
+        if full_policy not in FULL_POLICIES:
+            raise ValueError('Invalid policy: {}, use one of {}'.format(full_policy, FULL_POLICIES))
+
+        super().__init__(log_queue)
+
+        self.full_policy = full_policy
+        self.block_timeout = block_timeout
+
+        self._dropped_lock = threading.Lock()
+        self._dropped = 0
+        self._dropped_pending = 0
+
+    def enqueue(self, record):
+        self._report_dropped(record)
+
+        try:
+            if self.full_policy == 'drop' and record.levelno < logging.WARNING:
+                self.queue.put_nowait(record)
+            else:
+                self.queue.put(record, timeout=self.block_timeout)
+
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped += 1
+                self._dropped_pending += 1
+
+    def _report_dropped(self, record):
+        if not self._dropped_pending:
+            return
+
+        with self._dropped_lock:
+            dropped_pending, self._dropped_pending = self._dropped_pending, 0
+
+        warning = logging.LogRecord(record.name, logging.WARNING, __file__, 0,
+                                    '%s log records dropped, the log queue was full', (dropped_pending,), None)
+
+        try:
+            self.queue.put_nowait(warning)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped_pending += dropped_pending
+
+    @property
+    def dropped(self):
+        return self._dropped
+
+
+class BoundedQueueListener(logging.handlers.QueueListener):
+    r"""
+    QueueListener that waits for space to enqueue his stop sentinel, the queue can be full at the exit.
+    """
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class AsyncLogPipeline:
+    r"""
+    Bounded queue, his handler for the loggers and the writer thread of the handlers.
+    """
+
+    def __init__(self, handlers, queue_size=10000, full_policy='drop', block_timeout=1.0):
+        r"""
+        :param handlers: Handlers (file, stream) called from the writer thread.
+        :param queue_size: Max records waiting to be written.
+        """
+
+        self.handlers = tuple(handlers)
+        self.queue_size = queue_size
+
+        self.queue_handler = BoundedQueueHandler(queue.Queue(queue_size), full_policy, block_timeout)
+
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._listener is None:
+                # Each handler applies his own level, not only the level of the logger
+                self._listener = BoundedQueueListener(self.queue_handler.queue, *self.handlers,
+                                                      respect_handler_level=True)
+                self._listener.start()
+
+    def stop(self):
+        r"""
+        Write all the records of the queue and stop the writer thread.
+        """
+
+        with self._lock:
+            listener, self._listener = self._listener, None
+
+        if listener is not None:
+            listener.stop()
+
+        for handler in self.handlers:
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                # The stream can be closed already at the exit of the process
+                pass
+
+    def stats(self):
+        return {
+            "QueueSize": self.queue_size,
+            "Queued": self.queue_handler.queue.qsize(),
+            "Dropped": self.queue_handler.dropped,
+            "Running": self._listener is not None,
+        }
+
+    def reset_after_fork(self):
+        r"""
+        The writer thread of the parent does not exist on the child, it starts his own with a new queue.
+        """
+
+        self._lock = threading.Lock()
+        self._listener = None
+        self.queue_handler.queue = queue.Queue(self.queue_size)
+        self.start()
+
+
+_pipelines = []
+_pipelines_lock = threading.Lock()
+
+
+def start_async_pipeline(handlers, queue_size=10000, full_policy='drop', block_timeout=1.0):
+    r"""
+    Start a pipeline for some handlers, it is stopped (flushed) at the exit of the process.
+
+    :return pipeline: AsyncLogPipeline, his queue_handler is the one to add to the logger.
+    """
+
+    pipeline = AsyncLogPipeline(handlers, queue_size, full_policy, block_timeout)
+    pipeline.start()
+
+    with _pipelines_lock:
+        _pipelines.append(pipeline)
+
+    return pipeline
+
+
+def stop_async_pipelines():
+    r"""
+    Flush and stop all the pipelines of the process.
+    """
+
+    with _pipelines_lock:
+        pipelines = list(_pipelines)
+
+    for pipeline in pipelines:
+        pipeline.stop()
+
+
+def get_async_pipelines_stats():
+    with _pipelines_lock:
+        return [pipeline.stats() for pipeline in _pipelines]
+
+
+def _reset_pipelines_after_fork():
+    global _pipelines_lock
+
+    _pipelines_lock = threading.Lock()
+
+    for pipeline in _pipelines:
+        pipeline.reset_after_fork()
+
+
+atexit.register(stop_async_pipelines)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_pipelines_after_fork)
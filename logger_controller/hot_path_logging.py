@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Logging of the hot paths: the loops over the rows of a query.
+
+Documentation:
+    - Each call site (the name of the read function) has a sample rate, the fraction of his rows that
+      are logged (LOG_RESOURCE.HOT_PATH.SAMPLE_RATES). 0 logs no rows, 1 logs all of them.
+    - The rows are logged at ROW_LEVEL (DEBUG by default). If the level is filtered out or the rate is 0
+      the row costs only a check of a boolean: the message is formatted by the logging module only when
+      a record is written, never on the loop.
+    - Instead of a line by row, each query logs one summary with the rows read and his duration.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import logging
+import random
+import time
+
+
+class HotPathLog:
+    r"""
+    Log of one execution of a call site: his sampled rows and the summary of the query.
+    """
+
+    def __init__(self, logger, call_site, sample_rate=0.0, row_level=logging.DEBUG, summary=True):
+        r"""
+        :param logger: Logger of the call site.
+        :param call_site: Name of the call site, it is on the summary.
+        :param sample_rate: Fraction of the rows logged, between 0 and 1.
+        :param row_level: Level of the rows logged.
+        :param summary: Log the summary of the query at INFO.
+        """
+
+        self.logger = logger
+        self.call_site = call_site
+        self.sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+        self.row_level = row_level
+
+        # Resolved once by query, not by row
+        self.rows_enabled = self.sample_rate > 0.0 and logger.isEnabledFor(row_level)
+        self.summary_enabled = summary and logger.isEnabledFor(logging.INFO)
+
+        self.rows_logged = 0
+        self._start = time.perf_counter()
+
+    def row(self, msg, *args):
+        r"""
+        Log a row if it is sampled, the args are formatted only if the record is written.
+        """
+
+        if not self.rows_enabled:
+            return
+
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+
+        self.rows_logged += 1
+        self.logger.log(self.row_level, msg, *args, stacklevel=2)
+
+    def summary(self, rowcount, key=None):
+        r"""
+        Log the rows read by the query and his duration since this log was created.
+
+        :param rowcount: Rows read by the query.
+        :param key: Value looked for (SKU, store code), to identify the query.
+        """
+
+        if not self.summary_enabled:
+            return
+
+        self.logger.info('Query %s: Key: %s, Rows: %s, Rows logged: %s, Duration: %.3f ms', self.call_site, key,
+                         rowcount, self.rows_logged, (time.perf_counter() - self._start) * 1000, stacklevel=2)
+
+
+def get_hot_path_log(logger, call_site, hot_path_cfg=None):
+    r"""
+    Build the log of a call site with the settings of constants.yml.
+
+    :param hot_path_cfg: Mapping LOG_RESOURCE.HOT_PATH of constants.yml, None for the defaults
+                         (no rows logged, only the summary).
+    """
+
+    hot_path_cfg = hot_path_cfg or {}
+    sample_rates = hot_path_cfg.get('SAMPLE_RATES') or {}
+
+    sample_rate = sample_rates.get(call_site, sample_rates.get('DEFAULT', 0.0))
+    row_level = logging.getLevelName(str(hot_path_cfg.get('ROW_LEVEL', 'DEBUG')).upper())
+
+    if not isinstance(row_level, int):
+        raise ValueError('Invalid ROW_LEVEL: {}'.format(hot_path_cfg.get('ROW_LEVEL')))
+
+    return HotPathLog(logger, call_site, sample_rate, row_level, bool(hot_path_cfg.get('SUMMARY', True)))
@@ -14,7 +14,9 @@ import errno
 import logging
 import os
 import sys
-from constants.constants import Constants as const
+import threading
+from constants.constants import Constants as const, get_settings
+from logger_controller.async_logging import start_async_pipeline
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
 
@@ -22,6 +24,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 # LOG_LEVEL = logging.DEBUG
 
 
+# Loggers configured on this process by name, each one gets a single set of handlers
+_configured_loggers = dict()
+_configured_loggers_lock = threading.Lock()
+
+
 # Para LOG de cliente BD:
 def configure_db_logging(log_name, path_to_log_directory):
     """
@@ -31,39 +38,23 @@ def configure_db_logging(log_name, path_to_log_directory):
     :return:
     """
 
-    cfg = get_config_constant_file()
-
-    # log_filename = log_name + datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S') + '.log'
-    _date_name = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M')
-    log_filename = log_name + _date_name + 'hr' + cfg['LOG_RESOURCE']['FILE_EXTENSION']
-    _importer_logger = logging.getLogger('db')
-    _importer_logger.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(asctime)s - Module: %(module)s - Line No: %(lineno)s : %(name)s : %(levelname)s - '
-                                  '%(message)s')
-
-    fh = logging.FileHandler(filename=os.path.join(path_to_log_directory, log_filename), mode='w+',
-                             encoding='utf-8', delay=False)
-    fh.setLevel(logging.DEBUG)
-    fh.setFormatter(formatter)
-    # fh.addFilter(type('', (logging.Filter,), {'filter': staticmethod(lambda r: r.levelno <= logging.INFO)}))
-    _importer_logger.addHandler(fh)
+    return configure_named_logging('db', log_name, path_to_log_directory)
 
-    # _importer_logger = logging.basicConfig(filename=os.path.join(path_to_log_directory, log_filename),
-    #                                        filemode='w+', format=formatter, level=logging.DEBUG)
 
-    sh = logging.StreamHandler(sys.stdout)
-    sh.setLevel(logging.DEBUG)
-    sh.setFormatter(formatter)
-    # sh.addFilter(type('', (logging.Filter,), {'filter': staticmethod(lambda r: r.levelno <= logging.INFO)}))
-    _importer_logger.addHandler(sh)
-
-    create_directory_if_not_exists(_importer_logger, path_to_log_directory)
+# Para LOG del WS:
+def configure_ws_logging(log_name, path_to_log_directory):
+    """
+    Configure logger
+    :param log_name:
+    :param path_to_log_directory:  path to directory to write log file in
+    :return:
+    """
 
-    return _importer_logger
+    return configure_named_logging('api', log_name, path_to_log_directory)
 
 
-# Para LOG del WS:
-def configure_ws_logging(log_name, path_to_log_directory):
+# Para App Principal
+def configure_logging(log_name, path_to_log_directory):
     """
     Configure logger
     :param log_name:
@@ -71,77 +62,90 @@ def configure_ws_logging(log_name, path_to_log_directory):
     :return:
     """
 
-    cfg = get_config_constant_file()
+    return configure_named_logging('root', log_name, path_to_log_directory)
 
-    # log_filename = log_name + datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S') + '.log'
-    _date_name = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M')
-    log_filename = log_name + _date_name + 'hr' + cfg['LOG_RESOURCE']['FILE_EXTENSION']
 
-    _importer_logger = logging.getLogger('api')
-    _importer_logger.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(asctime)s - Module: %(module)s - Line No: %(lineno)s : %(name)s : %(levelname)s - '
-                                  '%(message)s')
+def configure_named_logging(logger_name, log_name, path_to_log_directory, to_stdout=True, log_format=None):
+    """
+    Configure the file and stream handlers of a logger only once by process, the next calls with the
+    same logger name (one by module that imports it) return the logger already configured
+    :param logger_name:            name of the logger ('api', 'db', 'root')
+    :param log_name:               prefix of the log file
+    :param path_to_log_directory:  path to directory to write log file in
+    :param to_stdout:              write the records on stdout too, not only on the log file
+    :param log_format:             format of the records, None for the format of the module and line
+    :return:  the logger
+    """
+
+    _importer_logger = logging.getLogger(logger_name)
+
+    with _configured_loggers_lock:
+        if logger_name in _configured_loggers:
+            return _importer_logger
+
+        cfg = get_config_constant_file()
+
+        # log_filename = log_name + datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S') + '.log'
+        _date_name = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M')
+        log_filename = log_name + _date_name + 'hr' + cfg['LOG_RESOURCE']['FILE_EXTENSION']
+
+        # DEBUG writes the payloads of the requests and responses too
+        _importer_logger.setLevel(str(cfg['LOG_RESOURCE'].get('LEVEL', 'DEBUG')).upper())
+        # The handlers of the logger write the record, not again the handlers of the root logger
+        _importer_logger.propagate = False
+        formatter = logging.Formatter(log_format or '%(asctime)s - Module: %(module)s - Line No: %(lineno)s : '
+                                                    '%(name)s : %(levelname)s - %(message)s')
+
+        create_directory_if_not_exists(_importer_logger, path_to_log_directory)
+
+        fh = logging.FileHandler(filename=os.path.join(path_to_log_directory, log_filename), mode='w+',
+                                 encoding='utf-8', delay=False)
+        fh.setLevel(logging.DEBUG)
+        fh.setFormatter(formatter)
+        # fh.addFilter(type('', (logging.Filter,), {'filter': staticmethod(lambda r: r.levelno <= logging.INFO)}))
 
-    fh = logging.FileHandler(filename=os.path.join(path_to_log_directory, log_filename), mode='w+',
-                             encoding='utf-8', delay=False)
+        # _importer_logger = logging.basicConfig(filename=os.path.join(path_to_log_directory, log_filename),
+        #                                        filemode='w+', format=formatter, level=logging.DEBUG)
 
-    fh.setLevel(logging.DEBUG)
-    fh.setFormatter(formatter)
-    # fh.addFilter(type('', (logging.Filter,), {'filter': staticmethod(lambda r: r.levelno <= logging.INFO)}))
-    _importer_logger.addHandler(fh)
+        handlers = [fh]
 
-    # _importer_logger = logging.basicConfig(filename=os.path.join(path_to_log_directory, log_filename),
-    #                                        filemode='w+', format=formatter, level=logging.DEBUG)
+        if to_stdout:
+            sh = logging.StreamHandler(sys.stdout)
+            sh.setLevel(logging.DEBUG)
+            sh.setFormatter(formatter)
+            # sh.addFilter(type('', (logging.Filter,), {'filter': staticmethod(lambda r: r.levelno <= logging.INFO)}))
+            handlers.append(sh)
 
-    sh = logging.StreamHandler(sys.stdout)
-    sh.setLevel(logging.DEBUG)
-    sh.setFormatter(formatter)
-    # sh.addFilter(type('', (logging.Filter,), {'filter': staticmethod(lambda r: r.levelno <= logging.INFO)}))
-    _importer_logger.addHandler(sh)
+        add_log_handlers(_importer_logger, handlers)
 
-    create_directory_if_not_exists(_importer_logger, path_to_log_directory)
+        _configured_loggers[logger_name] = log_filename
 
     return _importer_logger
 
 
-# Para App Principal
-def configure_logging(log_name, path_to_log_directory):
+def add_log_handlers(logger, handlers):
     """
-    Configure logger
-    :param log_name:
-    :param path_to_log_directory:  path to directory to write log file in
-    :return:
+    Add the handlers to the logger, behind a queue and a writer thread if LOG_RESOURCE.ASYNC.ENABLED
+    :param logger:   the logger
+    :param handlers: file and stream handlers of the logger
     """
 
     cfg = get_config_constant_file()
 
-    # log_filename = log_name + datetime.datetime.now().strftime('%Y-%m-%d') + '.log'
-    _date_name = datetime.datetime.now().strftime('%Y-%m-%dT%H:%M')
-    log_filename = log_name + _date_name + 'hr' + cfg['LOG_RESOURCE']['FILE_EXTENSION']
-
-    _importer_logger = logging.getLogger('root')
-    _importer_logger.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('%(asctime)s - Module: %(module)s - Line No: %(lineno)s : %(name)s : %(levelname)s - '
-                                  '%(message)s')
+    async_cfg = cfg['LOG_RESOURCE'].get('ASYNC') or {}
 
-    fh = logging.FileHandler(filename=os.path.join(path_to_log_directory, log_filename), mode='w+', encoding='utf-8')
-    fh.setLevel(logging.DEBUG)
-    fh.setFormatter(formatter)
-    # fh.addFilter(type('', (logging.Filter,), {'filter': staticmethod(lambda r: r.levelno <= logging.INFO)}))
-    _importer_logger.addHandler(fh)
+    if not async_cfg.get('ENABLED', False):
+        for handler in handlers:
+            logger.addHandler(handler)
 
-    # _importer_logger = logging.basicConfig(filename=os.path.join(path_to_log_directory, log_filename),
-    #                                        filemode='w+', format=formatter, level=logging.DEBUG)
+        return
 
-    sh = logging.StreamHandler(sys.stdout)
-    sh.setLevel(logging.DEBUG)
-    sh.setFormatter(formatter)
-    # sh.addFilter(type('', (logging.Filter,), {'filter': staticmethod(lambda r: r.levelno <= logging.INFO)}))
-    _importer_logger.addHandler(sh)
+    pipeline = start_async_pipeline(handlers,
+                                    queue_size=int(async_cfg.get('QUEUE_SIZE', 10000)),
+                                    full_policy=async_cfg.get('FULL_POLICY', 'drop'),
+                                    block_timeout=float(async_cfg.get('BLOCK_TIMEOUT', 1.0)))
 
-    create_directory_if_not_exists(_importer_logger, path_to_log_directory)
-
-    return _importer_logger
+    logger.addHandler(pipeline.queue_handler)
 
 
 def log_critical_error(logger, ex, message):
@@ -254,6 +258,6 @@ def get_config_constant_file():
     # TEST
     # _constants_file = "/home/jorgemm/Documentos/PycharmProjects/urbvan_microservice_test/constants/constants.yml"
 
-    cfg = const.get_constants_file(_constants_file)
+    cfg = get_settings(_constants_file)
 
     return cfg
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import logging
+import threading
+import unittest
+
+from logger_controller.async_logging import AsyncLogPipeline
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self, gate=None):
+        super().__init__()
+        self.messages = []
+        self.gate = gate
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait()
+
+        self.messages.append(record.getMessage())
+
+
+class TestAsyncLogging(unittest.TestCase):
+
+    def get_logger(self, name, pipeline):
+        logger = logging.getLogger(name)
+        logger.setLevel(logging.DEBUG)
+        logger.propagate = False
+        logger.handlers = [pipeline.queue_handler]
+
+        return logger
+
+    def test_records_are_flushed_on_stop(self):
+        list_handler = ListHandler()
+        pipeline = AsyncLogPipeline([list_handler], queue_size=100)
+        pipeline.start()
+
+        logger = self.get_logger('test_async_flush', pipeline)
+
+        for line in range(50):
+            logger.info('Product %s', line)
+
+        pipeline.stop()
+
+        self.assertEqual(['Product {}'.format(line) for line in range(50)], list_handler.messages)
+
+    def test_drop_policy_keeps_warnings(self):
+        release = threading.Event()
+        list_handler = ListHandler(release)
+        pipeline = AsyncLogPipeline([list_handler], queue_size=2, full_policy='drop', block_timeout=5)
+        pipeline.start()
+
+        logger = self.get_logger('test_async_drop', pipeline)
+
+        for line in range(10):
+            logger.info('Product %s', line)
+
+        self.assertGreater(pipeline.stats()["Dropped"], 0)
+
+        threading.Timer(0.2, release.set).start()
+
+        # Waits for space on the queue instead of being dropped
+        logger.error('Can not read the product')
+        logger.info('Product 10')
+
+        pipeline.stop()
+
+        self.assertIn('Can not read the product', list_handler.messages)
+        self.assertTrue(any('log records dropped' in message for message in list_handler.messages))
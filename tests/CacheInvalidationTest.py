@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import json
+import threading
+import time
+import unittest
+
+import psycopg2
+
+from db_controller.cache_invalidation import CacheInvalidationListener, build_invalidation_payloads, MAX_PAYLOAD_BYTES
+from db_controller.database_backend import init_connect_kwargs
+
+
+class TestCacheInvalidation(unittest.TestCase):
+
+    channel = 'cargamos_cache_invalidation_test'
+
+    # Max seconds between the commit of a write and the invalidation on another process
+    max_lag_seconds = 1.0
+
+    def setUp(self):
+        self.invalidations = []
+        self.invalidated = threading.Event()
+
+        self.listener = CacheInvalidationListener(init_connect_kwargs(),
+                                                  self.channel,
+                                                  self.apply_invalidation,
+                                                  'listener-process',
+                                                  poll_timeout=0.5,
+                                                  reconnect_interval=0.5)
+        self.listener.start()
+
+        self.assertTrue(self.listener.wait_listening(timeout=5))
+
+    def tearDown(self):
+        self.listener.stop(timeout=5)
+
+    def apply_invalidation(self, cache_name, keys):
+        self.invalidations.append((cache_name, keys, time.perf_counter()))
+        self.invalidated.set()
+
+    def notify(self, cache_name, keys, origin):
+        conn = psycopg2.connect(**init_connect_kwargs())
+
+        try:
+            cursor = conn.cursor()
+
+            for payload in build_invalidation_payloads(cache_name, keys, origin):
+                cursor.execute("SELECT pg_notify(%s, %s)", (self.channel, payload,))
+
+            committed_at = time.perf_counter()
+            conn.commit()
+
+        finally:
+            conn.close()
+
+        return committed_at
+
+    def test_invalidation_lag(self):
+        committed_at = self.notify('product', ['A20981'], 'writer-process')
+
+        self.assertTrue(self.invalidated.wait(timeout=5))
+
+        cache_name, keys, applied_at = self.invalidations[0]
+        lag = applied_at - committed_at
+
+        self.assertEqual('product', cache_name)
+        self.assertEqual(['A20981'], keys)
+        self.assertLess(lag, self.max_lag_seconds)
+        self.assertEqual(1, self.listener.stats()["Applied"])
+
+    def test_own_notifications_are_skipped(self):
+        self.notify('store', ['A-01'], 'listener-process')
+
+        self.assertFalse(self.invalidated.wait(timeout=1))
+
+
+class TestInvalidationPayloads(unittest.TestCase):
+
+    def test_payloads_under_notify_limit(self):
+        product_skus = ['SKU-{:06d}'.format(sku) for sku in range(5000)]
+
+        payloads = build_invalidation_payloads('product', product_skus, 'writer-process')
+
+        self.assertGreater(len(payloads), 1)
+        self.assertTrue(all(len(payload.encode('utf-8')) <= MAX_PAYLOAD_BYTES for payload in payloads))
+        self.assertEqual(product_skus, [key for payload in payloads for key in json.loads(payload)['keys']])
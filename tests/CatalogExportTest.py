@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import csv
+import io
+import json
+from tests.BaseCase import BaseCase
+
+
+class TestCatalogExport(BaseCase):
+
+    def get_header_request(self):
+        auth_payload = json.dumps({
+            "username": "jorge.morfinez.m@gmail.com",
+            "password": "Jm$_#11388",
+            "rfc_client": "MOMJ880813RQ7",
+        })
+
+        response_token = self.app.post('/api/ecommerce/authorization/', headers={"Content-Type": "application/json"},
+                                       data=auth_payload)
+
+        token_api_auth = json.loads(response_token.get_data(as_text=True))['access_token']
+
+        return {"Authorization": f"Bearer {token_api_auth}"}
+
+    def test_export_jsonl_by_status(self):
+
+        response_export = self.app.get('/api/ecommerce/manage/product/export/?format=jsonl&status=Activo',
+                                       headers=self.get_header_request())
+
+        self.assertEqual(200, response_export.status_code)
+        self.assertEqual('application/x-ndjson', response_export.mimetype)
+
+        for line in response_export.get_data(as_text=True).splitlines():
+            product = json.loads(line)
+
+            self.assertEqual('Activo', product["product_status"])
+            self.assertIn("product_store_code", product)
+
+    def test_export_csv_has_header(self):
+
+        response_export = self.app.get('/api/ecommerce/manage/product/export/?format=csv&published=true',
+                                       headers=self.get_header_request())
+
+        self.assertEqual(200, response_export.status_code)
+
+        reader = csv.DictReader(io.StringIO(response_export.get_data(as_text=True)))
+
+        self.assertIn("product_sku", reader.fieldnames)
+
+        for product in reader:
+            self.assertEqual('true', product["product_published"])
+
+    def test_export_invalid_filter(self):
+
+        response_export = self.app.get('/api/ecommerce/manage/product/export/?format=xml',
+                                       headers=self.get_header_request())
+
+        self.assertEqual(409, response_export.status_code)
+
+        response_export = self.app.get('/api/ecommerce/manage/product/export/?published=maybe',
+                                       headers=self.get_header_request())
+
+        self.assertEqual(409, response_export.status_code)
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import json
+
+from db_controller.catalog_import import import_product_catalog
+from tests.BaseCase import BaseCase
+
+
+def build_product_record(product_sku, store_code, product_price='10'):
+
+    return {
+        "product_sku": product_sku,
+        "product_stock": '5',
+        "product_store_code": store_code,
+        "product_name": 'Producto de prueba',
+        "product_title": 'Producto de prueba',
+        "product_price": product_price,
+        "product_tax": '16',
+    }
+
+
+def build_csv_lines(records):
+    field_names = list(records[0].keys())
+
+    return [(','.join(field_names) + '\n').encode('utf-8')] + \
+        [(','.join(record[field_name] for field_name in field_names) + '\n').encode('utf-8') for record in records]
+
+
+def build_jsonl_lines(records):
+
+    return [(json.dumps(record) + '\n').encode('utf-8') for record in records]
+
+
+class TestCatalogImport(BaseCase):
+
+    def get_header_request(self, content_type):
+        auth_payload = json.dumps({
+            "username": "jorge.morfinez.m@gmail.com",
+            "password": "Jm$_#11388",
+            "rfc_client": "MOMJ880813RQ7",
+        })
+
+        response_token = self.app.post('/api/ecommerce/authorization/', headers={"Content-Type": "application/json"},
+                                       data=auth_payload)
+
+        token_api_auth = json.loads(response_token.get_data(as_text=True))['access_token']
+
+        return {
+            "Content-Type": content_type,
+            "Authorization": f"Bearer {token_api_auth}",
+        }
+
+    def test_import_csv(self):
+        records = [build_product_record('SKU-IMPORT-CSV-1', 'A-01'), build_product_record('SKU-IMPORT-CSV-2', 'A-01')]
+
+        response_import = self.app.post('/api/ecommerce/manage/product/import/',
+                                        headers=self.get_header_request('text/csv'),
+                                        data=b''.join(build_csv_lines(records)))
+
+        catalog_imported = json.loads(response_import.get_data(as_text=True))
+
+        self.assertEqual(200, response_import.status_code)
+        self.assertEqual(2, catalog_imported["TotalLines"])
+        self.assertEqual(0, catalog_imported["FailedLines"])
+        self.assertEqual(2, catalog_imported["InsertedProducts"] + catalog_imported["UpdatedProducts"])
+
+    def test_import_jsonl_with_missing_store(self):
+        records = [build_product_record('SKU-IMPORT-JSONL-1', 'A-01'),
+                   build_product_record('SKU-IMPORT-JSONL-2', 'STORE-NOT-STORED')]
+
+        response_import = self.app.post('/api/ecommerce/manage/product/import/',
+                                        headers=self.get_header_request('application/x-ndjson'),
+                                        data=b''.join(build_jsonl_lines(records)))
+
+        catalog_imported = json.loads(response_import.get_data(as_text=True))
+
+        self.assertEqual(200, response_import.status_code)
+        self.assertEqual(2, catalog_imported["TotalLines"])
+        self.assertEqual(1, catalog_imported["FailedLines"])
+        self.assertEqual(1, catalog_imported["InsertedProducts"] + catalog_imported["UpdatedProducts"])
+        self.assertEqual([{"Line": 2, "Error": 'The store STORE-NOT-STORED is not registered'}],
+                         catalog_imported["Errors"])
+
+    def test_rejected_batch_counts_only_its_lines(self):
+        # product_price es numeric(2): 1000 rechaza el lote completo en el merge
+        records = [build_product_record('SKU-IMPORT-REJECTED-1', 'A-01'),
+                   build_product_record('SKU-IMPORT-REJECTED-2', 'A-01', product_price='1000'),
+                   build_product_record('SKU-IMPORT-REJECTED-3', 'A-01', product_price='diez')]
+
+        catalog_imported = import_product_catalog(build_jsonl_lines(records), 'jsonl')
+
+        self.assertEqual(3, catalog_imported["TotalLines"])
+        self.assertEqual(3, catalog_imported["FailedLines"])
+        self.assertEqual(0, catalog_imported["InsertedProducts"] + catalog_imported["UpdatedProducts"])
+
+        errors_by_line = {error["Line"]: error["Error"] for error in catalog_imported["Errors"]}
+
+        self.assertTrue(errors_by_line[1].startswith('Batch of lines 1 to 3 rejected by the database'))
+        self.assertEqual('The field product_price must be numeric: diez', errors_by_line[3])
+
+    def test_invalid_lines_only_are_not_a_rejected_batch(self):
+        records = [build_product_record('SKU-IMPORT-INVALID-1', 'A-01', product_price='diez')]
+
+        catalog_imported = import_product_catalog(build_jsonl_lines(records), 'jsonl')
+
+        self.assertEqual(1, catalog_imported["TotalLines"])
+        self.assertEqual(1, catalog_imported["FailedLines"])
+        self.assertEqual(1, len(catalog_imported["Errors"]))
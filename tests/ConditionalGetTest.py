@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import json
+import threading
+
+from app import app
+from db_controller.database_backend import (coalesced_read, end_request_session, get_single_flight,
+                                            select_product_version)
+from tests.BaseCase import BaseCase
+
+
+class TestConditionalGet(BaseCase):
+
+    def get_header_request(self):
+        auth_payload = json.dumps({
+            "username": "jorge.morfinez.m@gmail.com",
+            "password": "Jm$_#11388",
+            "rfc_client": "MOMJ880813RQ7",
+        })
+
+        response_token = self.app.post('/api/ecommerce/authorization/', headers={"Content-Type": "application/json"},
+                                       data=auth_payload)
+
+        token_api_auth = json.loads(response_token.get_data(as_text=True))['access_token']
+
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token_api_auth}",
+        }
+
+    def test_product_not_modified(self):
+        header_request = self.get_header_request()
+        product_payload = json.dumps({"product_sku": "A20981"})
+
+        response_product = self.app.get('/api/ecommerce/manage/product/', headers=header_request,
+                                        data=product_payload)
+
+        self.assertEqual(200, response_product.status_code)
+        self.assertIsNotNone(response_product.headers.get('ETag'))
+
+        header_request["If-None-Match"] = response_product.headers['ETag']
+
+        response_product = self.app.get('/api/ecommerce/manage/product/', headers=header_request,
+                                        data=product_payload)
+
+        self.assertEqual(304, response_product.status_code)
+        self.assertEqual(b'', response_product.get_data())
+
+    def test_etag_depends_on_the_fields(self):
+        header_request = self.get_header_request()
+
+        response_full = self.app.get('/api/ecommerce/manage/product/', headers=header_request,
+                                     data=json.dumps({"product_sku": "A20981"}))
+
+        header_request["If-None-Match"] = response_full.headers['ETag']
+
+        response_fields = self.app.get('/api/ecommerce/manage/product/?fields=PRICE', headers=header_request,
+                                       data=json.dumps({"product_sku": "A20981"}))
+
+        self.assertEqual(200, response_fields.status_code)
+        self.assertNotEqual(response_full.headers['ETag'], response_fields.headers['ETag'])
+
+
+class TestConditionalGetCoalescing(BaseCase):
+
+    def test_concurrent_conditional_gets_share_one_flight(self):
+        release_query = threading.Event()
+        executions = []
+        results = []
+
+        @coalesced_read
+        def select_conditional_get_stock(product_sku):
+            executions.append(product_sku)
+            release_query.wait(timeout=5)
+            return [{"SKU": product_sku}]
+
+        def conditional_get():
+            with app.test_request_context():
+                try:
+                    # The version query binds the request session, as the conditional GET does
+                    select_product_version('A20981')
+                    results.append(select_conditional_get_stock('A20981'))
+                finally:
+                    end_request_session()
+
+        def flight_calls():
+            for key_stats in get_single_flight().stats(top=1000)["Keys"]:
+                if key_stats["Key"].startswith('select_conditional_get_stock'):
+                    return key_stats["Calls"]
+
+            return 0
+
+        readers = [threading.Thread(target=conditional_get) for _ in range(5)]
+
+        for reader in readers:
+            reader.start()
+
+        # Todos los lectores esperan a la consulta del primero
+        for _ in range(500):
+            if flight_calls() >= len(readers):
+                break
+
+            threading.Event().wait(0.01)
+
+        release_query.set()
+
+        for reader in readers:
+            reader.join(timeout=5)
+
+        self.assertEqual(['A20981'], executions)
+        self.assertEqual([[{"SKU": 'A20981'}]] * 5, results)
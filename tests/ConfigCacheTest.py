@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import os
+import tempfile
+import unittest
+
+from constants.constants import SettingsCache
+
+
+class TestConfigCache(unittest.TestCase):
+
+    def setUp(self):
+        constants_fd, self.constants_file = tempfile.mkstemp(suffix='.yml')
+        os.close(constants_fd)
+
+        self.write_constants("CONFIG_CACHE:\n  CHECK_INTERVAL: 0\nDB_OBJECTS:\n  STORE_TABLE: 'store_a'\n"
+                             "PRODUCT_STATUS_CHECK_LIST: ['Activo', 'Inactivo']\n")
+
+    def tearDown(self):
+        os.remove(self.constants_file)
+
+    def write_constants(self, content, mtime_ns=None):
+        with open(self.constants_file, 'w') as constants_file:
+            constants_file.write(content)
+
+        if mtime_ns is not None:
+            os.utime(self.constants_file, ns=(mtime_ns, mtime_ns))
+
+    def test_settings_are_read_only(self):
+        cfg = SettingsCache(self.constants_file).get()
+
+        self.assertEqual('store_a', cfg['DB_OBJECTS']['STORE_TABLE'])
+        self.assertEqual('store_a', cfg.DB_OBJECTS.STORE_TABLE)
+        self.assertEqual(('Activo', 'Inactivo'), cfg['PRODUCT_STATUS_CHECK_LIST'])
+
+        with self.assertRaises(TypeError):
+            cfg['DB_OBJECTS']['STORE_TABLE'] = 'store_b'
+
+        with self.assertRaises(AttributeError):
+            cfg.DB_OBJECTS.STORE_TABLE = 'store_b'
+
+    def test_file_parsed_once_until_it_changes(self):
+        settings_cache = SettingsCache(self.constants_file)
+
+        cfg = settings_cache.get()
+
+        self.assertIs(cfg, settings_cache.get())
+
+        self.write_constants("CONFIG_CACHE:\n  CHECK_INTERVAL: 0\nDB_OBJECTS:\n  STORE_TABLE: 'store_b'\n",
+                             mtime_ns=os.stat(self.constants_file).st_mtime_ns + 10 ** 9)
+
+        self.assertEqual('store_b', settings_cache.get()['DB_OBJECTS']['STORE_TABLE'])
+
+    def test_invalid_reload_keeps_last_settings(self):
+        settings_cache = SettingsCache(self.constants_file)
+
+        settings_cache.get()
+
+        self.write_constants("DB_OBJECTS:\n\tSTORE_TABLE: 'store_b'\n")
+
+        cfg = settings_cache.reload()
+
+        self.assertEqual('store_a', cfg['DB_OBJECTS']['STORE_TABLE'])
+
+    def test_invalidate_reads_the_file_again(self):
+        settings_cache = SettingsCache(self.constants_file)
+
+        cfg = settings_cache.get()
+
+        settings_cache.invalidate()
+
+        self.assertIsNot(cfg, settings_cache.get())
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import decimal
+import unittest
+
+from db_controller.field_projection import (PRODUCT_COLUMNS, parse_product_fields, product_select_list,
+                                            build_product_data, project_product_data)
+
+
+class TestFieldProjection(unittest.TestCase):
+
+    product_columns_cfg = {
+        "SKU": 'product_sku',
+        "STOCK": 'product_stock',
+        "STORE_ID": 'product_store_id',
+        "PRICE": 'product_price',
+        "PHOTO": 'product_photo',
+    }
+
+    def test_projection_narrows_select_and_response(self):
+        product_columns = parse_product_fields('PRICE, stock', self.product_columns_cfg)
+
+        self.assertEqual(('product_sku', 'product_stock', 'store_code', 'product_price'), product_columns)
+        self.assertEqual('prod.product_sku, prod.product_stock, store.store_code, prod.product_price',
+                         product_select_list(product_columns))
+
+        product_data = build_product_data({
+            "product_sku": 'A20981',
+            "product_stock": 10,
+            "store_code": 'A-01',
+            "product_price": decimal.Decimal('129.90'),
+        }, product_columns)
+
+        self.assertEqual({"Product": {
+            "SKUProduct": 'A20981',
+            "StockProduct": 10,
+            "CodeStore": 'A-01',
+            "Prices": {"PriceProduct": decimal.Decimal('129.90')},
+        }}, product_data)
+
+    def test_cached_product_is_projected(self):
+        product_data = build_product_data({column_name: column_name for column_name in PRODUCT_COLUMNS})
+
+        product_columns = parse_product_fields(['product_store_id'], self.product_columns_cfg)
+
+        self.assertEqual({"Product": {"SKUProduct": 'product_sku', "CodeStore": 'store_code',
+                                      "NameStore": 'store_name'}},
+                         project_product_data(product_data, product_columns))
+
+    def test_fields_are_whitelisted(self):
+        self.assertIsNone(parse_product_fields(None, self.product_columns_cfg))
+        self.assertIsNone(parse_product_fields('', self.product_columns_cfg))
+
+        for fields in ('product_long_description', 'PRICE,1;DROP TABLE', 42):
+            with self.assertRaises(ValueError):
+                parse_product_fields(fields, self.product_columns_cfg)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import logging
+import unittest
+
+from logger_controller.hot_path_logging import get_hot_path_log
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class FormatCounter:
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return 'A20981'
+
+
+class TestHotPathLogging(unittest.TestCase):
+
+    def setUp(self):
+        self.list_handler = ListHandler()
+
+        self.logger = logging.getLogger('test_hot_path_logging')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.handlers = [self.list_handler]
+
+    def test_rows_not_sampled_are_not_formatted(self):
+        read_log = get_hot_path_log(self.logger, 'select_by_product_sku',
+                                    {"ROW_LEVEL": 'INFO', "SAMPLE_RATES": {"DEFAULT": 1.0, "select_by_product_sku": 0}})
+        product_sku = FormatCounter()
+
+        for _ in range(100):
+            read_log.row('Product Registered: SKUProduct: %s', product_sku)
+
+        read_log.summary(100, 'A20981')
+
+        self.assertEqual(0, product_sku.formatted)
+        self.assertEqual(1, len(self.list_handler.messages))
+        self.assertIn('Query select_by_product_sku: Key: A20981, Rows: 100, Rows logged: 0',
+                      self.list_handler.messages[0])
+
+    def test_rows_under_the_level_are_not_formatted(self):
+        read_log = get_hot_path_log(self.logger, 'select_by_product_sku', {"SAMPLE_RATES": {"DEFAULT": 1.0}})
+        product_sku = FormatCounter()
+
+        read_log.row('Product Registered: SKUProduct: %s', product_sku)
+
+        self.assertEqual(0, product_sku.formatted)
+        self.assertEqual([], self.list_handler.messages)
+
+    def test_sampled_rows_are_logged(self):
+        read_log = get_hot_path_log(self.logger, 'select_all_stock_in_product',
+                                    {"ROW_LEVEL": 'INFO', "SAMPLE_RATES": {"select_all_stock_in_product": 1.0},
+                                     "SUMMARY": False})
+
+        for store in range(3):
+            read_log.row('Product Stock: CodeStore: %s', 'A-0{}'.format(store))
+
+        self.assertEqual(['Product Stock: CodeStore: A-0{}'.format(store) for store in range(3)],
+                         self.list_handler.messages)
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import datetime
+import decimal
+import json
+import unittest
+import uuid
+
+from utilities.json_encoder import JsonEncoder, orjson
+
+
+class TestJsonEncoder(unittest.TestCase):
+
+    product_data = [{
+        "Product": {
+            "IdProduct": uuid.UUID('b4c0a3c6-0d52-4f4f-9e4e-2f9f0c5a1f11'),
+            "SKUProduct": 'A20981',
+            "NameProduct": 'Café molido',
+            "Prices": {
+                "PriceProduct": decimal.Decimal('129.90'),
+                "TaxPriceProduct": decimal.Decimal('20.78'),
+            },
+            "PublishedProduct": True,
+            "CreationDate": datetime.datetime(2021, 3, 1, 10, 30, 15),
+        }
+    }]
+
+    def test_database_types_are_encoded(self):
+        encoded = json.loads(JsonEncoder('json').dumps(self.product_data))
+
+        self.assertEqual('b4c0a3c6-0d52-4f4f-9e4e-2f9f0c5a1f11', encoded[0]["Product"]["IdProduct"])
+        self.assertEqual('129.90', encoded[0]["Product"]["Prices"]["PriceProduct"])
+        self.assertEqual('2021-03-01T10:30:15', encoded[0]["Product"]["CreationDate"])
+        self.assertEqual('Café molido', encoded[0]["Product"]["NameProduct"])
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_encoders_return_the_same_document(self):
+        self.assertEqual(JsonEncoder('json').dumps(self.product_data), JsonEncoder('orjson').dumps(self.product_data))
+
+    def test_decimals_keep_their_precision(self):
+        stock_data = {"ProductStock": decimal.Decimal('12345678901234567890.123456789')}
+
+        expected = b'{"ProductStock":"12345678901234567890.123456789"}'
+
+        self.assertEqual(expected, JsonEncoder('json').dumps(stock_data))
+
+        if orjson is not None:
+            self.assertEqual(expected, JsonEncoder('orjson').dumps(stock_data))
+
+    def test_auto_encoder(self):
+        self.assertEqual('orjson' if orjson is not None else 'json', JsonEncoder().name)
+
+    def test_unknown_types_are_rejected(self):
+        with self.assertRaises(TypeError):
+            JsonEncoder().dumps({"Product": object()})
+
+        with self.assertRaises(ValueError):
+            JsonEncoder('ujson')
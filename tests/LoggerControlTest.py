@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import logging
+import logging.handlers
+import os
+import tempfile
+import unittest
+
+from logger_controller.logger_control import configure_named_logging, configure_ws_logger
+
+
+class TestLoggerControl(unittest.TestCase):
+
+    def wait_written(self, logger):
+        for handler in logger.handlers:
+            # The async handlers put the records on a queue, wait for the writer thread
+            if isinstance(handler, logging.handlers.QueueHandler):
+                handler.queue.join()
+
+    def test_logger_is_configured_once(self):
+        with tempfile.TemporaryDirectory() as log_dir:
+            logger = configure_named_logging('test_logger_control', 'test_', log_dir)
+            handlers = list(logger.handlers)
+
+            # One call by each module that imports the logger
+            for _ in range(3):
+                self.assertIs(logger, configure_named_logging('test_logger_control', 'test_', log_dir))
+
+            self.assertEqual(handlers, logger.handlers)
+
+            logger.info('Product Registered: %s', 'A20981')
+            self.wait_written(logger)
+
+            log_files = os.listdir(log_dir)
+            self.assertEqual(1, len(log_files))
+
+            with open(os.path.join(log_dir, log_files[0]), encoding='utf-8') as log_file:
+                self.assertEqual(1, sum('Product Registered: A20981' in line for line in log_file))
+
+    def test_ws_logger_handlers_are_not_duplicated(self):
+        logger = configure_ws_logger()
+        handlers = list(logger.handlers)
+
+        self.assertIs(logger, configure_ws_logger())
+        self.assertEqual(handlers, logger.handlers)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import sys
+import time
+import unittest
+
+from db_controller.lookup_cache import LookupCache, MISSING, deep_sizeof
+
+
+class TestLookupCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        store_id_cache = LookupCache('StoreIdCache', max_entries=10, ttl=60)
+
+        self.assertIs(MISSING, store_id_cache.get('A-01'))
+
+        store_id_cache.put('A-01', 'b4c0a3c6-0d52-4f4f-9e4e-2f9f0c5a1f11')
+
+        self.assertEqual('b4c0a3c6-0d52-4f4f-9e4e-2f9f0c5a1f11', store_id_cache.get('A-01'))
+
+        stats = store_id_cache.stats()
+
+        self.assertEqual(1, stats["Hits"])
+        self.assertEqual(1, stats["Misses"])
+
+    def test_least_recently_used_is_evicted(self):
+        store_id_cache = LookupCache('StoreIdCache', max_entries=2, ttl=60)
+
+        store_id_cache.put('A-01', 1)
+        store_id_cache.put('A-02', 2)
+        store_id_cache.get('A-01')
+        store_id_cache.put('A-03', 3)
+
+        self.assertIs(MISSING, store_id_cache.get('A-02'))
+        self.assertEqual(1, store_id_cache.get('A-01'))
+        self.assertEqual(1, store_id_cache.stats()["Evictions"])
+
+    def test_expired_and_invalidated_entries(self):
+        store_id_cache = LookupCache('StoreIdCache', max_entries=10, ttl=0.01)
+
+        store_id_cache.put('A-01', 1)
+        time.sleep(0.02)
+
+        self.assertIs(MISSING, store_id_cache.get('A-01'))
+
+        store_id_cache.ttl = 60
+        store_id_cache.put('A-01', 1)
+        store_id_cache.invalidate('A-01')
+
+        self.assertIs(MISSING, store_id_cache.get('A-01'))
+        self.assertEqual(1, store_id_cache.stats()["Invalidations"])
+
+    def test_bounded_by_bytes(self):
+        product_cache = LookupCache('ProductCache', max_entries=10, ttl=60, max_bytes=10, sizeof=len)
+
+        product_cache.put('A20981', 'x' * 4)
+        product_cache.put('A20982', 'x' * 4)
+        product_cache.put('A20983', 'x' * 4)
+
+        self.assertIs(MISSING, product_cache.get('A20981'))
+        self.assertEqual(8, product_cache.stats()["Bytes"])
+
+        product_cache.put('A20984', 'x' * 11)
+
+        self.assertIs(MISSING, product_cache.get('A20984'))
+        self.assertEqual(8, product_cache.stats()["Bytes"])
+
+    def test_deep_sizeof_counts_nested_values(self):
+        product_data = [{"Product": {"SKUProduct": 'A20981', "NameProduct": 'x' * 1000}}]
+
+        self.assertGreater(deep_sizeof(product_data), 1000)
+        self.assertLess(sys.getsizeof(product_data), 1000)
+
+    def test_read_older_than_invalidation_is_not_cached(self):
+        product_cache = LookupCache('ProductCache', max_entries=10, ttl=60)
+
+        # Lector: miss y toma la generacion antes de su SELECT
+        self.assertIs(MISSING, product_cache.get('A20981'))
+        generation = product_cache.generation('A20981')
+
+        # Escritor: confirma e invalida antes de que el lector guarde su lectura
+        product_cache.invalidate('A20981')
+
+        product_cache.put('A20981', 'stale product', generation)
+
+        self.assertIs(MISSING, product_cache.get('A20981'))
+        self.assertEqual(1, product_cache.stats()["StalePuts"])
+
+        # Las otras llaves y las lecturas nuevas se guardan
+        product_cache.put('A20982', 'product', product_cache.generation('A20982'))
+        product_cache.put('A20981', 'product', product_cache.generation('A20981'))
+
+        self.assertEqual('product', product_cache.get('A20982'))
+        self.assertEqual('product', product_cache.get('A20981'))
+
+    def test_read_older_than_clear_is_not_cached(self):
+        store_id_cache = LookupCache('StoreIdCache', max_entries=2, ttl=60)
+
+        generation = store_id_cache.generation('A-01')
+
+        store_id_cache.clear()
+        store_id_cache.put('A-01', 1, generation)
+
+        self.assertIs(MISSING, store_id_cache.get('A-01'))
+
+        # Mas llaves invalidadas que max_entries: se olvidan y cuentan como un clear
+        generation = store_id_cache.generation('A-01')
+
+        for store_code in ('A-02', 'A-03', 'A-04'):
+            store_id_cache.invalidate(store_code)
+
+        store_id_cache.put('A-01', 1, generation)
+
+        self.assertIs(MISSING, store_id_cache.get('A-01'))
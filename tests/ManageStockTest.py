@@ -12,6 +12,7 @@ __version__ = "1.1.A25.1 ($Rev: 1 $)"
 import unittest
 import json
 from tests.BaseCase import BaseCase
+from utilities.Utility import Utility as Util
 
 
 class TestManageInvStock(BaseCase):
@@ -87,3 +88,157 @@ class TestManageInvStock(BaseCase):
     #     self.assertEqual(str, type(api_response['message']))
     #     # self.assertEqual(str, type(api_response['code']))
     #     self.assertNotEqual(200, response.status_code)
+
+    def test_stock_list_batch(self):
+
+        stock_batch_payload = {
+            "product_skus": ["A20981", "A20981", "SKU-NOT-STORED"],
+        }
+
+        token_api_auth = self.get_token_auth_api()
+
+        header_request = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token_api_auth}"
+        }
+
+        response_stock = self.app.post('/api/ecommerce/stock/batch/',
+                                       headers=header_request,
+                                       data=json.dumps(stock_batch_payload))
+
+        # When
+        stock_batch_response = json.loads(response_stock.get_data(as_text=True))
+
+        # Then
+        self.assertEqual(200, response_stock.status_code)
+        self.assertEqual(["SKU-NOT-STORED"], stock_batch_response["NotFound"])
+
+        for product_stock in stock_batch_response["Products"]:
+            self.assertEqual("A20981", product_stock["SKU"])
+            self.assertEqual(list, type(product_stock["ProductStock"]))
+
+    def test_stock_list_batch_without_skus(self):
+
+        token_api_auth = self.get_token_auth_api()
+
+        header_request = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token_api_auth}"
+        }
+
+        response_stock = self.app.post('/api/ecommerce/stock/batch/',
+                                       headers=header_request,
+                                       data=json.dumps({"product_skus": []}))
+
+        self.assertEqual(409, response_stock.status_code)
+
+    def test_stock_bulk_update_mixed_items(self):
+
+        stock_bulk_payload = [
+            {"product_sku": "A20981", "store_code": "A-01", "stock": 10},
+            {"product_sku": "A20981", "store_code": "A-01", "stock": 12},
+            {"product_sku": "A20981", "stock": "ten"},
+            {"product_sku": "A20981", "store_code": "STORE-NOT-STORED", "stock": 1},
+        ]
+
+        token_api_auth = self.get_token_auth_api()
+
+        header_request = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token_api_auth}"
+        }
+
+        response_stock = self.app.post('/api/ecommerce/stock/bulk/',
+                                       headers=header_request,
+                                       data=json.dumps(stock_bulk_payload))
+
+        # When
+        stock_bulk_response = json.loads(response_stock.get_data(as_text=True))
+
+        # Then
+        self.assertEqual(200, response_stock.status_code)
+        self.assertEqual(4, stock_bulk_response["TotalItems"])
+        self.assertEqual(4, stock_bulk_response["UpdatedItems"] + stock_bulk_response["FailedItems"])
+
+        stock_items = stock_bulk_response["Items"]
+
+        self.assertEqual("Duplicated item, the last one was applied", stock_items[0]["Message"])
+        self.assertIn(stock_items[1]["Message"], ("Product Stock Updated Successful", "Product not exists in Store"))
+        self.assertEqual("Invalid item, product_sku, store_code and numeric stock are required",
+                         stock_items[2]["Message"])
+        self.assertEqual("Store not exists", stock_items[3]["Message"])
+
+    def test_stock_bulk_update_over_limit(self):
+
+        max_items = Util.get_config_constant_file()['STOCK_BULK']['MAX_ITEMS']
+
+        stock_bulk_payload = [{"product_sku": "A20981", "store_code": "A-01", "stock": 1}] * (max_items + 1)
+
+        token_api_auth = self.get_token_auth_api()
+
+        header_request = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token_api_auth}"
+        }
+
+        response_stock = self.app.post('/api/ecommerce/stock/bulk/',
+                                       headers=header_request,
+                                       data=json.dumps(stock_bulk_payload))
+
+        stock_bulk_response = json.loads(response_stock.get_data(as_text=True))
+
+        self.assertEqual(409, response_stock.status_code)
+        self.assertIn(str(max_items), stock_bulk_response["error_detail"])
+
+    def test_stock_bulk_update_unhashable_codes(self):
+
+        stock_bulk_payload = [
+            {"product_sku": ["A20981"], "store_code": "A-01", "stock": 10},
+            {"product_sku": "A20981", "store_code": {"code": "A-01"}, "stock": 10},
+        ]
+
+        token_api_auth = self.get_token_auth_api()
+
+        header_request = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token_api_auth}"
+        }
+
+        response_stock = self.app.post('/api/ecommerce/stock/bulk/',
+                                       headers=header_request,
+                                       data=json.dumps(stock_bulk_payload))
+
+        stock_bulk_response = json.loads(response_stock.get_data(as_text=True))
+
+        self.assertEqual(200, response_stock.status_code)
+        self.assertEqual(2, stock_bulk_response["FailedItems"])
+
+        for stock_item in stock_bulk_response["Items"]:
+            self.assertEqual("Invalid item, product_sku, store_code and numeric stock are required",
+                             stock_item["Message"])
+
+    def test_stock_bulk_update_not_finite_stock(self):
+
+        # NaN e Infinity no son JSON estandar, pero los acepta el parser
+        stock_bulk_payload = '[{"product_sku": "A20981", "store_code": "A-01", "stock": NaN}, ' \
+                             '{"product_sku": "A20981", "store_code": "A-01", "stock": Infinity}]'
+
+        token_api_auth = self.get_token_auth_api()
+
+        header_request = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {token_api_auth}"
+        }
+
+        response_stock = self.app.post('/api/ecommerce/stock/bulk/',
+                                       headers=header_request,
+                                       data=stock_bulk_payload)
+
+        stock_bulk_response = json.loads(response_stock.get_data(as_text=True))
+
+        self.assertEqual(200, response_stock.status_code)
+        self.assertEqual(0, stock_bulk_response["UpdatedItems"])
+
+        for stock_item in stock_bulk_response["Items"]:
+            self.assertEqual("Invalid item, product_sku, store_code and numeric stock are required",
+                             stock_item["Message"])
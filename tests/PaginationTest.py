@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import unittest
+
+from db_controller.pagination import encode_page_cursor, decode_page_cursor, get_page_size
+
+
+class TestPagination(unittest.TestCase):
+
+    def test_cursor_round_trip(self):
+        key_values = ['A20981', 'b4c0a3c6-0d52-4f4f-9e4e-2f9f0c5a1f11']
+
+        page_cursor = encode_page_cursor('product', key_values)
+
+        self.assertNotIn('A20981', page_cursor)
+        self.assertEqual(key_values, decode_page_cursor('product', page_cursor, 2))
+
+    def test_cursor_of_other_listing_is_rejected(self):
+        page_cursor = encode_page_cursor('store', ['A-01'])
+
+        with self.assertRaises(ValueError):
+            decode_page_cursor('product', page_cursor, 2)
+
+        with self.assertRaises(ValueError):
+            decode_page_cursor('store', 'not-a-cursor', 1)
+
+    def test_page_size_limit(self):
+        self.assertEqual(50, get_page_size(None, 50, 500))
+        self.assertEqual(10, get_page_size('10', 50, 500))
+
+        for page_size in ('0', '501', 'ten'):
+            with self.assertRaises(ValueError):
+                get_page_size(page_size, 50, 500)
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import unittest
+
+from utilities.request_stats import RequestStats, CountingStream
+
+
+class TestRequestStats(unittest.TestCase):
+
+    def test_access_record(self):
+        request_stats = RequestStats()
+
+        request_stats.record_query(0.002)
+        request_stats.record_query(0.003)
+        request_stats.record_cache_lookup(True)
+        request_stats.record_cache_lookup(False)
+
+        access_record = request_stats.access_record('/api/ecommerce/stock/total/', 'POST', 200, 512)
+
+        self.assertEqual('/api/ecommerce/stock/total/', access_record["route"])
+        self.assertEqual(200, access_record["status"])
+        self.assertEqual(2, access_record["queries"])
+        self.assertAlmostEqual(5.0, access_record["db_time_ms"])
+        self.assertEqual(1, access_record["cache_hits"])
+        self.assertEqual(1, access_record["cache_misses"])
+        self.assertEqual(512, access_record["response_bytes"])
+        self.assertGreaterEqual(access_record["latency_ms"], 0)
+
+    def test_streamed_bytes_are_counted_on_close(self):
+        closed_bytes = []
+
+        counting_stream = CountingStream(iter([b'A20981,A-01\n', 'A20982,A-01\n']), closed_bytes.append)
+
+        self.assertEqual(2, len(list(counting_stream)))
+
+        counting_stream.close()
+        counting_stream.close()
+
+        self.assertEqual([24], closed_bytes)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import gzip
+import unittest
+import zlib
+
+from utilities.response_compression import (ResponseCompressor, CompressedStream, available_encodings,
+                                            negotiate_encoding)
+
+
+class TestResponseCompression(unittest.TestCase):
+
+    def test_negotiate_encoding(self):
+        self.assertEqual('gzip', negotiate_encoding('gzip, deflate', ('br', 'gzip')))
+        self.assertEqual('br', negotiate_encoding('gzip, br', ('br', 'gzip')))
+        self.assertEqual('gzip', negotiate_encoding('br;q=0.5, gzip', ('br', 'gzip')))
+        self.assertEqual('br', negotiate_encoding('*', ('br', 'gzip')))
+        self.assertIsNone(negotiate_encoding('gzip;q=0', ('gzip',)))
+        self.assertIsNone(negotiate_encoding(None, ('gzip',)))
+
+    def test_gzip_body(self):
+        body = b'{"SKU": "A20981", "TotalStock": 10}' * 100
+
+        compressed = ResponseCompressor('gzip').compress(body)
+
+        self.assertIn('gzip', available_encodings())
+        self.assertLess(len(compressed), len(body))
+        self.assertEqual(body, gzip.decompress(compressed))
+
+    def test_stream_is_flushed_by_chunk(self):
+        chunks = [b'{"product_sku": "A%05d"}\n' % line for line in range(1000)]
+
+        compressed_stream = CompressedStream(iter([b''.join(chunks[:500]), ''.join(
+            chunk.decode('utf-8') for chunk in chunks[500:])]), ResponseCompressor('gzip'))
+
+        decompressor = zlib.decompressobj(31)
+
+        first_chunk = decompressor.decompress(next(compressed_stream))
+
+        # The rows of the first chunk can be read before the stream ends
+        self.assertEqual(b''.join(chunks[:500]), first_chunk)
+
+        rest = b''.join(decompressor.decompress(compressed) for compressed in compressed_stream)
+
+        self.assertEqual(b''.join(chunks), first_chunk + rest + decompressor.flush())
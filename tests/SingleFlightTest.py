@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import threading
+import unittest
+
+from db_controller.single_flight import SingleFlight, flight_key
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_calls_share_one_execution(self):
+        single_flight = SingleFlight()
+        release_query = threading.Event()
+        executions = []
+        results = []
+
+        def select_all_stock_in_product(product_sku):
+            executions.append(product_sku)
+            release_query.wait(timeout=5)
+            return '[{"SKU": "%s"}]' % product_sku
+
+        key = flight_key('select_all_stock_in_product', ('A20981',))
+
+        def read_stock():
+            results.append(single_flight.do(key, select_all_stock_in_product, 'A20981'))
+
+        readers = [threading.Thread(target=read_stock) for _ in range(10)]
+
+        for reader in readers:
+            reader.start()
+
+        # Todos los lectores esperan a la consulta del primero
+        while single_flight.stats()["Calls"] < len(readers):
+            threading.Event().wait(0.01)
+
+        release_query.set()
+
+        for reader in readers:
+            reader.join(timeout=5)
+
+        stats = single_flight.stats()
+
+        self.assertEqual(['A20981'], executions)
+        self.assertEqual(['[{"SKU": "A20981"}]'] * 10, results)
+        self.assertEqual(9, stats["Collapsed"])
+        self.assertEqual(9, stats["Keys"][0]["Collapsed"])
+        self.assertEqual(0, stats["InFlight"])
+
+    def test_error_is_raised_and_not_kept(self):
+        single_flight = SingleFlight()
+
+        def select_by_product_sku(product_sku):
+            raise ValueError(product_sku)
+
+        key = flight_key('select_by_product_sku', ('A20981',))
+
+        with self.assertRaises(ValueError):
+            single_flight.do(key, select_by_product_sku, 'A20981')
+
+        self.assertEqual('ok', single_flight.do(key, lambda product_sku: 'ok', 'A20981'))
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A25.1 ($Rev: 1 $)"
+
+import logging
+import unittest
+
+from db_controller.sql_trace import SqlTracer, build_traced_cursor_factory, redact_params, redact_statement
+
+
+class ListHandler(logging.Handler):
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class RowsCursor:
+    r"""
+    Cursor class of the trace, without a database: each statement reads 2 rows.
+    """
+
+    rowcount = -1
+
+    def execute(self, query, vars=None):
+        self.rowcount = 2
+
+    def executemany(self, query, vars_list):
+        self.rowcount = len(vars_list)
+
+
+class TestSqlTrace(unittest.TestCase):
+
+    def setUp(self):
+        self.list_handler = ListHandler()
+
+        self.logger = logging.getLogger('test_sql_trace')
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.logger.handlers = [self.list_handler]
+
+    def test_redaction(self):
+        self.assertEqual("SELECT store_code FROM store WHERE id_store = ? AND store_code = '?'",
+                         redact_statement("SELECT store_code FROM store WHERE id_store = 10 AND store_code = 'A-01'"))
+        self.assertEqual(['<str:6>', '<int>', None], redact_params(('A20981', 10, None)))
+        self.assertEqual({"password": '<str:8>'}, redact_params({"password": 'secreto1'}))
+
+    def test_sampled_statement_is_traced(self):
+        cursor_factory = build_traced_cursor_factory(SqlTracer(self.logger, sample_rate=1.0), RowsCursor)
+        cursor = cursor_factory()
+
+        cursor.execute('SELECT prod.product_stock FROM product prod WHERE prod.product_sku = %s', ('A20981',))
+
+        self.assertEqual(1, len(self.list_handler.messages))
+        self.assertIn("Params: ['<str:6>']", self.list_handler.messages[0])
+        self.assertIn('Rows: 2', self.list_handler.messages[0])
+        self.assertNotIn('A20981', self.list_handler.messages[0])
+
+    def test_statement_not_sampled_is_not_traced(self):
+        cursor_factory = build_traced_cursor_factory(SqlTracer(self.logger, sample_rate=0.0), RowsCursor)
+        cursor = cursor_factory()
+
+        cursor.execute('SELECT 1')
+        cursor.executemany('UPDATE product SET product_stock = %s', [(1,), (2,)])
+
+        self.assertEqual([], self.list_handler.messages)
+        self.assertEqual(2, cursor.rowcount)
@@ -10,8 +10,7 @@ __history__ = """ """
 __version__ = "1.1.A19.1 ($Rev: 1 $)"
 
 import re
-import json
-from constants.constants import Constants as Const
+from constants.constants import Constants as Const, get_settings
 
 
 class Utility:
@@ -68,7 +67,7 @@ class Utility:
             "minimum_inventory": store_min_inventory,
         }
 
-        return json.dumps(store_dict)
+        return store_dict
 
     @staticmethod
     def set_data_input_product_dict(product_obj):
@@ -121,7 +120,7 @@ class Utility:
             'product_weight': product_weight,
         }
 
-        return json.dumps(product_dict)
+        return product_dict
 
     @staticmethod
     def decimal_formatting(value):
@@ -133,7 +132,8 @@ class Utility:
         """
         Get the config object to charge the constants configurator.
 
-        :return object: cfg object, contain the Map to the constants allowed in Constants File configuration.
+        :return object: cfg object (read only), contain the Map to the constants allowed in Constants File
+                        configuration.
         """
 
         # PROD
@@ -142,6 +142,7 @@ class Utility:
         # TEST
         # _constants_file = "/home/jorgemm/Documentos/tech_test_vacants/cargamos_api_test/constants/constants.yml"
 
-        cfg = Const.get_constants_file(_constants_file)
+        # Parsed once by process, see constants.get_settings
+        cfg = get_settings(_constants_file)
 
         return cfg
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Serialization of the API responses.
+
+Documentation:
+    - orjson is used when it is installed, otherwise the stdlib json module. Both encoders return the
+      same document for the data of the backend.
+    - Types of the database columns: Decimal (numeric) as text with all his digits (a float loses the
+      precision of prices and stocks), datetime/date/time as ISO 8601 text and UUID as text.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import datetime
+import decimal
+import json
+import uuid
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+JSON_ENCODERS = ('auto', 'orjson', 'json')
+
+
+def encode_default(value):
+    r"""
+    Convert the values that are not native JSON types, it is the default function of both encoders.
+
+    :param value: Value that the encoder can not serialize.
+    :return value: Equivalent value of a JSON type.
+    """
+
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    elif isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    elif isinstance(value, uuid.UUID):
+        return str(value)
+    elif isinstance(value, (set, frozenset)):
+        return list(value)
+
+    raise TypeError('Object of type {} is not JSON serializable'.format(type(value).__name__))
+
+
+def _stdlib_dumps(value):
+    return json.dumps(value, default=encode_default, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _orjson_dumps(value):
+    return orjson.dumps(value, default=encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class JsonEncoder:
+    r"""
+    Encoder of the responses, dumps returns the UTF-8 bytes of the body.
+    """
+
+    def __init__(self, name='auto'):
+        r"""
+        :param name: 'orjson', 'json' (stdlib) or 'auto' to use orjson if it is installed.
+        """
+
+        if name not in JSON_ENCODERS:
+            raise ValueError('Invalid JSON encoder: {}, expected one of: {}'.format(name, ', '.join(JSON_ENCODERS)))
+
+        if name == 'auto':
+            name = 'orjson' if orjson is not None else 'json'
+
+        if name == 'orjson' and orjson is None:
+            raise ImportError('The JSON encoder orjson is configured but it is not installed')
+
+        self.name = name
+
+        self._dumps = _orjson_dumps if name == 'orjson' else _stdlib_dumps
+
+    def dumps(self, value):
+        r"""
+        Serialize a value to JSON.
+
+        :param value: Dictionaries, lists and scalars returned by the backend.
+        :return body: JSON document as UTF-8 bytes.
+        """
+
+        return self._dumps(value)
+
+    def dumps_text(self, value):
+        return self._dumps(value).decode('utf-8')
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Counters of one request for his access log record.
+
+Documentation:
+    - The backend adds the time and the number of the SQL statements and the lookups of his caches to the
+      RequestStats of the request (flask.g.request_stats).
+    - At the end of the request the counters are written as one JSON record by request (ACCESS_LOG), with
+      the route, method, status, latency and bytes of the response.
+    - A streamed response (catalog export) is counted by chunk, his record is written when the stream ends.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import threading
+import time
+
+
+class RequestStats:
+    r"""
+    Time and counters of a request, the statements can run on other threads (single flight).
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+
+        self.db_time = 0.0
+        self.queries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.logged = False
+
+    def record_query(self, duration):
+        r"""
+        :param duration: Seconds of a SQL statement.
+        """
+
+        with self._lock:
+            self.db_time += duration
+            self.queries += 1
+
+    def record_cache_lookup(self, hit):
+        r"""
+        :param hit: True if the value was cached.
+        """
+
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def access_record(self, route, method, status, response_bytes):
+        r"""
+        Build the access record of the request, the latency is the time since the request started.
+
+        :param route: Rule of the endpoint (/api/ecommerce/stock/total/), or the path if it has not one.
+        :param response_bytes: Bytes of the body sent, compressed if it was compressed.
+        :return record: Dictionary of the JSON record.
+        """
+
+        return {
+            "route": route,
+            "method": method,
+            "status": status,
+            "latency_ms": round((time.perf_counter() - self._start) * 1000, 3),
+            "db_time_ms": round(self.db_time * 1000, 3),
+            "queries": self.queries,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "response_bytes": response_bytes,
+        }
+
+
+class CountingStream:
+    r"""
+    Iterable of the chunks of a streamed body that counts his bytes, on close it calls on_close(bytes).
+    """
+
+    def __init__(self, chunks, on_close):
+        self._chunks = chunks
+        self._iterator = iter(chunks)
+        self._on_close = on_close
+        self.response_bytes = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        chunk = next(self._iterator)
+
+        self.response_bytes += len(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+
+        return chunk
+
+    def close(self):
+        try:
+            if hasattr(self._chunks, 'close'):
+                self._chunks.close()
+        finally:
+            on_close, self._on_close = self._on_close, None
+
+            if on_close is not None:
+                on_close(self.response_bytes)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+Requires Python 3.8 or later
+
+Compression of the API responses negotiated by Accept-Encoding.
+
+Documentation:
+    - gzip is always available (zlib). br and zstd are used only if the packages brotli and zstandard
+      are installed, they are optional.
+    - The encoding is chosen by the quality (q) of the client, on a tie by the order configured.
+    - The streamed responses (catalog export) are compressed by chunk: each chunk is flushed, so the
+      client receives the rows as they are read.
+"""
+
+__author__ = "Jorge Morfinez Mojica (jorge.morfinez.m@gmail.com)"
+__copyright__ = "Copyright 2021, Jorge Morfinez Mojica"
+__license__ = ""
+__history__ = """ """
+__version__ = "1.1.A19.1 ($Rev: 1 $)"
+
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+DEFAULT_LEVELS = {
+    'br': 4,
+    'zstd': 3,
+    'gzip': 6,
+}
+
+
+def available_encodings():
+    r"""
+    Get the encodings that can be used in this process, in order of preference.
+    """
+
+    return tuple(encoding for encoding, module in (('br', brotli), ('zstd', zstandard), ('gzip', zlib))
+                 if module is not None)
+
+
+def parse_accept_encoding(accept_encoding):
+    r"""
+    Read the encodings accepted by the client.
+
+    :param accept_encoding: Value of the header Accept-Encoding, for example 'gzip, br;q=0.9'.
+    :return qualities: Dictionary encoding: quality, the encodings with q=0 are refused by the client.
+    """
+
+    qualities = dict()
+
+    for accepted in (accept_encoding or '').split(','):
+        encoding, _, parameters = accepted.partition(';')
+        encoding = encoding.strip().lower()
+
+        if not encoding:
+            continue
+
+        quality = 1.0
+        parameters = parameters.strip()
+
+        if parameters.startswith('q='):
+            try:
+                quality = float(parameters[2:])
+            except ValueError:
+                quality = 0.0
+
+        qualities[encoding] = quality
+
+    return qualities
+
+
+def negotiate_encoding(accept_encoding, encodings):
+    r"""
+    Choose the encoding of a response.
+
+    :param accept_encoding: Value of the header Accept-Encoding of the request.
+    :param encodings: Encodings enabled on the server, in order of preference.
+    :return encoding: The encoding with the highest quality for the client, None to not compress.
+    """
+
+    qualities = parse_accept_encoding(accept_encoding)
+
+    best_encoding = None
+    best_quality = 0.0
+
+    for encoding in encodings:
+        quality = qualities.get(encoding, qualities.get('*', 0.0))
+
+        if quality > best_quality:
+            best_encoding = encoding
+            best_quality = quality
+
+    return best_encoding
+
+
+class ResponseCompressor:
+    r"""
+    Compressor of one response, by the whole body (compress) or by chunks (compress_chunk and finish).
+    """
+
+    def __init__(self, encoding, level=None):
+        r"""
+        :param encoding: 'br', 'zstd' or 'gzip', it must be in available_encodings().
+        :param level: Compression level of the encoding, None for DEFAULT_LEVELS.
+        """
+
+        if encoding not in available_encodings():
+            raise ValueError('Encoding not available: {}, use one of {}'.format(encoding, available_encodings()))
+
+        self.encoding = encoding
+        self.level = DEFAULT_LEVELS[encoding] if level is None else int(level)
+
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=self.level)
+        elif encoding == 'zstd':
+            self._compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        else:
+            # wbits 31: zlib with the gzip header and trailer
+            self._compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        r"""
+        Compress a whole body, the compressor can not be used again.
+        """
+
+        return self.compress_chunk(data, flush=False) + self.finish()
+
+    def compress_chunk(self, data, flush=True):
+        r"""
+        Compress a chunk of a streamed body.
+
+        :param flush: Send all the chunk to the client now, at the cost of a little less compression.
+        """
+
+        if self.encoding == 'br':
+            compressed = self._compressor.process(data)
+            return compressed + self._compressor.flush() if flush else compressed
+
+        compressed = self._compressor.compress(data)
+
+        if not flush:
+            return compressed
+
+        if self.encoding == 'zstd':
+            return compressed + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+        return compressed + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        r"""
+        End the compressed body.
+        """
+
+        if self.encoding == 'br':
+            return self._compressor.finish()
+
+        return self._compressor.flush()
+
+
+class CompressedStream:
+    r"""
+    Iterable of the compressed chunks of a streamed body, closing it closes the original stream.
+    """
+
+    def __init__(self, chunks, compressor):
+        self._chunks = chunks
+        self._iterator = iter(chunks)
+        self._compressor = compressor
+        self._finished = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while not self._finished:
+            try:
+                chunk = next(self._iterator)
+            except StopIteration:
+                self._finished = True
+                return self._compressor.finish()
+
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+
+            compressed = self._compressor.compress_chunk(chunk)
+
+            if compressed:
+                return compressed
+
+        raise StopIteration
+
+    def close(self):
+        if hasattr(self._chunks, 'close'):
+            self._chunks.close()